@@ -0,0 +1,253 @@
+"""
+Benchmarks of the core hot paths, across horizons, numbers of days off ranges and numbers of shifts per day.
+Every case reports its best time over `--repeat` runs and its peak memory (`tracemalloc`),
+written to a JSON file to compare between releases.
+
+    python -m benchmarks.bench_core --output benchmarks/results.json
+    python -m benchmarks.bench_core --quick --compare benchmarks/results.json
+"""
+
+from argparse import ArgumentParser
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Dict, Iterator, List, Tuple
+import json
+import platform
+import sys
+import time as perf_time
+import tracemalloc
+
+import numpy as np
+
+from pyshiftsla.daily_shifts import DailyShift
+from pyshiftsla.daterange import DateRange
+from pyshiftsla.parsing import parse_daterange_strs, parse_shift_strs
+from pyshiftsla.shift import Shift
+from pyshiftsla.shifts_builder import ShiftsBuilder
+
+HORIZONS_DAYS = [31, 365, 5 * 365, 20 * 365]  # 1 month to 20 years
+DAYS_OFF_RANGES = [0, 10, 100]
+SHIFTS_PER_DAY = [1, 2, 8]
+QUICK = {
+    "horizons_days": [31, 365],
+    "days_off_ranges": [10],
+    "shifts_per_day": [2],
+}
+START_DATE = date(2024, 1, 1)
+
+BENCHMARK = Callable[[], object]
+RESULT = Dict[str, object]
+
+
+def make_daily_shifts(shifts_per_day: int) -> DailyShift:
+    """`shifts_per_day` equal `Shift`s from 8:00 to 18:00, with breaks between them"""
+    slot_minutes = 600 // shifts_per_day
+    return DailyShift(
+        [
+            Shift(
+                start=time(
+                    8 + slot * slot_minutes // 60, slot * slot_minutes % 60
+                ),
+                end=time(
+                    8 + (slot * slot_minutes + slot_minutes * 3 // 4) // 60,
+                    (slot * slot_minutes + slot_minutes * 3 // 4) % 60,
+                ),
+            )
+            for slot in range(shifts_per_day)
+        ]
+    )
+
+
+def make_days_off_ranges(
+    days_off_ranges: int, horizon_days: int
+) -> List[DateRange]:
+    """`days_off_ranges` 2-days `DateRange`s spread across the horizon"""
+    step = max(horizon_days // max(days_off_ranges, 1), 1)
+    return [
+        DateRange(
+            start=START_DATE + timedelta(days=idx * step),
+            end=START_DATE + timedelta(days=idx * step + 1),
+        )
+        for idx in range(days_off_ranges)
+    ]
+
+
+def make_builder(
+    horizon_days: int, days_off_ranges: int, shifts_per_day: int
+) -> ShiftsBuilder:
+    return ShiftsBuilder(
+        daily_shifts=make_daily_shifts(shifts_per_day),
+        days_off_ranges=make_days_off_ranges(days_off_ranges, horizon_days),
+    )
+
+
+def measure(benchmark: BENCHMARK, repeat: int) -> Tuple[float, int]:
+    """Best seconds over `repeat` runs, and the peak of allocated bytes of a run"""
+    best_seconds = float("inf")
+    for _ in range(repeat):
+        started = perf_time.perf_counter()
+        benchmark()
+        best_seconds = min(best_seconds, perf_time.perf_counter() - started)
+    tracemalloc.start()
+    benchmark()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best_seconds, peak_bytes
+
+
+def cases(
+    horizons_days: List[int],
+    days_off_ranges: List[int],
+    shifts_per_day: List[int],
+) -> Iterator[Tuple[str, Dict[str, int], BENCHMARK]]:
+    yield (
+        "Shift.fromstr",
+        {"shifts": 1_000},
+        lambda: [Shift.fromstr("08301145") for _ in range(1_000)],
+    )
+    yield (
+        "parse_shift_strs",
+        {"shifts": 100_000},
+        lambda: parse_shift_strs(["08301145", "13301800"] * 50_000),
+    )
+    yield (
+        "parse_daterange_strs",
+        {"dateranges": 100_000},
+        lambda: (
+            parse_daterange_strs(["20240101-20240105", "20240301"] * 50_000)
+        ),
+    )
+    for horizon in horizons_days:
+        to_date = START_DATE + timedelta(days=horizon - 1)
+        daterange = DateRange(start=START_DATE, end=to_date)
+        yield (
+            "DateRange.dates",
+            {"horizon_days": horizon},
+            lambda: daterange.dates,
+        )
+        for days_off in days_off_ranges:
+            for shifts in shifts_per_day:
+                params = {
+                    "horizon_days": horizon,
+                    "days_off_ranges": days_off,
+                    "shifts_per_day": shifts,
+                }
+                builder = make_builder(horizon, days_off, shifts)
+                shiftrange = builder.build_shifts_from_daterange(
+                    START_DATE, to_date
+                )
+                start_deal = datetime.combine(START_DATE, time(10))
+                end_deal = datetime.combine(to_date, time(15))
+                yield (
+                    "ShiftsBuilder.get_workdays",
+                    params,
+                    lambda: (builder.get_workdays(START_DATE, to_date)),
+                )
+                yield (
+                    "ShiftsBuilder.build_shifts_from_daterange",
+                    params,
+                    lambda: (
+                        builder.build_shifts_from_daterange(START_DATE, to_date)
+                    ),
+                )
+                yield (
+                    "ShiftRange.work_amount_in_shiftrange",
+                    params,
+                    lambda: (
+                        shiftrange.work_amount_in_shiftrange(
+                            start_deal, end_deal
+                        )
+                    ),
+                )
+                yield (
+                    "ShiftsBuilder.calculate_sla",
+                    params,
+                    lambda: (builder.calculate_sla(start_deal, end_deal)),
+                )
+
+
+def run(repeat: int, **grid: List[int]) -> List[RESULT]:
+    results = []
+    for name, params, benchmark in cases(**grid):
+        seconds, peak_bytes = measure(benchmark, repeat)
+        results.append(
+            {
+                "name": name,
+                "params": params,
+                "seconds": seconds,
+                "peak_bytes": peak_bytes,
+            }
+        )
+        print(
+            f"{name:<45} {json.dumps(params):<70} {seconds * 1000:>10.3f}ms {peak_bytes / 1024:>10.1f}KiB"
+        )
+    return results
+
+
+def result_key(result: RESULT) -> str:
+    return f"{result['name']} {json.dumps(result['params'], sort_keys=True)}"
+
+
+def compare(
+    results: List[RESULT], baseline: List[RESULT], tolerance: float
+) -> List[str]:
+    """Cases slower, or using more memory, than `tolerance` times the baseline"""
+    baseline_by_key = {result_key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        baseline_result = baseline_by_key.get(result_key(result))
+        if baseline_result is None:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            if result[metric] > tolerance * baseline_result[metric]:
+                regressions.append(
+                    f"{result_key(result)}: {metric} {baseline_result[metric]} -> {result[metric]}"
+                )
+    return regressions
+
+
+def main() -> int:
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", help="JSON file to write the results to")
+    parser.add_argument(
+        "--compare", help="baseline JSON file of a previous run"
+    )
+    parser.add_argument("--tolerance", type=float, default=1.25)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="small grid")
+    args = parser.parse_args()
+
+    grid = (
+        QUICK
+        if args.quick
+        else {
+            "horizons_days": HORIZONS_DAYS,
+            "days_off_ranges": DAYS_OFF_RANGES,
+            "shifts_per_day": SHIFTS_PER_DAY,
+        }
+    )
+    results = run(args.repeat, **grid)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "numpy": np.__version__,
+                    "platform": platform.platform(),
+                    "results": results,
+                },
+                output,
+                indent=2,
+            )
+    if args.compare:
+        with open(args.compare) as baseline:
+            regressions = compare(
+                results, json.load(baseline)["results"], args.tolerance
+            )
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
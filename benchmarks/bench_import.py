@@ -0,0 +1,106 @@
+"""
+Import time of the package modules, each measured in fresh interpreters (best of `--repeat`),
+written to a JSON file to compare between releases.
+
+    python -m benchmarks.bench_import --output benchmarks/import_results.json
+    python -m benchmarks.bench_import --compare benchmarks/import_results.json
+"""
+
+from argparse import ArgumentParser
+from typing import Dict, List
+import json
+import subprocess
+import sys
+
+from benchmarks.bench_core import RESULT, compare
+
+MODULES = [
+    "pyshiftsla",
+    "pyshiftsla.shifts_builder",
+    "pyshiftsla.compiled_calendar",
+    "pyshiftsla.parallel",
+    "pyshiftsla.polars",
+]
+HEAVY_DEPENDENCIES = ["numpy", "pydantic", "polars", "lunardate"]
+
+MEASURE_IMPORT = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - started
+print(json.dumps({{
+    "seconds": seconds,
+    "loaded": [dependency for dependency in {dependencies!r} if dependency in sys.modules],
+}}))
+"""
+
+
+def measure_import(module: str, repeat: int) -> Dict[str, object]:
+    measures = [
+        json.loads(
+            subprocess.run(
+                [
+                    sys.executable,
+                    "-c",
+                    MEASURE_IMPORT.format(
+                        module=module, dependencies=HEAVY_DEPENDENCIES
+                    ),
+                ],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+        )
+        for _ in range(repeat)
+    ]
+    return min(measures, key=lambda measure: measure["seconds"])
+
+
+def run(repeat: int) -> List[RESULT]:
+    results = []
+    for module in MODULES:
+        measure = measure_import(module, repeat)
+        results.append(
+            {
+                "name": "import",
+                "params": {"module": module},
+                "seconds": measure["seconds"],
+                "peak_bytes": 0,
+                "loaded": measure["loaded"],
+            }
+        )
+        print(
+            f"import {module:<35} {measure['seconds'] * 1000:>10.3f}ms  loads {', '.join(measure['loaded'])}"
+        )
+    return results
+
+
+def main() -> int:
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", help="JSON file to write the results to")
+    parser.add_argument(
+        "--compare", help="baseline JSON file of a previous run"
+    )
+    parser.add_argument("--tolerance", type=float, default=1.25)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(
+                {"python": sys.version, "results": results}, output, indent=2
+            )
+    if args.compare:
+        with open(args.compare) as baseline:
+            regressions = compare(
+                results, json.load(baseline)["results"], args.tolerance
+            )
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+`pyshiftsla` console command (`pip install pyshiftsla[polars]`):
+
+    pyshiftsla tickets.csv results.csv --builder builder.json --end-column resolved_at
+
+where `builder.json` is a dumped config, e.g. `ShiftsBuilder(...).model_dump_json()`
+"""
+
+from pathlib import Path
+from typing import List
+import argparse
+import sys
+
+from pyshiftsla.shifts_builder import ShiftsBuilder
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="pyshiftsla",
+        description="Calculate the SLA and/or due time of every ticket of a CSV/Parquet file, chunk by chunk",
+    )
+    parser.add_argument("source", help=".csv or .parquet file of tickets")
+    parser.add_argument("destination", help=".csv or .parquet file of results")
+    parser.add_argument(
+        "--builder",
+        required=True,
+        type=Path,
+        help="JSON file of the ShiftsBuilder config",
+    )
+    parser.add_argument("--start-column", default="created_at")
+    parser.add_argument(
+        "--end-column",
+        default=None,
+        help="column of the end deals, to calculate sla",
+    )
+    parser.add_argument(
+        "--duration-column",
+        default=None,
+        help="column of the working milliseconds, to calculate due times",
+    )
+    parser.add_argument("--sla-column", default="sla")
+    parser.add_argument("--due-column", default="due")
+    parser.add_argument("--chunk-rows", type=int, default=500_000)
+    parser.add_argument(
+        "--quiet", action="store_true", help="do not report progress"
+    )
+    return parser
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.end_column is None and args.duration_column is None:
+        print(
+            "pyshiftsla: give --end-column and/or --duration-column",
+            file=sys.stderr,
+        )
+        return 2
+    from pyshiftsla.pipeline import run_sla_pipeline
+
+    builder = ShiftsBuilder.model_validate_json(args.builder.read_text())
+    stats = run_sla_pipeline(
+        builder,
+        args.source,
+        args.destination,
+        start_column=args.start_column,
+        end_column=args.end_column,
+        duration_column=args.duration_column,
+        sla_column=args.sla_column,
+        due_column=args.due_column,
+        chunk_rows=args.chunk_rows,
+        progress=None
+        if args.quiet
+        else lambda progress: print(
+            f"chunk {progress.chunks}: {progress.rows:,} rows"
+            f" in {progress.seconds:.1f}s ({progress.rows_per_second:,.0f} rows/s)",
+            file=sys.stderr,
+        ),
+    )
+    print(
+        f"{stats.rows:,} rows written to {args.destination}"
+        f" in {stats.seconds:.1f}s ({stats.rows_per_second:,.0f} rows/s)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,293 @@
+from datetime import date
+from os import PathLike
+from typing import Literal, Sequence, Tuple
+import struct
+import numpy as np
+import numpy.typing as npt
+
+from pyshiftsla.daily_shifts import DailyShift
+from pyshiftsla.intervals import (
+    INTERVAL_BOUNDS,
+    cumulative_durations,
+    interval_coverage,
+    merge_intervals,
+    work_before,
+)
+
+EPOCH_MILLISECONDS = INTERVAL_BOUNDS
+SNAPSHOT_MAGIC = b"PYSHSLA\x00"
+SNAPSHOT_VERSION = 1
+# magic, version, padding, from date ordinal, to date ordinal, number of intervals
+SNAPSHOT_HEADER = struct.Struct("<8sI4xqqq")
+
+
+def date_to_epoch_milliseconds(to_convert: date) -> int:
+    return int(
+        np.datetime64(to_convert, "D").astype("datetime64[ms]").view(np.int64)
+    )
+
+
+def as_epoch_milliseconds(timestamps: npt.ArrayLike) -> EPOCH_MILLISECONDS:
+    """Turn `datetime64` (or already epoch milliseconds) arrays into `int64` epoch milliseconds"""
+    timestamps = np.asarray(timestamps)
+    if np.issubdtype(timestamps.dtype, np.datetime64):
+        return timestamps.astype("datetime64[ms]").view(np.int64)
+    return timestamps.astype(np.int64, copy=False)
+
+
+def daily_shift_bounds(
+    daily_shift: DailyShift,
+) -> Tuple[EPOCH_MILLISECONDS, EPOCH_MILLISECONDS]:
+    """Milliseconds from the start of the day, of every `Shift`'s start and end"""
+    bounds = daily_shift.bounds.astype(np.int64)
+    return bounds[:, 0], bounds[:, 1]
+
+
+class CompiledCalendar:
+    """
+    Array-backed, read-only calendar of generated `Shift`s from `from_date` to `to_date`.
+    Every working interval is stored in epoch milliseconds, sorted and not overlapped,
+    along with the cumulative working milliseconds before each interval.
+    Working time between 2 timestamps then costs 2 binary searches and a subtraction.
+
+    :param from_date: first date covered by the calendar
+    :param to_date: last date covered by the calendar (included)
+    :param starts: epoch milliseconds of every interval's start
+    :param ends: epoch milliseconds of every interval's end
+    """
+
+    __slots__ = ("from_date", "to_date", "starts", "ends", "cumulative")
+
+    def __init__(
+        self,
+        from_date: date,
+        to_date: date,
+        starts: EPOCH_MILLISECONDS,
+        ends: EPOCH_MILLISECONDS,
+    ):
+        self.from_date = from_date
+        self.to_date = to_date
+        self.starts, self.ends = merge_intervals(
+            np.asarray(starts, dtype=np.int64), np.asarray(ends, dtype=np.int64)
+        )
+        self.cumulative = cumulative_durations(self.starts, self.ends)
+        for array in (self.starts, self.ends, self.cumulative):
+            array.flags.writeable = False
+
+    @classmethod
+    def from_compiled(
+        cls,
+        from_date: date,
+        to_date: date,
+        starts: EPOCH_MILLISECONDS,
+        ends: EPOCH_MILLISECONDS,
+        cumulative: EPOCH_MILLISECONDS,
+    ) -> "CompiledCalendar":
+        """
+        Wrap the arrays of an already compiled calendar (e.g. in shared memory),
+        without copying nor merging them again
+        """
+        calendar = cls.__new__(cls)
+        calendar.from_date = from_date
+        calendar.to_date = to_date
+        calendar.starts = starts
+        calendar.ends = ends
+        calendar.cumulative = cumulative
+        for array in (calendar.starts, calendar.ends, calendar.cumulative):
+            array.flags.writeable = False
+        return calendar
+
+    @classmethod
+    def coverage(
+        cls, calendars: Sequence["CompiledCalendar"], min_count: int = 1
+    ) -> "CompiledCalendar":
+        """
+        Calendar of the times covered by at least `min_count` of the `calendars`
+        (e.g. a team coverage calendar, of the agents' calendars), found with one sweep line.
+        `min_count=1` is their union, `min_count=len(calendars)` their intersection.
+        """
+        assert len(calendars) > 0, "Coverage of no `CompiledCalendar`s"
+        starts, ends = interval_coverage(
+            [calendar.starts for calendar in calendars],
+            [calendar.ends for calendar in calendars],
+            min_count,
+        )
+        return cls(
+            min(calendar.from_date for calendar in calendars),
+            max(calendar.to_date for calendar in calendars),
+            starts,
+            ends,
+        )
+
+    def save(self, path: str | PathLike) -> None:
+        """
+        Save to a versioned binary snapshot: a small header, then the `int64` starts, ends and cumulative arrays.
+        Load it back with `CompiledCalendar.load`
+        """
+        with open(path, "wb") as snapshot:
+            snapshot.write(
+                SNAPSHOT_HEADER.pack(
+                    SNAPSHOT_MAGIC,
+                    SNAPSHOT_VERSION,
+                    self.from_date.toordinal(),
+                    self.to_date.toordinal(),
+                    len(self),
+                )
+            )
+            for array in (self.starts, self.ends, self.cumulative):
+                snapshot.write(
+                    np.ascontiguousarray(array, dtype="<i8").tobytes()
+                )
+
+    @classmethod
+    def load(
+        cls, path: str | PathLike, mmap: bool = True
+    ) -> "CompiledCalendar":
+        """
+        Load a snapshot saved by `save`. With `mmap`, the arrays are memory-mapped, not read,
+        so loading takes the same time whatever the calendar's horizon is.
+        """
+        with open(path, "rb") as snapshot:
+            header = snapshot.read(SNAPSHOT_HEADER.size)
+        if len(header) != SNAPSHOT_HEADER.size:
+            raise ValueError(f"Not a `CompiledCalendar` snapshot: {path}")
+        (
+            magic,
+            version,
+            from_ordinal,
+            to_ordinal,
+            intervals,
+        ) = SNAPSHOT_HEADER.unpack(header)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"Not a `CompiledCalendar` snapshot: {path}")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(
+                f"Unsupported snapshot version {version}, expected {SNAPSHOT_VERSION}: {path}"
+            )
+        shape = (3 * intervals + 1,)
+        if mmap:
+            arrays = np.memmap(
+                path,
+                dtype="<i8",
+                mode="r",
+                offset=SNAPSHOT_HEADER.size,
+                shape=shape,
+            )
+        else:
+            arrays = np.fromfile(
+                path, dtype="<i8", offset=SNAPSHOT_HEADER.size, count=shape[0]
+            )
+        if arrays.shape != shape:
+            raise ValueError(f"Truncated `CompiledCalendar` snapshot: {path}")
+        return cls.from_compiled(
+            date.fromordinal(from_ordinal),
+            date.fromordinal(to_ordinal),
+            arrays[:intervals],
+            arrays[intervals : 2 * intervals],
+            arrays[2 * intervals :],
+        )
+
+    def __len__(self) -> int:
+        return self.starts.size
+
+    @property
+    def horizon_milliseconds(self) -> Tuple[int, int]:
+        """Epoch milliseconds of the start of `from_date` and the end of `to_date`"""
+        return (
+            date_to_epoch_milliseconds(self.from_date),
+            date_to_epoch_milliseconds(self.to_date) + 86_400_000,
+        )
+
+    @property
+    def total_milliseconds(self) -> int:
+        return int(self.cumulative[-1])
+
+    def covers(self, timestamps: npt.ArrayLike) -> bool:
+        epoch_millis = as_epoch_milliseconds(timestamps)
+        if epoch_millis.size == 0:
+            return True
+        horizon_start, horizon_end = self.horizon_milliseconds
+        return bool(
+            epoch_millis.min() >= horizon_start
+            and epoch_millis.max() <= horizon_end
+        )
+
+    def work_before(self, timestamps: npt.ArrayLike) -> EPOCH_MILLISECONDS:
+        """
+        Working milliseconds from the start of the calendar to each timestamp
+        """
+        epoch_millis = as_epoch_milliseconds(timestamps)
+        if not self.covers(epoch_millis):
+            raise ValueError(
+                f"Timestamps are outside of the compiled calendar, from {self.from_date} to {self.to_date}"
+            )
+        return work_before(
+            self.starts, self.ends, self.cumulative, epoch_millis
+        )
+
+    def work_amount_between(
+        self,
+        start_works: npt.ArrayLike,
+        end_works: npt.ArrayLike,
+        default_if_no_shifts_are_between: Literal["diff"] | int = "diff",
+    ) -> EPOCH_MILLISECONDS:
+        """
+        Working milliseconds between each pair of `start_works` and `end_works`.
+        :param `default_if_no_shifts_are_between`: is used when no `Shift`s are found between a pair. If `"diff"`, the milliseconds between the pair are used
+        """
+        start_millis = as_epoch_milliseconds(start_works)
+        end_millis = as_epoch_milliseconds(end_works)
+        if start_millis.shape != end_millis.shape:
+            raise ValueError(
+                f"Mismatched number of starts and ends: {start_millis.shape} and {end_millis.shape}"
+            )
+        if (end_millis < start_millis).any():
+            raise ValueError("'Start' events must happen before 'End' events")
+        work_amounts = self.work_before(end_millis) - self.work_before(
+            start_millis
+        )
+        fallback = (
+            end_millis - start_millis
+            if default_if_no_shifts_are_between == "diff"
+            else default_if_no_shifts_are_between
+        )
+        return np.where(work_amounts == 0, fallback, work_amounts).astype(
+            np.int64
+        )
+
+    def due_after(
+        self,
+        start_works: npt.ArrayLike,
+        milliseconds_durations: npt.ArrayLike,
+    ) -> npt.NDArray[np.datetime64]:
+        """
+        Due time of each `start_works`, after working its `milliseconds_durations`.
+        The interval holding the due time is found with a binary search
+        over the cumulative working milliseconds.
+        :return: `datetime64[ms]` array, `NaT` where the calendar runs out of working time
+        """
+        start_millis = as_epoch_milliseconds(start_works)
+        durations = np.broadcast_to(
+            np.asarray(milliseconds_durations, dtype=np.int64),
+            start_millis.shape,
+        )
+        if (durations < 0).any():
+            raise ValueError("Durations must not be negative")
+        targets = self.work_before(start_millis) + durations
+        fits = targets <= self.total_milliseconds
+        dues = start_millis.copy()
+        if self.starts.size > 0:
+            interval_idx = np.minimum(
+                np.searchsorted(self.cumulative[1:], targets, "left"),
+                self.starts.size - 1,
+            )
+            dues = np.where(
+                durations > 0,
+                self.starts[interval_idx]
+                + targets
+                - self.cumulative[interval_idx],
+                start_millis,
+            )
+        dues = dues.view("datetime64[ms]")
+        dues[~fits] = np.datetime64("NaT")
+        return dues
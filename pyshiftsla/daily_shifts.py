@@ -1,12 +1,26 @@
+from bisect import bisect_right
 from pydantic import AfterValidator, RootModel
-from typing import Annotated, List, Literal, Dict, Tuple
+from typing import Annotated, List, Literal, Dict, Sequence, Tuple
 from datetime import datetime, time
+import numpy as np
+import numpy.typing as npt
 from pyshiftsla.datetime_utilities import (
+    MILLISECONDS_IN_A_DAY,
     Milliseconds,
     check_start_end_event,
     diff_time,
+    milliseconds_from_day_start,
+)
+from pyshiftsla.shift import Shift
+from pyshiftsla.intervals import (
+    INTERVAL_BOUNDS,
+    coverage_counts,
+    cumulative_durations,
+    interval_coverage,
+    merge_intervals,
+    overlap_groups,
+    work_before,
 )
-from pyshiftsla.shift import Shift, RESOLVED_TWO_SHIFTS
 
 RESOLVE_SHIFTS_METHOD = Literal[
     "overlapped", "outer", "throw-error", "delete-both"
@@ -27,7 +41,24 @@ def check_shifts_in_day(shifts_to_check: List[Shift]) -> List[Shift]:
     return shifts_to_check
 
 
+def check_shifts_in_day_milliseconds(
+    days_milliseconds: npt.NDArray[np.float64],
+) -> None:
+    """Vectorized `check_shifts_in_day`, with the total milliseconds of every day"""
+    too_long = np.flatnonzero(days_milliseconds > MILLISECONDS_IN_A_DAY)
+    assert (
+        too_long.size == 0
+    ), f"A day has 86_400_000 milliseconds, The parsed shifts must have total sum milliseconds smaller than a day, at day indices: {too_long[:5].tolist()}"
+
+
 SHIFTS_IN_DAY = Annotated[List[Shift], AfterValidator(check_shifts_in_day)]
+DAILY_SHIFT_BOUNDS = npt.NDArray[np.int32]  # shape (shifts, 2): start, end
+DAILY_SHIFT_TIMELINE = Tuple[
+    List[Milliseconds], List[Milliseconds], List[Milliseconds]
+]  # merged starts, merged ends, cumulative milliseconds before each start
+DAY_SPAN = (
+    2 * MILLISECONDS_IN_A_DAY
+)  # bounds of a day, night `Shift`s included, are below it
 
 
 class DailyShift(RootModel):
@@ -36,13 +67,62 @@ class DailyShift(RootModel):
      these `Shift`s are not overlapped and
      have the total milliseconds smaller than or equal to a day
      (1day = 24hours = 24*60*60*1000Milliseconds)
+
+    Calculations run on its compact form `bounds`, built on first use:
+     the milliseconds from the day start of every `Shift`'s start and end,
+     sorted by starts.
+    Work amounts are found with 2 binary searches on its `timeline`.
     """
 
     root: SHIFTS_IN_DAY
 
+    _bounds: DAILY_SHIFT_BOUNDS | None = None
+    _timeline: DAILY_SHIFT_TIMELINE | None = None
+
+    @classmethod
+    def from_bounds(
+        cls, starts: npt.ArrayLike, ends: npt.ArrayLike
+    ) -> "DailyShift":
+        """Turn the compact form back into a `DailyShift`, `starts` and `ends` must be already checked"""
+        return cls._from_shifts_bounds(
+            [Shift.from_bounds(start, end) for start, end in zip(starts, ends)],
+            starts,
+            ends,
+        )
+
+    @classmethod
+    def _from_shifts_bounds(
+        cls, shifts: List[Shift], starts: npt.ArrayLike, ends: npt.ArrayLike
+    ) -> "DailyShift":
+        daily_shift = cls.model_construct(shifts)
+        daily_shift._bounds = (
+            np.column_stack((np.asarray(starts), np.asarray(ends)))
+            .astype(np.int32)
+            .reshape(-1, 2)
+        )
+        daily_shift._bounds.flags.writeable = False
+        return daily_shift
+
+    @property
+    def bounds(self) -> DAILY_SHIFT_BOUNDS:
+        if self._bounds is None:
+            bounds = np.array(
+                [shift.bounds for shift in self.root], dtype=np.int32
+            ).reshape(-1, 2)
+            bounds = bounds[np.argsort(bounds[:, 0], kind="stable")]
+            bounds.flags.writeable = False
+            self._bounds = bounds
+        return self._bounds
+
     def __iter__(self) -> List[Shift]:
         return self.root
 
+    def __eq__(self, other: object) -> bool:
+        """Equal `Shift`s, whatever is cached in the compact form"""
+        if not isinstance(other, DailyShift):
+            return NotImplemented
+        return self.root == other.root
+
     def __getitem__(self, idx: int) -> Shift | None:
         if not isinstance(idx, int):
             raise NotImplementedError(
@@ -62,56 +142,113 @@ class DailyShift(RootModel):
     def resolve_overlap_shifts(
         cls, shifts: List[Shift], method: RESOLVE_SHIFTS_METHOD = "throw-error"
     ) -> "DailyShift":
-        sorted_shifts = cls.sorted_shifts_start(shifts)
-        resolved = []
-
-        for idx, (tmp_shift, tmp_next_shift) in enumerate(
-            zip(sorted_shifts, sorted_shifts[1:])
-        ):
-            tmp_resolve = tmp_shift.resolve(tmp_next_shift)
-            if tmp_shift is None:
-                continue
-            match method, tmp_resolve["compare_result"]:
-                case _, "smaller" | "greater":
-                    resolved.append(tmp_shift)
-                case "delete-both", _:
-                    sorted_shifts[idx + 1] = None
-                case "throw-error", _:
-                    raise ValueError(
-                        f"overlap Shifts:\n+ At index {idx}: \
-                        {tmp_shift}\n + At index {idx+1}: {tmp_next_shift}"
-                    )
-                case _, "overlapped" | "outer":
-                    (
-                        sorted_shifts,
-                        resolved,
-                    ) = cls.resolve_overlapped_outer_shifts(
-                        tmp_resolve, method, sorted_shifts, resolved
-                    )
-        recheck_overlapped_shifts = cls.check_overlap_shifts(resolved)
-        assert (
-            len(recheck_overlapped_shifts) == 0
-        ), f"Tried resolving, cant resolved these `Shift`s: {recheck_overlapped_shifts}"
-        return DailyShift(resolved)
+        """
+        Turn overlapped `Shift`s into a `DailyShift`, with a sort and a sweep line over their bounds.
+        Each group of overlapped `Shift`s (connected ones do not overlap) is resolved by `method`:
 
-    @staticmethod
-    def resolve_overlapped_outer_shifts(
-        tmp_resolve: RESOLVED_TWO_SHIFTS,
-        method: Literal["overlapped", "outer"],
-        sorted_original_shifts: SORTED_SHIFTS_START,
-        sorted_resolving_shifts: SORTED_SHIFTS_START,
-        tmp_shift_idx: int,
-    ) -> Tuple[SORTED_SHIFTS_START, SORTED_SHIFTS_START]:
+        - "throw-error": raise a `ValueError`
+        - "delete-both": delete every `Shift` of the group
+        - "overlapped": keep the times covered by at least 2 `Shift`s of the group
+        - "outer": keep the times covered by only 1 `Shift`, connected `Shift`s are merged
+        """
+        return cls.resolve_overlap_shifts_batch([shifts], method)[0]
+
+    @classmethod
+    def resolve_overlap_shifts_batch(
+        cls,
+        shifts_lists: Sequence[Sequence[Shift]],
+        method: RESOLVE_SHIFTS_METHOD = "throw-error",
+    ) -> List["DailyShift"]:
+        """
+        `resolve_overlap_shifts` of many days in one sweep:
+        the bounds of every day are shifted by `DAY_SPAN` times its index,
+        so that `Shift`s of different days never overlap.
+        Identical resolved `Shift`s are the same object, so treat them as read-only.
+
+        :param shifts_lists: `Shift`s of every day
+        :rtype: a `DailyShift` for every day
+        """
+        days_num = len(shifts_lists)
+        bounds = np.array(
+            [shift.bounds for shifts in shifts_lists for shift in shifts],
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        day_offsets = np.repeat(
+            np.arange(days_num, dtype=np.int64) * DAY_SPAN,
+            np.fromiter(map(len, shifts_lists), np.int64, days_num),
+        )
+        starts, ends = bounds[:, 0] + day_offsets, bounds[:, 1] + day_offsets
+        order = np.argsort(starts, kind="stable")
+        starts, ends = starts[order], ends[order]
+        groups = overlap_groups(starts, ends)
+        overlapped = np.bincount(groups)[groups] > 1
         match method:
+            case "throw-error":
+                if overlapped.any():
+                    # the 2 first `Shift`s of a group overlap each other
+                    first, second = np.flatnonzero(overlapped)[:2]
+                    raise ValueError(
+                        f"overlap Shifts at day index {starts[first] // DAY_SPAN}:"
+                        f" {cls._shift_at(starts[first], ends[first])},"
+                        f" {cls._shift_at(starts[second], ends[second])}"
+                    )
+            case "delete-both":
+                starts, ends = starts[~overlapped], ends[~overlapped]
             case "outer":
-                sorted_resolving_shifts.append(tmp_resolve[method][0])
-                sorted_original_shifts[tmp_shift_idx + 1] = tmp_resolve[method][
-                    1
-                ]
+                events, counts = coverage_counts(starts, ends)
+                alone = counts[:-1] == 1
+                starts, ends = merge_intervals(
+                    events[:-1][alone], events[1:][alone]
+                )
             case "overlapped":
-                sorted_resolving_shifts.append(tmp_resolve[method])
-                sorted_resolving_shifts[tmp_shift_idx + 1] = tmp_resolve[method]
-        return sorted_original_shifts, sorted_resolving_shifts
+                events, counts = coverage_counts(
+                    starts[overlapped], ends[overlapped]
+                )
+                shared = counts[:-1] >= 2
+                shared_starts, shared_ends = merge_intervals(
+                    events[:-1][shared], events[1:][shared]
+                )
+                starts = np.concatenate((starts[~overlapped], shared_starts))
+                ends = np.concatenate((ends[~overlapped], shared_ends))
+                order = np.argsort(starts, kind="stable")
+                starts, ends = starts[order], ends[order]
+            case _:
+                raise ValueError(f"Unknown resolving method: {method}")
+        days = starts // DAY_SPAN
+        after_midnight = np.flatnonzero(
+            starts - days * DAY_SPAN >= MILLISECONDS_IN_A_DAY
+        )
+        if after_midnight.size:
+            raise ValueError(
+                f"Resolved `Shift`s must start before midnight, at day indices"
+                f" {np.unique(days[after_midnight])[:5].tolist()}:"
+                f" {cls._shift_at(starts[after_midnight[0]], ends[after_midnight[0]])}"
+            )
+        check_shifts_in_day_milliseconds(
+            np.bincount(days, weights=ends - starts, minlength=days_num)
+        )
+        starts, ends = starts - days * DAY_SPAN, ends - days * DAY_SPAN
+        distinct_bounds, shift_idx = np.unique(
+            np.column_stack((starts, ends)), axis=0, return_inverse=True
+        )
+        distinct_shifts = [
+            Shift.from_bounds(start, end)
+            for start, end in distinct_bounds.tolist()
+        ]
+        shifts = [distinct_shifts[idx] for idx in shift_idx.ravel().tolist()]
+        day_starts = np.searchsorted(days, np.arange(days_num + 1)).tolist()
+        return [
+            cls._from_shifts_bounds(
+                shifts[first:last], starts[first:last], ends[first:last]
+            )
+            for first, last in zip(day_starts[:-1], day_starts[1:])
+        ]
+
+    @staticmethod
+    def _shift_at(start: Milliseconds, end: Milliseconds) -> Shift:
+        return Shift.from_bounds(
+            int(start % MILLISECONDS_IN_A_DAY), int(end % MILLISECONDS_IN_A_DAY)
+        )
 
     @classmethod
     def check_overlap_shifts(
@@ -128,9 +265,34 @@ class DailyShift(RootModel):
             overlapped[idx] = [tmp_shift, next_tmp_shift]
         return overlapped
 
+    @property
+    def timeline(self) -> DAILY_SHIFT_TIMELINE:
+        """
+        Boundaries of the merged `Shift`s, sorted,
+        along with the cumulative working milliseconds before each `Shift`
+        """
+        if self._timeline is None:
+            starts, ends = merge_intervals(
+                self.bounds[:, 0].astype(np.int64),
+                self.bounds[:, 1].astype(np.int64),
+            )
+            self._timeline = (
+                starts.tolist(),
+                ends.tolist(),
+                cumulative_durations(starts, ends).tolist(),
+            )
+        return self._timeline
+
     @property
     def total_milliseconds(self) -> Milliseconds:
-        return sum([shift.diff for shift in self.root])
+        return int((self.bounds[:, 1] - self.bounds[:, 0]).sum())
+
+    @property
+    def milliseconds_after_midnight(self) -> Milliseconds:
+        """Milliseconds of the night shifts worked after midnight, in the next day"""
+        starts = self.bounds[:, 0].astype(np.int64)
+        ends = self.bounds[:, 1].astype(np.int64)
+        return int((ends - np.clip(starts, MILLISECONDS_IN_A_DAY, ends)).sum())
 
     def work_amount_in_shifts(
         self,
@@ -139,11 +301,9 @@ class DailyShift(RootModel):
         default_if_no_shifts_are_between: Literal["diff"] | int = "diff",
     ) -> Milliseconds:
         check_start_end_event(start_work, end_work)
-        work_amount_in_shifts = sum(
-            [
-                shift.work_amount_in_shift(start_work, end_work)
-                for shift in self.root
-            ]
+        work_amount_in_shifts = self.work_amount_in_bounds(
+            milliseconds_from_day_start(start_work),
+            milliseconds_from_day_start(end_work),
         )
         if work_amount_in_shifts == 0:
             work_amount_in_shifts = (
@@ -153,11 +313,105 @@ class DailyShift(RootModel):
             )
         return work_amount_in_shifts
 
+    def work_before_bounds(self, milliseconds: Milliseconds) -> Milliseconds:
+        """Working milliseconds from the day start, until `milliseconds` from the day start"""
+        starts, ends, cumulative = self.timeline
+        shift_idx = bisect_right(starts, milliseconds) - 1
+        if shift_idx < 0:
+            return 0
+        return (
+            cumulative[shift_idx]
+            + min(milliseconds, ends[shift_idx])
+            - starts[shift_idx]
+        )
+
+    def work_amount_in_bounds(
+        self, start_work: Milliseconds, end_work: Milliseconds
+    ) -> Milliseconds:
+        """Same as `work_amount_in_shifts`, with milliseconds from the day start, without checks"""
+        return self.work_before_bounds(end_work) - self.work_before_bounds(
+            start_work
+        )
+
+    def work_amount_in_bounds_batch(
+        self, start_works: npt.ArrayLike, end_works: npt.ArrayLike
+    ) -> INTERVAL_BOUNDS:
+        """
+        Vectorized `work_amount_in_bounds`, for many intervals on the same `DailyShift`
+        """
+        starts, ends, cumulative = (
+            np.asarray(boundaries, dtype=np.int64)
+            for boundaries in self.timeline
+        )
+        return work_before(
+            starts, ends, cumulative, np.asarray(end_works, dtype=np.int64)
+        ) - work_before(
+            starts, ends, cumulative, np.asarray(start_works, dtype=np.int64)
+        )
+
+    def shifts_between(
+        self, start_work: time | None = None, end_work: time | None = None
+    ) -> "DailyShift":
+        """
+        Get the parts of `Shift`s between `start_work` and `end_work`.
+        `None` means the start, or the end of the day.
+        """
+        starts, ends = self.bounds[:, 0], self.bounds[:, 1]
+        if start_work is not None:
+            starts = np.maximum(starts, milliseconds_from_day_start(start_work))
+        if end_work is not None:
+            ends = np.minimum(ends, milliseconds_from_day_start(end_work))
+        between = starts < ends
+        return DailyShift.from_bounds(starts[between], ends[between])
+
     def shifts_from_duration(
         self,
         start_work: time,
-        end_work: time,
-        milliseconds_duration: int,
+        milliseconds_duration: Milliseconds,
+    ) -> "DailyShift":
+        """
+        Get the `Shift`s worked from `start_work`,
+        until `milliseconds_duration` is used up or the day ends.
+        """
+        bounds = self.shifts_between(start_work).bounds
+        starts, ends = bounds[:, 0], bounds[:, 1]
+        worked_before = np.concatenate(([0], np.cumsum(ends - starts)[:-1]))
+        remaining = milliseconds_duration - worked_before
+        worked = remaining > 0
+        ends = np.minimum(ends, starts + remaining)
+        return DailyShift.from_bounds(starts[worked], ends[worked])
+
+    @classmethod
+    def coverage(
+        cls, daily_shifts: Sequence["DailyShift"], min_count: int = 1
     ) -> "DailyShift":
-        # if milliseconds_duration >= self.total_milliseconds:
-        ...
+        """
+        Times of the day covered by at least `min_count` of the `daily_shifts`,
+        e.g. when at least 2 agents of a team are on shift.
+        Found with a sweep line over their bounds, the returned `Shift`s are merged.
+        """
+        starts, ends = interval_coverage(
+            [daily_shift.bounds[:, 0] for daily_shift in daily_shifts],
+            [daily_shift.bounds[:, 1] for daily_shift in daily_shifts],
+            min_count,
+        )
+        return cls.from_bounds(starts, ends)
+
+    @classmethod
+    def union(cls, daily_shifts: Sequence["DailyShift"]) -> "DailyShift":
+        return cls.coverage(daily_shifts, 1)
+
+    @classmethod
+    def intersection(cls, daily_shifts: Sequence["DailyShift"]) -> "DailyShift":
+        assert len(daily_shifts) > 0, "Intersection of no `DailyShift`s"
+        return cls.coverage(daily_shifts, len(daily_shifts))
+
+    def difference(self, others: Sequence["DailyShift"]) -> "DailyShift":
+        """Times of the day of this `DailyShift`, outside of every `others`"""
+        starts, ends = interval_coverage(
+            [self.bounds[:, 0]] + [other.bounds[:, 0] for other in others],
+            [self.bounds[:, 1]] + [other.bounds[:, 1] for other in others],
+            1,
+            [1] + [-1] * len(others),
+        )
+        return DailyShift.from_bounds(starts, ends)
@@ -1,10 +1,16 @@
-from typing import List, Literal, Optional
-import polars as pl
-from pydantic import BaseModel
+from calendar import monthrange
+from functools import lru_cache
+from typing import List, Literal, Optional, Tuple
+import numpy as np
+import numpy.typing as npt
+from pydantic import BaseModel, ConfigDict
 from datetime import date, datetime
-from lunardate import LunarDate
+
+from pyshiftsla import instrumentation
+from pyshiftsla.lunar import LUNAR_YEARS, lunar_to_solar
 
 CALENDAR_TYPE = Literal["lunar", "solar"]
+MONTH_DAY = Tuple[int, int]
 
 
 class DateRangeConfig(BaseModel):
@@ -54,26 +60,33 @@ class DateRange(DateRangeConfig):
         """
         Return a list of dates, inside the date range, including the start and end date.
         """
+        dates_in_range: List[date] = self.to_numpy().tolist()
+        return dates_in_range
+
+    def to_numpy(self) -> npt.NDArray[np.datetime64]:
+        """
+        Same as `dates`, but as a `datetime64[D]` numpy array.
+        """
         daterange = self.solar_daterange
+        start = np.datetime64(daterange.start, "D")
         if not self.end:
-            return [daterange.start]
-        dates_in_range: List[date] = pl.date_range(
-            start=daterange.start, end=daterange.end, eager=True
-        ).to_list()
-        return dates_in_range
+            return np.array([start])
+        return np.arange(start, np.datetime64(daterange.end, "D") + 1)
 
     def lunar_to_solar_daterange(self) -> "DateRange":
         """
-        Turn lunar `DateRange` into solar `DateRange`
+        Turn lunar `DateRange` into solar `DateRange`,
+        conversions are memoized by `lunar_to_solar`
         """
-        solar_date_start = LunarDate(
-            self.start.year, self.start.month, self.start.day
-        ).toSolarDate()
-        solar_date_end = None
-        if self.end:
-            solar_date_end = LunarDate(
-                self.end.year, self.end.month, self.end.day
-            ).toSolarDate()
+        with instrumentation.stage("lunar.to_solar"):
+            solar_date_start = lunar_to_solar(
+                self.start.year, self.start.month, self.start.day
+            )
+            solar_date_end = None
+            if self.end:
+                solar_date_end = lunar_to_solar(
+                    self.end.year, self.end.month, self.end.day
+                )
         return DateRange(start=solar_date_start, end=solar_date_end)
 
     # def from_dates(
@@ -85,5 +98,120 @@ class DateRange(DateRangeConfig):
         pass
 
 
+class RecurringDateRange(BaseModel):
+    """
+    `DateRange` repeated every year, e.g. lunar `0101-0105` (Tet holiday) or solar `0902` (National Day).
+    Accepted in `ShiftsBuilder.days_off_ranges` along with `DateRange` and `date`,
+    it is only expanded for the years that are queried, and the expansion of each year is memoized.
+    A day past the end of its month is moved to the last day of the month (e.g. lunar `1230` in a 29-days month).
+
+    :param start: (month, day) of the first date
+    :param end: (month, day) of the last date (included), `None` for a single date.
+        If before `start`, the range ends in the next year
+    :param calendar_type: `"lunar"` or `"solar"` months and days
+    :param from_year: first year of the rule, `None` for no limit
+    :param to_year: last year of the rule (included), `None` for no limit
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    start: MONTH_DAY
+    end: Optional[MONTH_DAY] = None
+    calendar_type: CALENDAR_TYPE = "solar"
+    from_year: Optional[int] = None
+    to_year: Optional[int] = None
+
+    @staticmethod
+    def fromstr(
+        rule_str: str,
+        calendar_type: CALENDAR_TYPE = "solar",
+        date_format: str = "%m%d",
+        from_year: Optional[int] = None,
+        to_year: Optional[int] = None,
+    ) -> "RecurringDateRange":
+        dates_component = rule_str.strip().split("-")
+        invalid_rule_str = f"Recurring date range must be in the format '{date_format}-{date_format}' or '{date_format}', invalid: {rule_str}"
+        assert len(dates_component) in [1, 2], invalid_rule_str
+        try:
+            # 2000 is a leap year, to accept February 29th
+            def format_monthday(idx: int) -> Tuple[int, int]:
+                return datetime.strptime(
+                    f"2000 {dates_component[idx]}", f"%Y {date_format}"
+                ).timetuple()[1:3]
+
+            end = None
+            if len(dates_component) == 2 and dates_component[1] != "":
+                end = format_monthday(1)
+            return RecurringDateRange(
+                start=format_monthday(0),
+                end=end,
+                calendar_type=calendar_type,
+                from_year=from_year,
+                to_year=to_year,
+            )
+        except Exception as err:
+            raise ValueError(invalid_rule_str) from err
+
+    def _to_solar(self, year: int, month_day: MONTH_DAY) -> date:
+        month, day = month_day
+        match self.calendar_type:
+            case "solar":
+                return date(year, month, min(day, monthrange(year, month)[1]))
+            case "lunar":
+                try:
+                    return lunar_to_solar(year, month, day)
+                except ValueError:
+                    if day != 30:
+                        raise
+                    return lunar_to_solar(year, month, 29)
+
+    def daterange_at(self, year: int) -> DateRange | None:
+        """
+        Solar `DateRange` of the rule starting in `year`, `None` if the rule doesn't apply to `year`,
+        or if `year` is out of the `LUNAR_YEARS` for a lunar rule
+        """
+        if (self.from_year is not None and year < self.from_year) or (
+            self.to_year is not None and year > self.to_year
+        ):
+            return None
+        if self.calendar_type == "lunar" and not (
+            LUNAR_YEARS[0] <= year <= LUNAR_YEARS[1]
+        ):
+            return None
+        start = self._to_solar(year, self.start)
+        if self.end is None:
+            return DateRange(start=start)
+        end_year = year if self.end >= self.start else year + 1
+        return DateRange(start=start, end=self._to_solar(end_year, self.end))
+
+    def to_numpy(
+        self, from_year: int, to_year: int
+    ) -> npt.NDArray[np.datetime64]:
+        """
+        `datetime64[D]` dates of the rule starting from `from_year` to `to_year` (included)
+        """
+        return np.concatenate(
+            [
+                _recurring_dates_at(self, year)
+                for year in range(from_year, to_year + 1)
+            ]
+            + [np.array([], dtype="datetime64[D]")]
+        )
+
+
+@lru_cache(maxsize=None)
+def _recurring_dates_at(
+    rule: RecurringDateRange, year: int
+) -> npt.NDArray[np.datetime64]:
+    daterange = rule.daterange_at(year)
+    dates = (
+        np.array([], dtype="datetime64[D]")
+        if daterange is None
+        else daterange.to_numpy()
+    )
+    dates.flags.writeable = False
+    return dates
+
+
 if __name__ == "__main__":
     pass
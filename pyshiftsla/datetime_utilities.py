@@ -1,15 +1,32 @@
 from typing import List, Literal
-from datetime import time, datetime, timedelta
+from datetime import time, datetime, timedelta, timezone
+import numpy as np
+import numpy.typing as npt
 
 Milliseconds = int
 WEEKDAYS_INDEXES = [0, 1, 2, 3, 4, 5, 6]
 
 
+MILLISECONDS_IN_A_DAY = 86_400_000
+
+
 def milliseconds_from_day_start(to_convert: time) -> Milliseconds:
     hour_to_milli = to_convert.hour * 60 * 60 * 1000
     minutes_to_milli = to_convert.minute * 60 * 1000
-    micro_to_milli = to_convert.microsecond * 1000
-    return hour_to_milli + minutes_to_milli + micro_to_milli
+    seconds_to_milli = to_convert.second * 1000
+    micro_to_milli = to_convert.microsecond // 1000
+    return hour_to_milli + minutes_to_milli + seconds_to_milli + micro_to_milli
+
+
+def time_from_milliseconds(milliseconds: Milliseconds) -> time:
+    """Inverse of `milliseconds_from_day_start`"""
+    assert (
+        0 <= milliseconds < MILLISECONDS_IN_A_DAY
+    ), f"{milliseconds} milliseconds is outside of a day"
+    seconds, milli = divmod(int(milliseconds), 1000)
+    minutes, second = divmod(seconds, 60)
+    hour, minute = divmod(minutes, 60)
+    return time(hour, minute, second, milli * 1000)
 
 
 def diff_time(start: time, end: time) -> Milliseconds:
@@ -53,3 +70,31 @@ def check_valid_weekday(weekday: int) -> List[int]:
         weekday in WEEKDAYS_INDEXES
     ), f"{weekday} is out of weekdays indexes: [0,1,2,3,4,5,6]"
     return weekday
+
+
+def to_naive_utc(timestamp: datetime) -> datetime:
+    """Naive UTC `datetime` of an aware `datetime`, naive ones are already UTC"""
+    if timestamp.tzinfo is None:
+        return timestamp
+    return timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def to_datetime64_ms(timestamps) -> npt.NDArray[np.datetime64]:
+    """
+    Turn a batch of timestamps into a `datetime64[ms]` numpy array.
+    Accepts numpy `datetime64` arrays, polars `Series` or lists of `datetime`,
+    aware `datetime`s are converted to UTC.
+    """
+    if hasattr(timestamps, "to_numpy"):  # polars `Series`
+        timestamps = timestamps.to_numpy()
+    elif not isinstance(timestamps, np.ndarray):
+        timestamps = [
+            to_naive_utc(timestamp)
+            if isinstance(timestamp, datetime)
+            else timestamp
+            for timestamp in timestamps
+        ]
+    converted = np.asarray(timestamps, dtype="datetime64[ms]")
+    if np.isnat(converted).any():
+        raise ValueError("Timestamps must not contain null values (NaT)")
+    return converted
@@ -0,0 +1,132 @@
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, List, Tuple
+
+from pyshiftsla import instrumentation
+from pyshiftsla.daily_shifts import DailyShift
+from pyshiftsla.shiftrange import ShiftRange
+
+if TYPE_CHECKING:
+    from pyshiftsla.shifts_builder import ShiftsBuilder
+
+DATE_SPAN = Tuple[date, date]
+DAY = timedelta(days=1)
+
+
+class ExtendingShiftRange(ShiftRange):
+    """
+    `ShiftRange` generated by a `ShiftsBuilder`, growing to cover the union of the queried windows.
+    `cover` only generates the date spans that are not covered yet,
+    and merges the spans it touches, so the covered spans stay sorted, apart and not adjacent.
+    When more than `max_days` are covered, the least recently used spans are evicted.
+    Use `ShiftsBuilder.build_extending_shifts` to create one,
+    or `ShiftsBuilder.calculate_sla(use_generated_shifts="extend")`.
+    """
+
+    _builder: "ShiftsBuilder | None" = None
+    _max_days: int = 3_660
+    _spans: List[
+        List
+    ] | None = None  # sorted [from_date, to_date, last used tick]
+    _tick: int = 0
+    _builder_version: int = 0
+
+    @classmethod
+    def from_builder(
+        cls, builder: "ShiftsBuilder", max_days: int = 3_660
+    ) -> "ExtendingShiftRange":
+        extending_shiftrange = cls.model_construct({})
+        extending_shiftrange._builder = builder
+        extending_shiftrange._max_days = max_days
+        extending_shiftrange._spans = []
+        extending_shiftrange._builder_version = builder._config_version
+        return extending_shiftrange
+
+    def __setitem__(self, key: date, value: DailyShift | None):
+        raise NotImplementedError(
+            "`ExtendingShiftRange` is generated, change its `ShiftsBuilder` instead"
+        )
+
+    def update(self, to_update: ShiftRange) -> None:
+        raise NotImplementedError(
+            "`ExtendingShiftRange` is generated, change its `ShiftsBuilder` instead"
+        )
+
+    @property
+    def covered_spans(self) -> List[DATE_SPAN]:
+        return [(span[0], span[1]) for span in self._spans]
+
+    @property
+    def covered_days(self) -> int:
+        return sum((span[1] - span[0]).days + 1 for span in self._spans)
+
+    def _clear(self) -> None:
+        self.root.clear()
+        self._spans.clear()
+        self._invalidate_index()
+
+    @staticmethod
+    def _missing_spans(
+        from_date: date, to_date: date, spans: List[List]
+    ) -> List[DATE_SPAN]:
+        """Date spans from `from_date` to `to_date` not covered by the sorted `spans`"""
+        missing = []
+        cursor = from_date
+        for span_from, span_to, _ in spans:
+            if span_to < cursor or span_from > to_date:
+                continue
+            if span_from > cursor:
+                missing.append((cursor, span_from - DAY))
+            cursor = max(cursor, span_to + DAY)
+        if cursor <= to_date:
+            missing.append((cursor, to_date))
+        return missing
+
+    def cover(self, from_date: date, to_date: date) -> "ExtendingShiftRange":
+        """
+        Make sure every date from `from_date` to `to_date` is generated,
+        generating only the missing spans.
+        The spans overlapping or adjacent to the window are merged with it into one span.
+        """
+        if self._builder_version != self._builder._config_version:
+            self._clear()
+            self._builder_version = self._builder._config_version
+        self._tick += 1
+        # spans are apart, so sorted by both their from and to dates
+        first = bisect_left(
+            self._spans, from_date - DAY, key=lambda span: span[1]
+        )
+        last = bisect_right(
+            self._spans, to_date + DAY, key=lambda span: span[0]
+        )
+        touched_spans = self._spans[first:last]
+        missing_spans = self._missing_spans(from_date, to_date, touched_spans)
+        instrumentation.cache_lookup("extending_shifts", not missing_spans)
+        for missing_from, missing_to in missing_spans:
+            self.root.update(
+                self._builder._build_shiftrange(missing_from, missing_to).root
+            )
+        if missing_spans:
+            self._invalidate_index()
+        if touched_spans:
+            from_date = min(from_date, touched_spans[0][0])
+            to_date = max(to_date, touched_spans[-1][1])
+        self._spans[first:last] = [[from_date, to_date, self._tick]]
+        self._evict()
+        return self
+
+    def _evict(self) -> None:
+        """Evict the least recently used spans, but never the ones used by the last `cover`"""
+        evictable = sorted(
+            (span for span in self._spans if span[2] < self._tick),
+            key=lambda span: span[2],
+        )
+        covered_days = self.covered_days
+        for span in evictable:
+            if covered_days <= self._max_days:
+                break
+            for days in range((span[1] - span[0]).days + 1):
+                self.root.pop(span[0] + timedelta(days=days), None)
+            self._spans.remove(span)
+            covered_days -= (span[1] - span[0]).days + 1
+            self._invalidate_index()
@@ -0,0 +1,109 @@
+from contextlib import contextmanager, nullcontext
+from threading import Lock
+from typing import Callable, ContextManager, Dict, Iterator, List
+import time
+from pydantic import BaseModel
+
+STAGE_CALLBACK = Callable[[str, float], None]  # stage name, seconds
+
+
+class StageStats(BaseModel):
+    calls: int = 0
+    seconds: float = 0.0
+
+
+class StatsSnapshot(BaseModel):
+    """
+    Copy of the collected stats.
+
+    :param stages: calls and total seconds of every timed stage, e.g. `"days_off.compile"`
+    :param counters: e.g. `"days_off.hits"`, `"days_off.misses"`, `"days.materialized"`
+    """
+
+    stages: Dict[str, StageStats] = {}
+    counters: Dict[str, int] = {}
+
+
+# Opt-in: while disabled, `stage` returns a shared no-op context and `count` returns at once
+_enabled = False
+_lock = Lock()
+_stages: Dict[str, StageStats] = {}
+_counters: Dict[str, int] = {}
+_callbacks: List[STAGE_CALLBACK] = []
+_DISABLED_STAGE = nullcontext()
+
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    with _lock:
+        _stages.clear()
+        _counters.clear()
+
+
+def snapshot() -> StatsSnapshot:
+    with _lock:
+        return StatsSnapshot(
+            stages={
+                name: stage_stats.model_copy()
+                for name, stage_stats in _stages.items()
+            },
+            counters=dict(_counters),
+        )
+
+
+def register_callback(callback: STAGE_CALLBACK) -> None:
+    """Call `callback(stage_name, seconds)` whenever a stage ends, while enabled"""
+    _callbacks.append(callback)
+
+
+def unregister_callback(callback: STAGE_CALLBACK) -> None:
+    _callbacks.remove(callback)
+
+
+@contextmanager
+def _timed_stage(name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - started
+        with _lock:
+            stage_stats = _stages.setdefault(name, StageStats())
+            stage_stats.calls += 1
+            stage_stats.seconds += seconds
+        for callback in _callbacks:
+            callback(name, seconds)
+
+
+def stage(name: str) -> ContextManager[None]:
+    """Time the `with` block as the stage `name`"""
+    if not _enabled:
+        return _DISABLED_STAGE
+    return _timed_stage(name)
+
+
+def count(name: str, amount: int = 1) -> None:
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def cache_lookup(name: str, hit: bool) -> None:
+    """Count a hit or a miss of the cache `name`"""
+    if not _enabled:
+        return
+    count(f"{name}.hits" if hit else f"{name}.misses")
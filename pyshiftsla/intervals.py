@@ -0,0 +1,143 @@
+from typing import Sequence, Tuple
+import numpy as np
+import numpy.typing as npt
+
+INTERVAL_BOUNDS = npt.NDArray[np.int64]
+
+
+def merge_intervals(
+    starts: INTERVAL_BOUNDS, ends: INTERVAL_BOUNDS
+) -> Tuple[INTERVAL_BOUNDS, INTERVAL_BOUNDS]:
+    """
+    Sort intervals by their starts, then merge the overlapped (or connected) ones,
+    so that the returned intervals are sorted and disjoint.
+    """
+    if starts.size == 0:
+        return starts.astype(np.int64), ends.astype(np.int64)
+    order = np.argsort(starts, kind="stable")
+    starts, ends = starts[order], ends[order]
+    running_ends = np.maximum.accumulate(ends)
+    new_group = np.empty(starts.size, dtype=np.bool_)
+    new_group[0] = True
+    new_group[1:] = starts[1:] > running_ends[:-1]
+    group_firsts = np.flatnonzero(new_group)
+    group_lasts = np.append(group_firsts[1:] - 1, starts.size - 1)
+    return starts[group_firsts], running_ends[group_lasts]
+
+
+def cumulative_durations(
+    starts: INTERVAL_BOUNDS, ends: INTERVAL_BOUNDS
+) -> INTERVAL_BOUNDS:
+    """Durations of the intervals before each interval, plus the total at the end"""
+    return np.concatenate(([0], np.cumsum(ends - starts))).astype(np.int64)
+
+
+def work_before(
+    starts: INTERVAL_BOUNDS,
+    ends: INTERVAL_BOUNDS,
+    cumulative: INTERVAL_BOUNDS,
+    points: INTERVAL_BOUNDS,
+) -> INTERVAL_BOUNDS:
+    """
+    Durations of the sorted, disjoint intervals before each of the `points`.
+    :param cumulative: `cumulative_durations` of the intervals
+    """
+    if starts.size == 0:
+        return np.zeros(np.shape(points), dtype=np.int64)
+    interval_idx = np.searchsorted(starts, points, "right") - 1
+    clipped_idx = np.maximum(interval_idx, 0)
+    in_interval = np.minimum(points, ends[clipped_idx]) - starts[clipped_idx]
+    return np.where(interval_idx >= 0, cumulative[clipped_idx] + in_interval, 0)
+
+
+def overlap_groups(
+    starts: INTERVAL_BOUNDS, ends: INTERVAL_BOUNDS
+) -> INTERVAL_BOUNDS:
+    """
+    Ids (from 0, increasing) of the groups of overlapped intervals, sorted by their `starts`:
+    an interval joins the current group if it starts before the group ends.
+    Connected intervals do not overlap, they are in different groups.
+    """
+    running_ends = np.maximum.accumulate(ends) if ends.size else ends
+    new_group = np.ones(starts.size, dtype=np.int64)
+    new_group[1:] = starts[1:] >= running_ends[:-1]
+    return np.cumsum(new_group) - 1
+
+
+def coverage_counts(
+    starts: INTERVAL_BOUNDS,
+    ends: INTERVAL_BOUNDS,
+    weights: INTERVAL_BOUNDS | None = None,
+) -> Tuple[INTERVAL_BOUNDS, INTERVAL_BOUNDS]:
+    """
+    Sweep line over intervals: the sorted, unique events (starts and ends),
+    and the weights (1 by default) of the intervals covering each event until the next one.
+
+    :param weights: of every interval
+    """
+    if weights is None:
+        weights = np.ones(starts.size, dtype=np.int64)
+    positions = np.concatenate((starts, ends)).astype(np.int64)
+    if positions.size == 0:
+        return positions, positions.copy()
+    events, event_idx = np.unique(positions, return_inverse=True)
+    counts = (
+        np.cumsum(
+            np.bincount(
+                event_idx,
+                weights=np.concatenate((weights, -weights)),
+                minlength=events.size,
+            )
+        )
+        .round()
+        .astype(np.int64)
+    )
+    return events, counts
+
+
+def interval_coverage(
+    starts_groups: Sequence[INTERVAL_BOUNDS],
+    ends_groups: Sequence[INTERVAL_BOUNDS],
+    min_count: int = 1,
+    weights: Sequence[int] | None = None,
+) -> Tuple[INTERVAL_BOUNDS, INTERVAL_BOUNDS]:
+    """
+    Sweep line over groups of intervals (e.g. the `Shift`s of every agent):
+    the sorted, disjoint intervals covered by the groups' weights summing to at least `min_count`.
+    Every group is merged first, so its overlapped intervals are only counted once.
+
+    - union: `min_count=1`
+    - intersection: `min_count=len(groups)`
+    - difference of the first group and the others: `weights=[1, -1, ...]`, `min_count=1`
+
+    :param weights: of every group, 1 by default
+    """
+    if weights is None:
+        weights = [1] * len(starts_groups)
+    assert (
+        len(starts_groups) == len(ends_groups) == len(weights)
+    ), "Every group must have its starts, ends and weight"
+    merged_groups = [
+        merge_intervals(
+            np.asarray(starts, dtype=np.int64), np.asarray(ends, dtype=np.int64)
+        )
+        for starts, ends in zip(starts_groups, ends_groups)
+    ]
+    events, counts = coverage_counts(
+        np.concatenate(
+            [np.empty(0, dtype=np.int64)]
+            + [starts for starts, _ in merged_groups]
+        ),
+        np.concatenate(
+            [np.empty(0, dtype=np.int64)] + [ends for _, ends in merged_groups]
+        ),
+        np.concatenate(
+            [np.empty(0, dtype=np.int64)]
+            + [
+                np.full(starts.size, weight, dtype=np.int64)
+                for (starts, _), weight in zip(merged_groups, weights)
+            ]
+        ),
+    )
+    covered = counts[:-1] >= min_count
+    return merge_intervals(events[:-1][covered], events[1:][covered])
@@ -0,0 +1,268 @@
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Dict, Iterable, Literal, Set, Tuple
+import numpy as np
+import numpy.typing as npt
+
+from pyshiftsla import instrumentation
+from pyshiftsla.daily_shifts import DailyShift
+from pyshiftsla.datetime_utilities import Milliseconds, check_start_end_event
+from pyshiftsla.intervals import INTERVAL_BOUNDS, work_before
+from pyshiftsla.shiftrange import DATES_INDEX, TIMELINE, ShiftRange
+
+if TYPE_CHECKING:
+    from pyshiftsla.shifts_builder import ShiftsBuilder
+
+
+class LazyShiftRange(ShiftRange):
+    """
+    Read-only `ShiftRange` view over a `ShiftsBuilder`, resolving the `DailyShift` of a date only when it is queried,
+    with the priorities `special_shifts` > `days_off` > `daily_shifts` + `workdays_weekly`.
+    Range totals and work amounts are calculated by the `ShiftsBuilder` for the queried window, without materializing its days.
+    Use `ShiftsBuilder.build_lazy_shifts` to create one.
+
+    With `memoize`, the resolved `DailyShift`s are kept in `root`,
+    and the totals of the visited windows are kept too.
+    """
+
+    _builder: "ShiftsBuilder | None" = None
+    _from_date: date | None = None
+    _to_date: date | None = None
+    _memoize: bool = True
+    _resolved_days_off: Set[date] | None = None
+    _window_totals: Dict[Tuple[date, date], Milliseconds] | None = None
+    _materialized: ShiftRange | None = None
+    _builder_version: int = 0
+
+    @classmethod
+    def from_builder(
+        cls,
+        builder: "ShiftsBuilder",
+        from_date: date | None = None,
+        to_date: date | None = None,
+        memoize: bool = True,
+    ) -> "LazyShiftRange":
+        lazy_shiftrange = cls.model_construct({})
+        lazy_shiftrange._builder = builder
+        lazy_shiftrange._from_date = from_date
+        lazy_shiftrange._to_date = to_date
+        lazy_shiftrange._memoize = memoize
+        lazy_shiftrange._resolved_days_off = set()
+        lazy_shiftrange._window_totals = {}
+        lazy_shiftrange._builder_version = builder._config_version
+        return lazy_shiftrange
+
+    def _check_builder_version(self) -> None:
+        """Forget the memoized days, after the `ShiftsBuilder` is changed"""
+        if self._builder_version != self._builder._config_version:
+            self.root.clear()
+            self._resolved_days_off.clear()
+            self._window_totals.clear()
+            self._materialized = None
+            self._builder_version = self._builder._config_version
+
+    def _in_range(self, key: date) -> bool:
+        return (self._from_date is None or key >= self._from_date) and (
+            self._to_date is None or key <= self._to_date
+        )
+
+    def _clip_window(self, from_date: date, to_date: date) -> Tuple[date, date]:
+        return (
+            from_date
+            if self._from_date is None
+            else max(from_date, self._from_date),
+            to_date if self._to_date is None else min(to_date, self._to_date),
+        )
+
+    def get(self, key: date) -> DailyShift | None:
+        if not isinstance(key, date):
+            raise NotImplementedError(
+                f"Only accept key as `date` not {type(key)}"
+            )
+        if isinstance(key, datetime):
+            key = key.date()
+        self._check_builder_version()
+        if not self._in_range(key) or key in self._resolved_days_off:
+            return None
+        if key in self.root:
+            return self.root[key]
+        daily_shifts = self._builder.daily_shifts_at(key)
+        if self._memoize:
+            if daily_shifts is None:
+                self._resolved_days_off.add(key)
+            else:
+                self.root[key] = daily_shifts
+        return daily_shifts
+
+    def __getitem__(self, key: date) -> DailyShift:
+        daily_shifts = self.get(key)
+        if daily_shifts is None:
+            raise KeyError(key)
+        return daily_shifts
+
+    def __setitem__(self, key: date, value: DailyShift | None):
+        raise NotImplementedError(
+            "`LazyShiftRange` is read-only, change its `ShiftsBuilder` instead"
+        )
+
+    def update(self, to_update: ShiftRange) -> None:
+        raise NotImplementedError(
+            "`LazyShiftRange` is read-only, change its `ShiftsBuilder` instead"
+        )
+
+    @property
+    def _start_date(self) -> date:
+        if self._from_date is None:
+            raise ValueError("Unbounded `LazyShiftRange` has no start date")
+        return self._from_date
+
+    @property
+    def _end_date(self) -> date:
+        if self._to_date is None:
+            raise ValueError("Unbounded `LazyShiftRange` has no end date")
+        return self._to_date
+
+    def slice(self, from_date: date, to_date: date) -> "LazyShiftRange":
+        return LazyShiftRange.from_builder(
+            self._builder,
+            *self._clip_window(from_date, to_date),
+            memoize=self._memoize,
+        )
+
+    def materialize(self) -> ShiftRange:
+        """Build a regular `ShiftRange` with every day of this bounded range"""
+        return self._builder._build_shiftrange(self._start_date, self._end_date)
+
+    def _bounded_shiftrange(self) -> ShiftRange:
+        """
+        `materialize`, kept with `memoize`: the `ShiftRange` methods reading every day
+        (intervals, timeline, dates index) use it, an unbounded range raises `ValueError`
+        """
+        self._check_builder_version()
+        if self._materialized is not None:
+            return self._materialized
+        shiftrange = self.materialize()
+        if self._memoize:
+            self._materialized = shiftrange
+        return shiftrange
+
+    def _get_dates(self) -> npt.NDArray[np.datetime64]:
+        return self._bounded_shiftrange()._get_dates()
+
+    def _get_index(self) -> DATES_INDEX:
+        return self._bounded_shiftrange()._get_index()
+
+    def intervals(self) -> Tuple[INTERVAL_BOUNDS, INTERVAL_BOUNDS]:
+        return self._bounded_shiftrange().intervals()
+
+    @property
+    def timeline(self) -> TIMELINE:
+        return self._bounded_shiftrange().timeline
+
+    def window_intervals(
+        self, from_date: date, to_date: date
+    ) -> Tuple[INTERVAL_BOUNDS, INTERVAL_BOUNDS]:
+        from_date, to_date = self._clip_window(from_date, to_date)
+        if from_date > to_date:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return self._builder._build_shiftrange(from_date, to_date).intervals()
+
+    def shifts_milliseconds(
+        self,
+        from_date: date,
+        to_date: date,
+        exclude: Iterable[date] = (),
+    ) -> Milliseconds:
+        from_date, to_date = self._clip_window(from_date, to_date)
+        if from_date > to_date:
+            return 0
+        self._check_builder_version()
+        window_total = self._window_totals.get((from_date, to_date))
+        instrumentation.cache_lookup(
+            "lazy_window_totals", window_total is not None
+        )
+        if window_total is None:
+            window_total = self._date_milliseconds(from_date, to_date)
+            if self._memoize:
+                self._window_totals[(from_date, to_date)] = window_total
+        excluded_milliseconds = sum(
+            self._date_milliseconds(excluded_date, excluded_date)
+            for excluded_date in set(exclude)
+            if from_date <= excluded_date <= to_date
+        )
+        return window_total - excluded_milliseconds
+
+    def _date_milliseconds(
+        self, from_date: date, to_date: date
+    ) -> Milliseconds:
+        """`ShiftsBuilder.shifts_milliseconds`, but the day before the range is not in it, nor its night shifts"""
+        window_total = self._builder.shifts_milliseconds(from_date, to_date)
+        if from_date != self._from_date:
+            return window_total
+        first_daily_shifts = self.get(from_date)
+        return window_total + (
+            0
+            if first_daily_shifts is None
+            else first_daily_shifts.total_milliseconds
+            - self._builder.shifts_milliseconds(from_date, from_date)
+        )
+
+    @property
+    def total_milliseconds(self) -> Milliseconds:
+        return self.shifts_milliseconds(self._start_date, self._end_date)
+
+    def work_amount_in_shiftrange(
+        self,
+        start_work: datetime,
+        end_work: datetime,
+        default_if_no_shifts_are_between: Literal["diff"] | int = "diff",
+    ) -> Milliseconds:
+        check_start_end_event(start_work, end_work)
+        with instrumentation.stage("shiftrange.work_amount"):
+            start_millis, end_millis = (
+                np.array([start_work, end_work], dtype="datetime64[ms]")
+                .view(np.int64)
+                .tolist()
+            )
+            from_date, to_date = self._clip_window(
+                start_work.date() - timedelta(days=1), end_work.date()
+            )
+            work_amount = 0
+            if from_date <= to_date:
+                calendar = self._builder._compile_wall_clock(from_date, to_date)
+                work_amount = int(
+                    work_before(
+                        calendar.starts,
+                        calendar.ends,
+                        calendar.cumulative,
+                        end_millis,
+                    )
+                    - work_before(
+                        calendar.starts,
+                        calendar.ends,
+                        calendar.cumulative,
+                        start_millis,
+                    )
+                )
+        if work_amount == 0:
+            return (
+                end_millis - start_millis
+                if default_if_no_shifts_are_between == "diff"
+                else default_if_no_shifts_are_between
+            )
+        return work_amount
+
+    def shiftrange_from_duration(
+        self, start_work: datetime, milliseconds_duration: Milliseconds
+    ) -> ShiftRange:
+        due = self._builder.calculate_due(start_work, milliseconds_duration)
+        if not self._in_range(start_work.date()) or not self._in_range(
+            due.date()
+        ):
+            raise ValueError(
+                f"{milliseconds_duration} is longer than the remaining shifts in shift range, after {start_work}"
+            )
+        return self._builder._build_shiftrange(
+            *self._clip_window(
+                start_work.date() - timedelta(days=1), due.date()
+            )
+        ).shiftrange_from_duration(start_work, milliseconds_duration)
@@ -0,0 +1,201 @@
+from datetime import date
+from functools import lru_cache
+from typing import Tuple
+import numpy as np
+import numpy.typing as npt
+
+LUNAR_DATE = Tuple[int, int, int, bool]  # year, month, day, is leap month
+LEAP_MONTH_IDX = 12  # column of the leap month in `LunarTable`
+LUNAR_YEARS = (
+    1900,
+    2099,
+)  # first and last lunar years supported by `lunardate`
+
+
+@lru_cache(maxsize=None)
+def _lunardate() -> type:
+    """`lunardate.LunarDate`, only imported by the first lunar conversion"""
+    from lunardate import LunarDate
+
+    return LunarDate
+
+
+# the camelCase API is deprecated in the newer `lunardate`, the snake_case one missing in the older
+def _to_solar_date(lunar_date) -> date:
+    if hasattr(lunar_date, "to_solar_date"):
+        return lunar_date.to_solar_date()
+    return lunar_date.toSolarDate()
+
+
+def _from_solar_date(year: int, month: int, day: int):
+    lunar_date_type = _lunardate()
+    if hasattr(lunar_date_type, "from_solar_date"):
+        return lunar_date_type.from_solar_date(year, month, day)
+    return lunar_date_type.fromSolarDate(year, month, day)
+
+
+def _is_leap_month(lunar_date) -> bool:
+    if hasattr(lunar_date, "is_leap_month"):
+        return bool(lunar_date.is_leap_month)
+    return bool(lunar_date.isLeapMonth)
+
+
+def _leap_month_for_year(year: int) -> int | None:
+    lunar_date_type = _lunardate()
+    if hasattr(lunar_date_type, "leap_month_for_year"):
+        return lunar_date_type.leap_month_for_year(year)
+    return lunar_date_type.leapMonthForYear(year)
+
+
+@lru_cache(maxsize=None)
+def lunar_to_solar(
+    year: int, month: int, day: int, is_leap_month: bool = False
+) -> date:
+    """Memoized `LunarDate(...).toSolarDate()`, shared by the whole process"""
+    return _to_solar_date(_lunardate()(year, month, day, is_leap_month))
+
+
+@lru_cache(maxsize=None)
+def solar_to_lunar(solar_date: date) -> LUNAR_DATE:
+    """Memoized `LunarDate.fromSolarDate(...)`, shared by the whole process"""
+    lunar_date = _from_solar_date(
+        solar_date.year, solar_date.month, solar_date.day
+    )
+    return (
+        lunar_date.year,
+        lunar_date.month,
+        lunar_date.day,
+        _is_leap_month(lunar_date),
+    )
+
+
+def _lunar_month_days(year: int, month: int, is_leap_month: bool) -> int:
+    try:
+        lunar_to_solar(year, month, 30, is_leap_month)
+        return 30
+    except ValueError:
+        return 29
+
+
+class LunarTable:
+    """
+    Precomputed lunar calendar from `from_year` to `to_year` (included):
+    the solar start and the number of days of every lunar month.
+    Converting lunar dates is then an array lookup and an addition.
+
+    :param from_year: first lunar year of the table
+    :param to_year: last lunar year of the table (included)
+    """
+
+    __slots__ = (
+        "from_year",
+        "to_year",
+        "month_starts",
+        "month_days",
+        "leap_months",
+    )
+
+    def __init__(self, from_year: int, to_year: int):
+        assert (
+            from_year <= to_year
+        ), f"`from_year` must not be after `to_year`: {from_year} > {to_year}"
+        self.from_year = from_year
+        self.to_year = to_year
+        years = to_year - from_year + 1
+        # days since epoch, months 1 to 12 at `month - 1`, the leap month at `LEAP_MONTH_IDX`
+        self.month_starts = np.full((years, 13), -1, dtype=np.int64)
+        self.month_days = np.zeros((years, 13), dtype=np.int64)
+        self.leap_months = np.zeros(years, dtype=np.int64)
+        for year_idx, year in enumerate(range(from_year, to_year + 1)):
+            leap_month = _leap_month_for_year(year) or 0
+            self.leap_months[year_idx] = leap_month
+            month_start = (
+                np.datetime64(lunar_to_solar(year, 1, 1), "D")
+                .astype(np.int64)
+                .item()
+            )
+            for month in range(1, 13):
+                for is_leap_month in (False, True):
+                    if is_leap_month and month != leap_month:
+                        continue
+                    month_idx = LEAP_MONTH_IDX if is_leap_month else month - 1
+                    month_days = _lunar_month_days(year, month, is_leap_month)
+                    self.month_starts[year_idx, month_idx] = month_start
+                    self.month_days[year_idx, month_idx] = month_days
+                    month_start += month_days
+        for array in (self.month_starts, self.month_days, self.leap_months):
+            array.flags.writeable = False
+
+    def covers(self, years: npt.ArrayLike) -> bool:
+        years = np.asarray(years)
+        return bool(
+            years.size == 0
+            or (years.min() >= self.from_year and years.max() <= self.to_year)
+        )
+
+    def to_solar(
+        self,
+        years: npt.ArrayLike,
+        months: npt.ArrayLike,
+        days: npt.ArrayLike,
+        is_leap_month: npt.ArrayLike = False,
+    ) -> npt.NDArray[np.datetime64]:
+        """
+        Solar `datetime64[D]` of every lunar date, raise `ValueError` like `LunarDate` on invalid dates
+        """
+        years, months, days, is_leap_month = np.broadcast_arrays(
+            np.asarray(years, dtype=np.int64),
+            np.asarray(months, dtype=np.int64),
+            np.asarray(days, dtype=np.int64),
+            np.asarray(is_leap_month, dtype=np.bool_),
+        )
+        if not self.covers(years):
+            raise ValueError(
+                f"year out of the lunar table [{self.from_year}, {self.to_year}]"
+            )
+        if ((months < 1) | (months > 12)).any():
+            raise ValueError("month out of range")
+        year_idx = years - self.from_year
+        if (is_leap_month & (self.leap_months[year_idx] != months)).any():
+            raise ValueError("month out of range")
+        month_idx = np.where(is_leap_month, LEAP_MONTH_IDX, months - 1)
+        if ((days < 1) | (days > self.month_days[year_idx, month_idx])).any():
+            raise ValueError("day out of range")
+        return (self.month_starts[year_idx, month_idx] + days - 1).astype(
+            "datetime64[D]"
+        )
+
+
+_lunar_table: LunarTable | None = None
+
+
+def lunar_table(from_year: int, to_year: int) -> LunarTable:
+    """
+    The process-wide `LunarTable`, rebuilt to cover from `from_year` to `to_year` when it does not yet.
+    Call it at startup to precompute the span of years to be used.
+    """
+    global _lunar_table
+    if _lunar_table is None or not _lunar_table.covers([from_year, to_year]):
+        if _lunar_table is not None:
+            from_year = min(from_year, _lunar_table.from_year)
+            to_year = max(to_year, _lunar_table.to_year)
+        _lunar_table = LunarTable(from_year, to_year)
+    return _lunar_table
+
+
+def lunar_to_solar_array(
+    years: npt.ArrayLike,
+    months: npt.ArrayLike,
+    days: npt.ArrayLike,
+    is_leap_month: npt.ArrayLike = False,
+) -> npt.NDArray[np.datetime64]:
+    """
+    Convert arrays of lunar dates at once, into a `datetime64[D]` array,
+    with the process-wide `LunarTable` covering their years.
+    """
+    years = np.asarray(years, dtype=np.int64)
+    if years.size == 0:
+        return np.array([], dtype="datetime64[D]")
+    return lunar_table(int(years.min()), int(years.max())).to_solar(
+        years, months, days, is_leap_month
+    )
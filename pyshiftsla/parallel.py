@@ -0,0 +1,294 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Literal, Tuple
+import logging
+import os
+import numpy as np
+import numpy.typing as npt
+
+from pyshiftsla.compiled_calendar import (
+    EPOCH_MILLISECONDS,
+    CompiledCalendar,
+    as_epoch_milliseconds,
+)
+from pyshiftsla.datetime_utilities import to_datetime64_ms
+from pyshiftsla.shifts_builder import ShiftsBuilder
+
+SHARED_CALENDAR_HANDLE = Tuple[
+    str, int, date, date
+]  # shared memory name, number of intervals, from date, to date
+
+logger = logging.getLogger(__name__)
+
+
+def _calendar_arrays(
+    buffer: memoryview, intervals: int
+) -> Tuple[EPOCH_MILLISECONDS, EPOCH_MILLISECONDS, EPOCH_MILLISECONDS]:
+    """
+    starts, ends and cumulative arrays, laid out one after another in `buffer`.
+    They hold an export of the buffer, so it can't be closed while they are used.
+    """
+    arrays = np.frombuffer(buffer, dtype=np.int64, count=3 * intervals + 1)
+    return (
+        arrays[:intervals],
+        arrays[intervals : 2 * intervals],
+        arrays[2 * intervals :],
+    )
+
+
+class SharedCalendar:
+    """
+    `CompiledCalendar` copied once into `multiprocessing.shared_memory`,
+    so worker processes attach to it by its `handle`, instead of receiving a pickled copy.
+    The creating process owns the shared memory: use it as a context manager, or `close` it.
+
+    :param calendar: `CompiledCalendar` to share
+    """
+
+    def __init__(self, calendar: CompiledCalendar):
+        intervals = len(calendar)
+        self._shared_memory = SharedMemory(
+            create=True, size=(3 * intervals + 1) * np.dtype(np.int64).itemsize
+        )
+        for shared, compiled in zip(
+            _calendar_arrays(self._shared_memory.buf, intervals),
+            (calendar.starts, calendar.ends, calendar.cumulative),
+        ):
+            shared[:] = compiled
+        self.handle: SHARED_CALENDAR_HANDLE = (
+            self._shared_memory.name,
+            intervals,
+            calendar.from_date,
+            calendar.to_date,
+        )
+
+    def __enter__(self) -> "SharedCalendar":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        try:
+            self._shared_memory.close()
+        finally:
+            self._shared_memory.unlink()
+
+
+# shared memories attached by the current (worker) process, by their name
+_attached_memories: Dict[str, SharedMemory] = {}
+# detached shared memories whose calendars were still used, closed by a later detach
+_unreleased_memories: List[SharedMemory] = []
+
+
+def attach_calendar(handle: SHARED_CALENDAR_HANDLE) -> CompiledCalendar:
+    """
+    `CompiledCalendar` backed by the shared memory of a `SharedCalendar`, without copying it.
+    The shared memory is attached once per process, the ones attached before are detached.
+    Release it with `detach_calendar`, once its calendars are no longer used.
+    """
+    name, intervals, from_date, to_date = handle
+    if name not in _attached_memories:
+        _detach_calendars()
+        _attached_memories[name] = SharedMemory(name=name)
+    return CompiledCalendar.from_compiled(
+        from_date,
+        to_date,
+        *_calendar_arrays(_attached_memories[name].buf, intervals),
+    )
+
+
+def _release_memories() -> List[str]:
+    """Close the detached shared memories, return the names of the ones still used"""
+    still_used = []
+    for shared_memory in list(_unreleased_memories):
+        try:
+            shared_memory.close()
+        except BufferError:  # arrays of its calendars are still referenced
+            still_used.append(shared_memory.name)
+        else:
+            _unreleased_memories.remove(shared_memory)
+    return still_used
+
+
+def detach_calendar(handle: SHARED_CALENDAR_HANDLE) -> None:
+    """
+    Release the shared memory attached by `attach_calendar`.
+    Raise `BufferError` if its calendars are still referenced:
+    it is then released by a later detach, once they are deleted.
+    """
+    name = handle[0]
+    if name in _attached_memories:
+        _unreleased_memories.append(_attached_memories.pop(name))
+    if name in _release_memories():
+        raise BufferError(
+            f"Calendar {name} is still used, it is released by a later detach once deleted"
+        )
+
+
+def _detach_calendars() -> None:
+    """Release the calendars of the previous batches, already unlinked by their owner"""
+    _unreleased_memories.extend(_attached_memories.values())
+    _attached_memories.clear()
+    still_used = _release_memories()
+    if still_used:
+        logger.warning(
+            "Calendars still used, released by a later detach: %s",
+            ", ".join(still_used),
+        )
+
+
+def _compile_sla_batch(
+    builder: ShiftsBuilder, start_deals: npt.ArrayLike, end_deals: npt.ArrayLike
+) -> Tuple[EPOCH_MILLISECONDS, EPOCH_MILLISECONDS, CompiledCalendar | None]:
+    """
+    Epoch milliseconds of `start_deals` and `end_deals`, and the `CompiledCalendar` covering them,
+    `None` for an empty batch
+    """
+    start_millis = as_epoch_milliseconds(to_datetime64_ms(start_deals))
+    end_millis = as_epoch_milliseconds(to_datetime64_ms(end_deals))
+    if start_millis.shape != end_millis.shape:
+        raise ValueError(
+            f"Mismatched number of starts and ends: {start_millis.shape} and {end_millis.shape}"
+        )
+    if start_millis.size == 0:
+        return start_millis, end_millis, None
+    deals_dates = builder.local_dates(
+        np.concatenate([start_millis, end_millis]).view("datetime64[ms]")
+    )
+    calendar = builder.compile(
+        deals_dates.min().item(), deals_dates.max().item()
+    )
+    return start_millis, end_millis, calendar
+
+
+def _sla_chunk(
+    handle: SHARED_CALENDAR_HANDLE,
+    start_millis: EPOCH_MILLISECONDS,
+    end_millis: EPOCH_MILLISECONDS,
+    default_if_no_shifts_are_between: Literal["diff"] | int,
+) -> EPOCH_MILLISECONDS:
+    return attach_calendar(handle).work_amount_between(
+        start_millis, end_millis, default_if_no_shifts_are_between
+    )
+
+
+class ParallelSLAEngine:
+    """
+    Calculate sla of large batches across a `ProcessPoolExecutor`.
+    Each batch is compiled once into a `SharedCalendar`, then split into chunks;
+    workers only receive the calendar's handle and epoch milliseconds,
+    never a pickled `ShiftsBuilder` nor `ShiftRange`. Results are gathered in input order.
+    Reuse the engine (as a context manager) across batches to keep the pool warm.
+
+    :param builder: `ShiftsBuilder` generating the `Shift`s
+    :param max_workers: number of worker processes, default is the number of CPUs
+    :param chunks_per_worker: chunks of a batch per worker, more chunks balance the load better
+    """
+
+    def __init__(
+        self,
+        builder: ShiftsBuilder,
+        max_workers: int | None = None,
+        chunks_per_worker: int = 4,
+    ):
+        self.builder = builder
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunks_per_worker = chunks_per_worker
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def __enter__(self) -> "ParallelSLAEngine":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown()
+
+    def calculate_sla_batch(
+        self,
+        start_deals: npt.ArrayLike,
+        end_deals: npt.ArrayLike,
+        default_if_no_shifts_are_between: Literal["diff"] | int = "diff",
+    ) -> EPOCH_MILLISECONDS:
+        """
+        Same as `ShiftsBuilder.calculate_sla_batch`, calculated by the worker processes
+        """
+        start_millis, end_millis, calendar = _compile_sla_batch(
+            self.builder, start_deals, end_deals
+        )
+        if calendar is None:
+            return np.zeros(start_millis.shape, dtype=np.int64)
+        chunks = min(
+            start_millis.size, self.max_workers * self.chunks_per_worker
+        )
+        with SharedCalendar(calendar) as shared_calendar:
+            return np.concatenate(
+                list(
+                    self._executor.map(
+                        _sla_chunk,
+                        [shared_calendar.handle] * chunks,
+                        np.array_split(start_millis, chunks),
+                        np.array_split(end_millis, chunks),
+                        [default_if_no_shifts_are_between] * chunks,
+                    )
+                )
+            )
+
+
+def calculate_sla_parallel(
+    builder: ShiftsBuilder,
+    start_deals: npt.ArrayLike,
+    end_deals: npt.ArrayLike,
+    default_if_no_shifts_are_between: Literal["diff"] | int = "diff",
+    max_workers: int | None = None,
+) -> EPOCH_MILLISECONDS:
+    """
+    One-off `ParallelSLAEngine.calculate_sla_batch`, the worker processes are shut down afterward
+    """
+    with ParallelSLAEngine(builder, max_workers) as engine:
+        return engine.calculate_sla_batch(
+            start_deals, end_deals, default_if_no_shifts_are_between
+        )
+
+
+def calculate_sla_threaded(
+    builder: ShiftsBuilder,
+    start_deals: npt.ArrayLike,
+    end_deals: npt.ArrayLike,
+    default_if_no_shifts_are_between: Literal["diff"] | int = "diff",
+    max_workers: int | None = None,
+    executor: ThreadPoolExecutor | None = None,
+) -> EPOCH_MILLISECONDS:
+    """
+    Same as `ShiftsBuilder.calculate_sla_batch`, with the chunks calculated by threads.
+    Every thread reads the same immutable `CompiledCalendar`, without locks,
+    and its binary searches run in NumPy, which releases the GIL.
+
+    :param executor: reuse a `ThreadPoolExecutor`, instead of starting one for this batch
+    """
+    start_millis, end_millis, calendar = _compile_sla_batch(
+        builder, start_deals, end_deals
+    )
+    if calendar is None:
+        return np.zeros(start_millis.shape, dtype=np.int64)
+    max_workers = max_workers or os.cpu_count() or 1
+    chunks = min(start_millis.size, max_workers)
+    thread_executor = executor or ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        return np.concatenate(
+            list(
+                thread_executor.map(
+                    lambda start_chunk, end_chunk: calendar.work_amount_between(
+                        start_chunk, end_chunk, default_if_no_shifts_are_between
+                    ),
+                    np.array_split(start_millis, chunks),
+                    np.array_split(end_millis, chunks),
+                )
+            )
+        )
+    finally:
+        if executor is None:
+            thread_executor.shutdown()
@@ -0,0 +1,204 @@
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+import numpy.typing as npt
+
+from pyshiftsla.daily_shifts import DailyShift
+from pyshiftsla.daterange import CALENDAR_TYPE, DateRange
+from pyshiftsla.datetime_utilities import MILLISECONDS_IN_A_DAY
+from pyshiftsla.shift import Shift
+
+STRINGS = Sequence[str] | npt.NDArray  # also a polars `Series` of strings
+INVALID_EXAMPLES = 5
+
+
+def _as_str_array(strings: STRINGS) -> npt.NDArray[np.str_]:
+    if hasattr(strings, "to_numpy"):
+        strings = strings.to_numpy()
+    return np.char.strip(np.asarray(strings, dtype=np.str_))
+
+
+def _raise_invalid(
+    strings: npt.NDArray[np.str_], invalid: npt.NDArray[np.bool_], expected: str
+) -> None:
+    if invalid.any():
+        examples = strings[invalid][:INVALID_EXAMPLES].tolist()
+        raise ValueError(
+            f"{int(invalid.sum())} invalid strings, must be in the format {expected}, e.g.: {examples}"
+        )
+
+
+def _digits(strings: npt.NDArray[np.str_], width: int) -> npt.NDArray[np.int64]:
+    """Digits of same-width numeric strings, shape (strings, width)"""
+    return strings.astype(f"U{width}").view(np.uint32).reshape(
+        -1, width
+    ).astype(np.int64) - ord("0")
+
+
+def _numbers(
+    digits: npt.NDArray[np.int64], start: int, stop: int
+) -> npt.NDArray[np.int64]:
+    weights = 10 ** np.arange(stop - start - 1, -1, -1)
+    return digits[:, start:stop] @ weights
+
+
+def shift_bounds_from_strs(shiftstrs: STRINGS) -> npt.NDArray[np.int64]:
+    """
+    Vectorized `check_shift_str` and `convert_shift_str`:
+    milliseconds from the day start of every "HHMMHHMM" string's start and end, shape (strings, 2).
+    The end of a night shift (ending before its start) is in the next day, as in `Shift.bounds`
+    """
+    strings = _as_str_array(shiftstrs).ravel()
+    _raise_invalid(
+        strings,
+        (np.char.str_len(strings) != 8) | ~np.char.isnumeric(strings),
+        "'HHMMHHMM'",
+    )
+    digits = _digits(strings, 8)
+    hours = np.column_stack((_numbers(digits, 0, 2), _numbers(digits, 4, 6)))
+    minutes = np.column_stack((_numbers(digits, 2, 4), _numbers(digits, 6, 8)))
+    bounds = (hours * 60 + minutes) * 60_000
+    _raise_invalid(
+        strings,
+        (hours > 23).any(axis=1)
+        | (minutes > 59).any(axis=1)
+        | (bounds[:, 0] == bounds[:, 1]),
+        "'HHMMHHMM' with valid and different start and end times",
+    )
+    bounds[:, 1] += np.where(
+        bounds[:, 1] < bounds[:, 0], MILLISECONDS_IN_A_DAY, 0
+    )
+    return bounds
+
+
+def _intern_shift(
+    interned_shifts: Dict[Tuple[int, int], Shift], start: int, end: int
+) -> Shift:
+    shift = interned_shifts.get((start, end))
+    if shift is None:
+        shift = interned_shifts[(start, end)] = Shift.from_bounds(start, end)
+    return shift
+
+
+def parse_shift_strs(shiftstrs: STRINGS) -> List[Shift]:
+    """
+    Bulk `Shift.fromstr`: only distinct strings are converted,
+    and identical `Shift`s of a parse are interned (the same object), so treat them as read-only.
+
+    :param shiftstrs: list, numpy array or polars `Series` of "HHMMHHMM" strings
+    """
+    strings = _as_str_array(shiftstrs).ravel()
+    distinct, inverse = np.unique(strings, return_inverse=True)
+    interned_shifts: Dict[Tuple[int, int], Shift] = {}
+    distinct_shifts = [
+        _intern_shift(interned_shifts, start, end)
+        for start, end in shift_bounds_from_strs(distinct).tolist()
+    ]
+    return [distinct_shifts[idx] for idx in inverse.tolist()]
+
+
+def parse_daily_shift_strs(
+    daily_shift_strs: STRINGS, separator: str = ","
+) -> List[DailyShift]:
+    """
+    Bulk parse of `DailyShift`s, each written as "HHMMHHMM" strings joined by `separator`
+    (e.g. "08301145,13301800", empty for no `Shift`s).
+    Identical `DailyShift`s of a parse are interned, so treat them as read-only.
+    """
+    strings = _as_str_array(daily_shift_strs).ravel()
+    distinct, inverse = np.unique(strings, return_inverse=True)
+    split_shiftstrs = [
+        [
+            shiftstr
+            for shiftstr in daily_shift_str.split(separator)
+            if shiftstr.strip()
+        ]
+        for daily_shift_str in distinct.tolist()
+    ]
+    all_bounds = shift_bounds_from_strs(
+        [shiftstr for shiftstrs in split_shiftstrs for shiftstr in shiftstrs]
+        or np.array([], dtype="U8")
+    ).tolist()
+    interned_shifts: Dict[Tuple[int, int], Shift] = {}
+    interned_daily_shifts: Dict[Tuple[Tuple[int, int], ...], DailyShift] = {}
+    distinct_daily_shifts = []
+    offset = 0
+    for daily_shift_str, shiftstrs in zip(distinct.tolist(), split_shiftstrs):
+        bounds = tuple(map(tuple, all_bounds[offset : offset + len(shiftstrs)]))
+        offset += len(shiftstrs)
+        if sum(end - start for start, end in bounds) > MILLISECONDS_IN_A_DAY:
+            raise ValueError(
+                f"A day has 86_400_000 milliseconds, the shifts must sum to less: {daily_shift_str}"
+            )
+        daily_shift = interned_daily_shifts.get(bounds)
+        if daily_shift is None:
+            daily_shift = DailyShift.model_construct(
+                [
+                    _intern_shift(interned_shifts, start, end)
+                    for start, end in bounds
+                ]
+            )
+            interned_daily_shifts[bounds] = daily_shift
+        distinct_daily_shifts.append(daily_shift)
+    return [distinct_daily_shifts[idx] for idx in inverse.tolist()]
+
+
+def _dates_from_digits(
+    digits: npt.NDArray[np.int64],
+) -> Tuple[npt.NDArray[np.datetime64], npt.NDArray[np.bool_]]:
+    """Dates of "YYYYMMDD" digits, along with the mask of invalid dates"""
+    years, months, days = (
+        _numbers(digits, 0, 4),
+        _numbers(digits, 4, 6),
+        _numbers(digits, 6, 8),
+    )
+    invalid = (years < 1) | (months < 1) | (months > 12) | (days < 1)
+    month_starts = ((years - 1970) * 12 + np.clip(months, 1, 12) - 1).astype(
+        "datetime64[M]"
+    )
+    dates = month_starts.astype("datetime64[D]") + (days - 1)
+    invalid |= (
+        dates.astype("datetime64[M]") != month_starts
+    )  # e.g. February 30th
+    return dates, invalid
+
+
+def parse_daterange_strs(
+    daterange_strs: STRINGS, calendar_type: CALENDAR_TYPE = "solar"
+) -> List[DateRange]:
+    """
+    Bulk `DateRange.fromstr` of "YYYYMMDD-YYYYMMDD" or "YYYYMMDD" strings:
+    only distinct strings are converted, with vectorized validations.
+    Identical `DateRange`s are the same object, so treat them as read-only.
+    """
+    strings = _as_str_array(daterange_strs).ravel()
+    distinct, inverse = np.unique(strings, return_inverse=True)
+    lengths = np.char.str_len(distinct)
+    parts = np.char.partition(distinct, "-")
+    starts, separators, ends = parts[:, 0], parts[:, 1], parts[:, 2]
+    has_end = np.char.str_len(ends) > 0
+    _raise_invalid(
+        distinct,
+        ~np.isin(lengths, (8, 9, 17))
+        | (np.char.str_len(starts) != 8)
+        | ~np.char.isnumeric(starts)
+        | (has_end & ((np.char.str_len(ends) != 8) | ~np.char.isnumeric(ends)))
+        | ((lengths == 9) & (separators != "-")),
+        "'YYYYMMDD-YYYYMMDD' or 'YYYYMMDD'",
+    )
+    start_dates, invalid_starts = _dates_from_digits(_digits(starts, 8))
+    end_digits = _digits(np.where(has_end, ends, starts), 8)
+    end_dates, invalid_ends = _dates_from_digits(end_digits)
+    _raise_invalid(
+        distinct, invalid_starts | invalid_ends, "'YYYYMMDD' of valid dates"
+    )
+    distinct_dateranges = [
+        DateRange.model_construct(
+            start=start,
+            end=end if with_end else None,
+            calendar_type=calendar_type,
+        )
+        for start, end, with_end in zip(
+            start_dates.tolist(), end_dates.tolist(), has_end.tolist()
+        )
+    ]
+    return [distinct_dateranges[idx] for idx in inverse.tolist()]
@@ -0,0 +1,159 @@
+"""
+Streaming SLA pipeline from ticket files to result files, in bounded-memory chunks (`pip install pyshiftsla[polars]`).
+
+Files are scanned and written by the streaming engine of polars, chunk by chunk:
+every chunk is calculated at once (`sla_expr`/`due_expr`) as soon as it is read, then sunk to the output file.
+"""
+
+from pathlib import Path
+from threading import Lock
+from typing import Callable, Dict, List, Literal
+import os
+import time
+import polars as pl
+from pydantic import BaseModel
+
+from pyshiftsla.polars import due_expr, sla_expr
+from pyshiftsla.shifts_builder import ShiftsBuilder
+
+FILE_FORMAT = Literal["csv", "parquet"]
+FILE_FORMATS = ("csv", "parquet")
+
+
+class PipelineProgress(BaseModel):
+    """
+    :param chunks: chunks calculated so far
+    :param rows: rows calculated so far
+    :param last_chunk_rows: rows of the last calculated chunk
+    :param seconds: since the pipeline started
+    """
+
+    chunks: int = 0
+    rows: int = 0
+    last_chunk_rows: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+PROGRESS_CALLBACK = Callable[[PipelineProgress], None]
+
+
+def file_format(path: str | os.PathLike) -> FILE_FORMAT:
+    suffix = Path(path).suffix.lower().lstrip(".")
+    if suffix not in FILE_FORMATS:
+        raise ValueError(
+            f"Unsupported file format '{suffix}' of {path}, expected one of {FILE_FORMATS}"
+        )
+    return suffix
+
+
+def _scan(
+    source: str | os.PathLike, source_format: FILE_FORMAT
+) -> pl.LazyFrame:
+    if source_format == "csv":
+        return pl.scan_csv(source)
+    return pl.scan_parquet(source)
+
+
+def _as_datetime(schema: Dict[str, pl.PolarsDataType], column: str) -> pl.Expr:
+    if schema[column] == pl.Utf8:
+        return pl.col(column).str.to_datetime(time_unit="ms")
+    return pl.col(column)
+
+
+def run_sla_pipeline(
+    builder: ShiftsBuilder,
+    source: str | os.PathLike,
+    destination: str | os.PathLike,
+    start_column: str = "created_at",
+    end_column: str | None = "resolved_at",
+    duration_column: str | None = None,
+    sla_column: str = "sla",
+    due_column: str = "due",
+    chunk_rows: int = 500_000,
+    default_if_no_shifts_are_between: Literal["diff"] | int = "diff",
+    progress: PROGRESS_CALLBACK | None = None,
+) -> PipelineProgress:
+    """
+    Calculate the sla (if `end_column`) and/or the due time (if `duration_column`) of every ticket of `source`,
+    about `chunk_rows` tickets at a time (CSV chunks are cut at line boundaries),
+    writing each chunk to `destination` along with its results.
+    Only a few chunks are held in memory, whatever the size of `source` is.
+
+    :param builder: `ShiftsBuilder` generating the `Shift`s
+    :param source: `.csv` or `.parquet` file of tickets
+    :param destination: `.csv` or `.parquet` file
+    :param start_column: `Datetime` (or ISO 8601 string) column of the start deals
+    :param end_column: `Datetime` (or ISO 8601 string) column of the end deals
+    :param duration_column: integer column of the working `Milliseconds` of each ticket
+    :param progress: called after every calculated chunk
+    :return: final `PipelineProgress`
+    """
+    assert (
+        end_column is not None or duration_column is not None
+    ), "Give an `end_column` to calculate sla, and/or a `duration_column` to calculate due times"
+    source_format, destination_format = (
+        file_format(source),
+        file_format(destination),
+    )
+    scanned = _scan(source, source_format)
+    schema = dict(scanned.schema)
+    results: List[pl.Expr] = []
+    if end_column is not None:
+        results.append(
+            sla_expr(
+                builder,
+                _as_datetime(schema, start_column),
+                _as_datetime(schema, end_column),
+                default_if_no_shifts_are_between,
+            ).alias(sla_column)
+        )
+        schema[sla_column] = pl.Int64
+    if duration_column is not None:
+        results.append(
+            due_expr(
+                builder,
+                _as_datetime(schema, start_column),
+                pl.col(duration_column).cast(pl.Int64),
+            ).alias(due_column)
+        )
+        schema[due_column] = pl.Datetime("ms")
+
+    started = time.perf_counter()
+    stats = PipelineProgress()
+    stats_lock = Lock()
+    errors: List[Exception] = []
+
+    def calculate_chunk(chunk: pl.DataFrame) -> pl.DataFrame:
+        try:
+            chunk = chunk.with_columns(results)
+        except Exception as err:
+            errors.append(err)  # raised again as it is, polars wraps it
+            raise
+        with stats_lock:
+            stats.chunks += 1
+            stats.rows += chunk.height
+            stats.last_chunk_rows = chunk.height
+            stats.seconds = time.perf_counter() - started
+            if progress is not None:
+                progress(stats.model_copy())
+        return chunk
+
+    calculated = scanned.map_batches(
+        calculate_chunk, streamable=True, schema=schema
+    )
+    try:
+        with pl.Config(streaming_chunk_size=chunk_rows):
+            if destination_format == "csv":
+                calculated.sink_csv(destination)
+            else:
+                calculated.sink_parquet(destination)
+    except pl.ComputeError as err:
+        if errors:
+            raise errors[0] from err
+        raise
+    stats.seconds = time.perf_counter() - started
+    return stats
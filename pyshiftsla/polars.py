@@ -0,0 +1,107 @@
+from typing import Callable, Literal, Tuple
+import numpy as np
+import numpy.typing as npt
+import polars as pl
+
+from pyshiftsla.shifts_builder import ShiftsBuilder
+
+COLUMN = str | pl.Expr
+
+
+def _deals_columns(
+    deals: pl.Series, first_field: str, second_field: str
+) -> Tuple[pl.Series, pl.Series, npt.NDArray[np.bool_]]:
+    """Fields of a struct `Series`, along with the mask of rows without nulls"""
+    first = deals.struct.field(first_field)
+    second = deals.struct.field(second_field)
+    not_null = (
+        (first.is_not_null() & second.is_not_null())
+        .cast(pl.UInt8)
+        .to_numpy()
+        .astype(np.bool_)
+    )
+    return first, second, not_null
+
+
+def _sla_batch(
+    builder: ShiftsBuilder,
+    default_if_no_shifts_are_between: Literal["diff"] | int,
+) -> Callable[[pl.Series], pl.Series]:
+    def calculate_sla_batch(deals: pl.Series) -> pl.Series:
+        start_deals, end_deals, not_null = _deals_columns(
+            deals, "start_deal", "end_deal"
+        )
+        sla = np.zeros(len(deals), dtype=np.int64)
+        if not_null.any():
+            sla[not_null] = builder.calculate_sla_batch(
+                start_deals.to_numpy()[not_null],
+                end_deals.to_numpy()[not_null],
+                default_if_no_shifts_are_between,
+            )
+        return pl.Series(sla, dtype=pl.Int64).set(pl.Series(~not_null), None)
+
+    return calculate_sla_batch
+
+
+def _due_batch(builder: ShiftsBuilder) -> Callable[[pl.Series], pl.Series]:
+    def calculate_due_batch(deals: pl.Series) -> pl.Series:
+        start_deals, durations, not_null = _deals_columns(
+            deals, "start_deal", "milliseconds_duration"
+        )
+        dues = np.full(len(deals), np.datetime64("NaT"), "datetime64[ms]")
+        if not_null.any():
+            dues[not_null] = builder.calculate_due_batch(
+                start_deals.to_numpy()[not_null],
+                durations.to_numpy()[not_null],
+            )
+        return pl.Series(dues, dtype=pl.Datetime("ms"))
+
+    return calculate_due_batch
+
+
+def sla_expr(
+    builder: ShiftsBuilder,
+    start_deal: COLUMN,
+    end_deal: COLUMN,
+    default_if_no_shifts_are_between: Literal["diff"] | int = "diff",
+) -> pl.Expr:
+    """
+    Polars expression of the sla `Milliseconds` between 2 `Datetime` columns,
+    usable in `select`/`with_columns` of a `DataFrame` or a (streaming) `LazyFrame`.
+    Every batch of rows is calculated at once with `ShiftsBuilder.calculate_sla_batch`,
+    rows with a null `start_deal` or `end_deal` get a null sla.
+
+    :param builder: `ShiftsBuilder` generating the `Shift`s
+    :param start_deal: name or expression of the start deals column
+    :param end_deal: name or expression of the end deals column
+    :param default_if_no_shifts_are_between: same as in `ShiftsBuilder.calculate_sla_batch`
+    :rtype: `Int64` expression
+    """
+    # fixed field names, the columns may have the same name (e.g. both derived from one column)
+    return pl.struct(start_deal=start_deal, end_deal=end_deal).map_batches(
+        _sla_batch(builder, default_if_no_shifts_are_between),
+        return_dtype=pl.Int64,
+    )
+
+
+def due_expr(
+    builder: ShiftsBuilder,
+    start_deal: COLUMN,
+    milliseconds_duration: COLUMN,
+) -> pl.Expr:
+    """
+    Polars expression of the due time of a `Datetime` column, after working the `Milliseconds` of an integer column.
+    Every batch of rows is calculated at once with `ShiftsBuilder.calculate_due_batch`,
+    rows with a null `start_deal` or `milliseconds_duration` get a null due time.
+
+    :param builder: `ShiftsBuilder` generating the `Shift`s
+    :param start_deal: name or expression of the start deals column
+    :param milliseconds_duration: name or expression of the working `Milliseconds` column
+    :rtype: `Datetime("ms")` expression
+    """
+    return pl.struct(
+        start_deal=start_deal, milliseconds_duration=milliseconds_duration
+    ).map_batches(
+        _due_batch(builder),
+        return_dtype=pl.Datetime("ms"),
+    )
@@ -0,0 +1,364 @@
+"""
+Local asyncio SLA service, standard library only.
+
+Concurrent requests for the same `ShiftsBuilder` are coalesced over a short window
+by a `MicroBatcher`, and evaluated as one vectorized batch in a worker thread.
+
+    POST /sla {"builder": "<name>", "start_deal": "<iso datetime>", "end_deal": "<iso datetime>"}
+        -> {"sla": <milliseconds>}
+    POST /due {"builder": "<name>", "start_deal": "<iso datetime>", "milliseconds_duration": <int>}
+        -> {"due": "<iso datetime>"}
+    GET /health -> {"status": "ok"}
+"""
+
+from concurrent.futures import Executor
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Tuple
+import asyncio
+import json
+import numpy as np
+import numpy.typing as npt
+
+from pyshiftsla.compiled_calendar import CompiledCalendar
+from pyshiftsla.datetime_utilities import to_datetime64_ms
+from pyshiftsla.shifts_builder import ShiftsBuilder
+
+BATCH_CALCULATION = Callable[[List[Any], List[Any]], npt.NDArray]
+HTTP_RESPONSE = Tuple[int, Dict[str, Any]]
+HTTP_STATUSES = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+BAD_REQUEST_ERRORS = (
+    ValueError,
+    KeyError,
+    TypeError,
+    AttributeError,
+    OverflowError,
+)
+
+
+class _Coalescer:
+    """Pairs of arguments submitted within `window_seconds`, calculated as one batch"""
+
+    def __init__(
+        self,
+        batcher: "MicroBatcher",
+        calculate_batch: BATCH_CALCULATION,
+        to_result: Callable[[Any], Any],
+    ):
+        self._batcher = batcher
+        self._calculate_batch = calculate_batch
+        self._to_result = to_result
+        self._firsts: List[Any] = []
+        self._seconds: List[Any] = []
+        self._futures: List[asyncio.Future] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    async def submit(self, first: Any, second: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._firsts.append(first)
+        self._seconds.append(second)
+        self._futures.append(future)
+        if len(self._futures) >= self._batcher.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(
+                self._batcher.window_seconds, self._flush
+            )
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        firsts, seconds, futures = self._firsts, self._seconds, self._futures
+        self._firsts, self._seconds, self._futures = [], [], []
+        if futures:
+            asyncio.get_running_loop().create_task(
+                self._fan_out(firsts, seconds, futures)
+            )
+
+    def _calculate_rows(
+        self, firsts: List[Any], seconds: List[Any]
+    ) -> List[Any]:
+        """Calculate the batch, or each row alone if the batch fails, so a bad row only fails its own request"""
+        try:
+            return list(self._calculate_batch(firsts, seconds))
+        except Exception:
+            rows = []
+            for first, second in zip(firsts, seconds):
+                try:
+                    rows.append(self._calculate_batch([first], [second])[0])
+                except Exception as err:
+                    rows.append(err)
+            return rows
+
+    async def _fan_out(
+        self,
+        firsts: List[Any],
+        seconds: List[Any],
+        futures: List[asyncio.Future],
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            async with self._batcher._lock:  # one batch of a builder at a time
+                rows = await loop.run_in_executor(
+                    self._batcher.executor,
+                    self._calculate_rows,
+                    firsts,
+                    seconds,
+                )
+            self._batcher.flushed_batches += 1
+        except Exception as err:
+            rows = [err] * len(futures)
+        for future, row in zip(futures, rows):
+            if future.done():
+                continue
+            if isinstance(row, Exception):
+                future.set_exception(row)
+            else:
+                future.set_result(self._to_result(row))
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent sla and due time requests of a `ShiftsBuilder`:
+    the requests received within `window_seconds` (or until `max_batch_size`)
+    are calculated in a worker thread, then the results are fanned back out to each request.
+    The `CompiledCalendar` of the builder is kept between batches, and only recompiled
+    when a batch falls out of its horizon or the builder's config is changed.
+
+    :param builder: `ShiftsBuilder` generating the `Shift`s
+    :param window_seconds: how long the first request of a batch waits for others
+    :param max_batch_size: a full batch is calculated at once, without waiting
+    :param executor: worker threads, default is the event loop's executor
+    :param max_calendar_days: the kept `CompiledCalendar` is widened to cover new batches up to this many days
+    """
+
+    def __init__(
+        self,
+        builder: ShiftsBuilder,
+        window_seconds: float = 0.002,
+        max_batch_size: int = 4_096,
+        executor: Executor | None = None,
+        max_calendar_days: int = 3_660,
+    ):
+        self.builder = builder
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self.executor = executor
+        self.max_calendar_days = max_calendar_days
+        self.flushed_batches = 0
+        self.compiled_calendars = 0
+        self._lock = asyncio.Lock()
+        # config version of the builder, local dates covered and their calendar
+        self._calendar: Tuple[int, date, date, CompiledCalendar] | None = None
+        self._sla = _Coalescer(self, self._calculate_sla_batch, int)
+        self._due = _Coalescer(
+            self, self._calculate_due_batch, lambda due: due.item()
+        )
+
+    def compiled_calendar(
+        self, from_date: date, to_date: date
+    ) -> CompiledCalendar:
+        """
+        `CompiledCalendar` of the builder covering the local dates from `from_date` to `to_date`,
+        the kept one if it covers them, otherwise a new one (widened to the kept one's dates, within `max_calendar_days`)
+        """
+        version = self.builder._config_version
+        if self._calendar is not None and self._calendar[0] == version:
+            _, cached_from_date, cached_to_date, calendar = self._calendar
+            if cached_from_date <= from_date and to_date <= cached_to_date:
+                return calendar
+            widened_from_date = min(from_date, cached_from_date)
+            widened_to_date = max(to_date, cached_to_date)
+            if (
+                widened_to_date - widened_from_date
+            ).days < self.max_calendar_days:
+                from_date, to_date = widened_from_date, widened_to_date
+        calendar = self.builder.compile(from_date, to_date)
+        self.compiled_calendars += 1
+        self._calendar = (version, from_date, to_date, calendar)
+        return calendar
+
+    def _calculate_sla_batch(
+        self, start_deals: List[datetime], end_deals: List[datetime]
+    ) -> npt.NDArray[np.int64]:
+        start_deals = to_datetime64_ms(start_deals)
+        end_deals = to_datetime64_ms(end_deals)
+        deals_dates = self.builder.local_dates(
+            np.concatenate([start_deals, end_deals])
+        )
+        return self.compiled_calendar(
+            deals_dates.min().item(), deals_dates.max().item()
+        ).work_amount_between(start_deals, end_deals)
+
+    def _calculate_due_batch(
+        self, start_deals: List[datetime], milliseconds_durations: List[int]
+    ) -> npt.NDArray[np.datetime64]:
+        start_deals = to_datetime64_ms(start_deals)
+        durations = np.asarray(milliseconds_durations, dtype=np.int64)
+        start_dates = self.builder.local_dates(start_deals)
+        from_date, to_date = start_dates.min().item(), start_dates.max().item()
+        dues = self.compiled_calendar(from_date, to_date).due_after(
+            start_deals, durations
+        )
+        missing = np.isnat(dues)
+        if missing.any():
+            dues[missing] = self.builder.calculate_due_batch(
+                start_deals[missing], durations[missing]
+            )
+            # widen the kept calendar to these due times, for the next batches
+            self.compiled_calendar(
+                from_date, self.builder.local_dates(dues).max().item()
+            )
+        return dues
+
+    async def calculate_sla(
+        self, start_deal: datetime, end_deal: datetime
+    ) -> int:
+        return await self._sla.submit(start_deal, end_deal)
+
+    async def calculate_due(
+        self, start_deal: datetime, milliseconds_duration: int
+    ) -> datetime:
+        return await self._due.submit(start_deal, milliseconds_duration)
+
+
+class SLAServer:
+    """
+    Minimal HTTP/1.1 JSON server of sla and due times, one `MicroBatcher` per named `ShiftsBuilder`
+
+    :param builders: `ShiftsBuilder`s by the name used in requests
+    :param window_seconds: see `MicroBatcher`
+    :param max_batch_size: see `MicroBatcher`
+    """
+
+    def __init__(
+        self,
+        builders: Dict[str, ShiftsBuilder],
+        window_seconds: float = 0.002,
+        max_batch_size: int = 4_096,
+    ):
+        self.builders = builders
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self._batchers: Dict[str, MicroBatcher] = {}
+        self._server: asyncio.AbstractServer | None = None
+
+    def batcher(self, builder_name: str) -> MicroBatcher:
+        if builder_name not in self._batchers:
+            self._batchers[builder_name] = MicroBatcher(
+                self.builders[builder_name],
+                self.window_seconds,
+                self.max_batch_size,
+            )
+        return self._batchers[builder_name]
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> int:
+        """Start listening, return the port (useful with `port=0`)"""
+        self._server = await asyncio.start_server(
+            self._handle_connection, host, port
+        )
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def handle(
+        self, method: str, path: str, body: bytes
+    ) -> HTTP_RESPONSE:
+        if path == "/health":
+            return 200, {"status": "ok"}
+        if path not in ("/sla", "/due"):
+            return 404, {"error": f"Unknown path: {path}"}
+        if method != "POST":
+            return 405, {"error": f"Use POST for {path}"}
+        try:
+            request = json.loads(body)
+            if request.get("builder") not in self.builders:
+                return 404, {
+                    "error": f"Unknown builder: {request.get('builder')}"
+                }
+            batcher = self.batcher(request["builder"])
+            start_deal = datetime.fromisoformat(request["start_deal"])
+            if path == "/sla":
+                sla = await batcher.calculate_sla(
+                    start_deal, datetime.fromisoformat(request["end_deal"])
+                )
+                return 200, {"sla": sla}
+            due = await batcher.calculate_due(
+                start_deal, int(request["milliseconds_duration"])
+            )
+            return 200, {"due": due.isoformat()}
+        except BAD_REQUEST_ERRORS as err:
+            return 400, {"error": str(err)}
+        except Exception as err:
+            return 500, {"error": f"{type(err).__name__}: {err}"}
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (
+                    b"\r\n",
+                    b"\n",
+                    b"",
+                ):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(
+                    int(headers.get("content-length", 0))
+                )
+                status, payload = await self.handle(method, path, body)
+                content = json.dumps(payload).encode()
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(
+                    (
+                        f"HTTP/1.1 {status} {HTTP_STATUSES[status]}\r\n"
+                        "Content-Type: application/json\r\n"
+                        f"Content-Length: {len(content)}\r\n"
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                    ).encode("latin-1")
+                    + content
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+def serve(
+    builders: Dict[str, ShiftsBuilder],
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    window_seconds: float = 0.002,
+    max_batch_size: int = 4_096,
+) -> None:
+    """Run an `SLAServer` until interrupted"""
+
+    async def run() -> None:
+        server = SLAServer(builders, window_seconds, max_batch_size)
+        await server.start(host, port)
+        await server.serve_forever()
+
+    asyncio.run(run())
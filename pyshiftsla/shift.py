@@ -1,11 +1,13 @@
-from typing import List, Optional, Literal, Union, Tuple, TypedDict
+from typing import Any, List, Optional, Literal, Union, Tuple, TypedDict
 from pydantic import BaseModel, model_validator, AfterValidator
 from typing_extensions import Annotated
 from datetime import time
 from .datetime_utilities import (
-    diff_time,
+    MILLISECONDS_IN_A_DAY,
     check_start_end_event,
     compare_times,
+    milliseconds_from_day_start,
+    time_from_milliseconds,
     Milliseconds,
 )
 
@@ -65,17 +67,62 @@ def convert_shift_str(shiftstr: str) -> Tuple[time, time] | None:
 
 
 SHIFT_STRING = Annotated[str, AfterValidator(check_shift_str)]
+SHIFT_BOUNDS = Tuple[Milliseconds, Milliseconds]
 
 
 class Shift(BaseModel):
+    """
+    A working period starting in a day, from `start` to `end`.
+    An `end` before `start` is a night shift, ending the next day (e.g. 22:00 to 06:00),
+    and an `end` at 00:00 ends at midnight.
+    Calculations run on its compact form `bounds`:
+    the milliseconds from the day start of `start` and `end`,
+    so a night shift's end is above 86_400_000.
+    """
+
     start: time
     end: time
 
+    _bounds: SHIFT_BOUNDS | None = None
+
     @model_validator(mode="after")
-    def start_must_happend_before_end(self) -> "Shift":
-        check_start_end_event(self.start, self.end)
+    def start_must_differ_from_end(self) -> "Shift":
+        assert (
+            self.start != self.end
+        ), f"'Start' and 'End' of a shift must differ, parsed values: start({self.start}), end({self.end})"
         return self
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in self.model_fields:
+            self._bounds = None
+
+    @classmethod
+    def from_bounds(cls, start: Milliseconds, end: Milliseconds) -> "Shift":
+        """Turn the compact form back into a `Shift`, `start` and `end` must be already checked"""
+        shift = cls.model_construct(
+            start=time_from_milliseconds(start),
+            end=time_from_milliseconds(end % MILLISECONDS_IN_A_DAY),
+        )
+        shift._bounds = (int(start), int(end))
+        return shift
+
+    @property
+    def bounds(self) -> SHIFT_BOUNDS:
+        if self._bounds is None:
+            start = milliseconds_from_day_start(self.start)
+            end = milliseconds_from_day_start(self.end)
+            self._bounds = (
+                start,
+                end if end > start else end + MILLISECONDS_IN_A_DAY,
+            )
+        return self._bounds
+
+    @property
+    def overnight(self) -> bool:
+        """Whether the shift ends the next day (or at midnight)"""
+        return self.bounds[1] > MILLISECONDS_IN_A_DAY or self.end == time(0)
+
     @classmethod
     def fromstr(cls, shiftstr: SHIFT_STRING) -> "Shift":
         """Turn a string into a Shift.
@@ -86,10 +133,16 @@ class Shift(BaseModel):
 
     @property
     def diff(self) -> Milliseconds:
-        return diff_time(self.start, self.end)
+        start, end = self.bounds
+        return end - start
 
     def is_in_shift(self, event: time) -> bool:
-        return event >= self.start and event <= self.end
+        start, end = self.bounds
+        event_milliseconds = milliseconds_from_day_start(event)
+        return (
+            start <= event_milliseconds <= end
+            or start <= event_milliseconds + MILLISECONDS_IN_A_DAY <= end
+        )
 
     def work_amount_in_shift(
         self, start_work: time, end_work: time
@@ -103,19 +156,17 @@ class Shift(BaseModel):
         :rtype: Milliseconds
         """
         check_start_end_event(start_work, end_work)
-        match self.is_in_shift(start_work), self.is_in_shift(end_work):
-            case True, True:
-                return diff_time(start_work, end_work)
-            case True, False:
-                return diff_time(start_work, self.end)
-            case False, True:
-                return diff_time(self.start, end_work)
-            case False, False:
-                if start_work < self.start and end_work > self.end:
-                    # if shift is between the start and end work
-                    return self.diff
-                # if there's no shift between start and end work
-                return 0
+        return self.work_amount_in_bounds(
+            milliseconds_from_day_start(start_work),
+            milliseconds_from_day_start(end_work),
+        )
+
+    def work_amount_in_bounds(
+        self, start_work: Milliseconds, end_work: Milliseconds
+    ) -> Milliseconds:
+        """Same as `work_amount_in_shift`, with milliseconds from the day start"""
+        start, end = self.bounds
+        return max(0, min(end, end_work) - max(start, start_work))
 
     def _compare_mismatch_startend(
         self, other: "Shift"
@@ -124,17 +175,17 @@ class Shift(BaseModel):
             return "greater"
         elif self < other:
             return "smaller"
-        elif self.start == other.end:
+        elif self.bounds[0] == other.bounds[1]:
             return "start-connects-end"
-        elif self.end == other.start:
+        elif self.bounds[1] == other.bounds[0]:
             return "end-connects-start"
 
     def _compare_match_startend(
         self, other: "Shift"
     ) -> COMPARE_TO_ANOTHER_SHIFT_MATCH_STARTEND:
         match (
-            compare_times(self.start, other.start),
-            compare_times(self.end, other.end),
+            compare_times(self.bounds[0], other.bounds[0]),
+            compare_times(self.bounds[1], other.bounds[1]),
         ):
             case "equal", "equal":  # equal
                 return "equal"
@@ -159,24 +210,15 @@ class Shift(BaseModel):
 
     def get_overlap(self, other: "Shift") -> RESOLVED_OVERLAPPED_SHIFT:
         """Get overlapped `Shift`. if not overlap => return None."""
-        overlapped_shift = Shift(  # equal to self `Shift`
-            start=self.start, end=self.end
-        )
         compare_result = self.compare(other)
-        match compare_result:
-            case (
-                "smaller"
-                | "greater"
-                | "start-connects-end"
-                | "end-connects-start"
-            ):
-                overlapped_shift = None
-            case "following":
-                overlapped_shift.start = other.start
-            case "leading":
-                overlapped_shift.end = other.end
-            case "contain":
-                overlapped_shift = other
+        (start, end), (other_start, other_end) = self.bounds, other.bounds
+        overlapped_start = max(start, other_start)
+        overlapped_end = min(end, other_end)
+        overlapped_shift = None
+        if overlapped_start < overlapped_end:
+            overlapped_shift = Shift.from_bounds(
+                overlapped_start, overlapped_end
+            )
         return {
             "overlapped": overlapped_shift,
             "compare_result": compare_result,
@@ -192,29 +234,29 @@ class Shift(BaseModel):
         """
         if resolved_overlap is None:
             resolved_overlap = self.get_overlap(other)
+        (start, end), (other_start, other_end) = self.bounds, other.bounds
         outer_shifts = [self]
         match resolved_overlap["compare_result"]:
             case "smaller" | "greater":
                 outer_shifts.append(other)
             case "end-connects-start" | "start-connects-end":
                 outer_shifts = [
-                    Shift(
-                        start=min([self.start, other.start]),
-                        end=max([self.start, other.end]),
+                    Shift.from_bounds(
+                        min(start, other_start), max(end, other_end)
                     )
                 ]
             case "equal":
                 outer_shifts = None
             case "following" | "leading" | "contain" | "be-contained":
+                # the overlapped `Shift` is between both outer ones, which may be empty
+                outer_bounds = (
+                    (min(start, other_start), max(start, other_start)),
+                    (min(end, other_end), max(end, other_end)),
+                )
                 outer_shifts = [
-                    Shift(
-                        start=min([self.start, other.start]),
-                        end=resolved_overlap["overlapped"].start,
-                    ),
-                    Shift(
-                        start=resolved_overlap["overlapped"].end,
-                        end=max([self.end, other.end]),
-                    ),
+                    Shift.from_bounds(outer_start, outer_end)
+                    for outer_start, outer_end in outer_bounds
+                    if outer_start < outer_end
                 ]
         return outer_shifts
 
@@ -241,11 +283,11 @@ class Shift(BaseModel):
 
     def __gt__(self, other: "Shift") -> bool:
         """greater than"""
-        return self.start > other.end
+        return self.bounds[0] > other.bounds[1]
 
     def __lt__(self, other: "Shift") -> bool:
         """less than"""
-        return self.end < other.start
+        return self.bounds[1] < other.bounds[0]
 
     def __eq__(self, other: "Shift") -> bool:
         """equal to"""
@@ -1,14 +1,54 @@
-from datetime import date, time, datetime
-from typing import Dict, Literal, List
+from datetime import date, datetime
+from typing import Dict, Iterable, Literal, List, Sequence, Tuple
 from pydantic import RootModel
+import numpy as np
+import numpy.typing as npt
 
+from pyshiftsla import instrumentation
 from pyshiftsla.daily_shifts import DailyShift
-from pyshiftsla.datetime_utilities import Milliseconds, diff_datetime
+from pyshiftsla.datetime_utilities import (
+    MILLISECONDS_IN_A_DAY,
+    Milliseconds,
+    check_start_end_event,
+)
+from pyshiftsla.intervals import (
+    INTERVAL_BOUNDS,
+    cumulative_durations,
+    interval_coverage,
+    merge_intervals,
+    work_before,
+)
+
+
+DATES_INDEX = Tuple[npt.NDArray[np.datetime64], npt.NDArray[np.int64]]
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+TIMELINE = Tuple[INTERVAL_BOUNDS, INTERVAL_BOUNDS, INTERVAL_BOUNDS]
 
 
 class ShiftRange(RootModel):
+    """
+    `DailyShift`s of specific dates, works like a dictionary.
+    Range queries use a sorted dates index, along with the cumulative
+    working milliseconds of these dates.
+    Work amounts use a timeline: the merged `Shift`s in epoch milliseconds,
+    so night shifts simply run over midnight.
+    The cumulative working milliseconds follow the timeline: times worked by
+    the `Shift`s of 2 dates (a night shift and the next morning's) are counted once, for the earlier date.
+    They are built on first use and dropped whenever the `ShiftRange` is changed through its methods.
+    """
+
     root: Dict[date, DailyShift]
 
+    _dates: npt.NDArray[np.datetime64] | None = None
+    _index: DATES_INDEX | None = None
+    _timeline: TIMELINE | None = None
+
+    def __eq__(self, other: object) -> bool:
+        """Equal `DailyShift`s at the same dates, whatever index is cached"""
+        if not isinstance(other, ShiftRange):
+            return NotImplemented
+        return self.root == other.root
+
     def __getitem__(self, key: date) -> DailyShift:
         if not isinstance(key, date):
             raise NotImplementedError(
@@ -23,98 +63,309 @@ class ShiftRange(RootModel):
             )
         return self.root.get(key)
 
+    def _get_dates(self) -> npt.NDArray[np.datetime64]:
+        if self._dates is None:
+            self._dates = np.array(sorted(self.root), dtype="datetime64[D]")
+        return self._dates
+
+    def _get_index(self) -> DATES_INDEX:
+        """
+        Sorted dates, and the working milliseconds of the timeline before each of them.
+        Up to the end of a date, that's the timeline worked before its midnight,
+        along with its night shifts after midnight (only its own `Shift`s run over it).
+        """
+        if self._index is None:
+            sorted_dates = self._get_dates()
+            after_midnight: Dict[int, int] = {}  # by `DailyShift` object
+            for daily_shifts in self.root.values():
+                if (
+                    daily_shifts is not None
+                    and id(daily_shifts) not in after_midnight
+                ):
+                    after_midnight[
+                        id(daily_shifts)
+                    ] = daily_shifts.milliseconds_after_midnight
+            night_milliseconds = np.array(
+                [
+                    0
+                    if self.root[specified_date] is None
+                    else after_midnight[id(self.root[specified_date])]
+                    for specified_date in sorted_dates.tolist()
+                ],
+                dtype=np.int64,
+            )
+            midnights = (
+                sorted_dates.view(np.int64) + 1
+            ) * MILLISECONDS_IN_A_DAY
+            self._index = (
+                sorted_dates,
+                np.concatenate(
+                    (
+                        [0],
+                        work_before(*self.timeline, midnights)
+                        + night_milliseconds,
+                    )
+                ).astype(np.int64),
+            )
+        return self._index
+
+    def _index_bounds(self, from_date: date, to_date: date) -> Tuple[int, int]:
+        """Positions of `from_date` and `to_date` (included) in the dates index"""
+        sorted_dates = self._get_dates()
+        lower = int(
+            np.searchsorted(sorted_dates, np.datetime64(from_date, "D"), "left")
+        )
+        upper = int(
+            np.searchsorted(sorted_dates, np.datetime64(to_date, "D"), "right")
+        )
+        return lower, max(lower, upper)
+
     @property
     def _start_date(self) -> date:
-        return max(self.root)
+        return self._get_dates()[0].item()
 
     @property
     def _end_date(self) -> date:
-        return min(self.root)
+        return self._get_dates()[-1].item()
+
+    def _invalidate_index(self) -> None:
+        self._dates = None
+        self._index = None
+        self._timeline = None
 
     def __setitem__(self, key: date, value: DailyShift | None):
         self.root.update({key: value})
+        self._invalidate_index()
+
+    def intervals(self) -> Tuple[INTERVAL_BOUNDS, INTERVAL_BOUNDS]:
+        """
+        Epoch milliseconds of every `Shift`'s start and end.
+        Dates sharing one `DailyShift` object (e.g. the builder's workdays) are broadcast at once.
+        """
+        dates_by_daily_shift: Dict[int, Tuple[DailyShift, List[date]]] = {}
+        for specified_date, daily_shifts in self.root.items():
+            if daily_shifts is not None and daily_shifts.get_shifts_num() > 0:
+                dates_by_daily_shift.setdefault(
+                    id(daily_shifts), (daily_shifts, [])
+                )[1].append(specified_date)
+        starts, ends = (
+            [np.empty(0, dtype=np.int64)],
+            [np.empty(0, dtype=np.int64)],
+        )
+        for daily_shifts, dates in dates_by_daily_shift.values():
+            dates_millis = (
+                np.fromiter(map(date.toordinal, dates), np.int64, len(dates))
+                - EPOCH_ORDINAL
+            ) * MILLISECONDS_IN_A_DAY
+            bounds = daily_shifts.bounds.astype(np.int64)
+            starts.append((dates_millis[:, None] + bounds[:, 0]).ravel())
+            ends.append((dates_millis[:, None] + bounds[:, 1]).ravel())
+        return np.concatenate(starts), np.concatenate(ends)
+
+    def window_intervals(
+        self, from_date: date, to_date: date
+    ) -> Tuple[INTERVAL_BOUNDS, INTERVAL_BOUNDS]:
+        """`intervals` of the dates from `from_date` to `to_date` (included)"""
+        return self.slice(from_date, to_date).intervals()
+
+    @property
+    def timeline(self) -> TIMELINE:
+        """
+        Merged epoch milliseconds intervals of every `Shift`,
+        along with the cumulative working milliseconds before each interval
+        """
+        if self._timeline is None:
+            starts, ends = merge_intervals(*self.intervals())
+            self._timeline = (starts, ends, cumulative_durations(starts, ends))
+        return self._timeline
+
+    @classmethod
+    def from_intervals(
+        cls,
+        dates: Iterable[date],
+        starts: INTERVAL_BOUNDS,
+        ends: INTERVAL_BOUNDS,
+    ) -> "ShiftRange":
+        """
+        `DailyShift`s of `dates`, and of the dates of the sorted, disjoint epoch milliseconds intervals.
+        Intervals are split at midnight: a night shift gives a `Shift` ending at 00:00, and one starting at 00:00 the next day.
+        `dates` without intervals get an empty `DailyShift`, identical days share one `DailyShift`.
+        """
+        first_days = starts // MILLISECONDS_IN_A_DAY
+        pieces = (ends - 1) // MILLISECONDS_IN_A_DAY - first_days + 1
+        interval_idx = np.repeat(np.arange(starts.size), pieces)
+        piece_days = first_days[interval_idx] + (
+            np.arange(interval_idx.size)
+            - np.repeat(np.cumsum(pieces) - pieces, pieces)
+        )
+        piece_starts = np.maximum(
+            starts[interval_idx], piece_days * MILLISECONDS_IN_A_DAY
+        )
+        piece_ends = np.minimum(
+            ends[interval_idx], (piece_days + 1) * MILLISECONDS_IN_A_DAY
+        )
+
+        days = np.union1d(
+            np.array(list(dates), dtype="datetime64[D]").view(np.int64),
+            piece_days,
+        )
+        sorted_dates = days.view("datetime64[D]")
+        lowers = np.searchsorted(piece_days, days, "left")
+        uppers = np.searchsorted(piece_days, days, "right")
+        daily_shifts_by_bounds: Dict[bytes, DailyShift] = {}
+        shiftrange = {}
+        for specified_date, day, lower, upper in zip(
+            sorted_dates.tolist(),
+            days.tolist(),
+            lowers.tolist(),
+            uppers.tolist(),
+        ):
+            bounds = (
+                np.column_stack(
+                    (piece_starts[lower:upper], piece_ends[lower:upper])
+                )
+                - day * MILLISECONDS_IN_A_DAY
+            )
+            key = bounds.tobytes()
+            if key not in daily_shifts_by_bounds:
+                daily_shifts_by_bounds[key] = DailyShift.from_bounds(
+                    bounds[:, 0], bounds[:, 1]
+                )
+            shiftrange[specified_date] = daily_shifts_by_bounds[key]
+        return cls.model_construct(shiftrange)
+
+    @classmethod
+    def coverage(
+        cls, shiftranges: Sequence["ShiftRange"], min_count: int = 1
+    ) -> "ShiftRange":
+        """
+        Times covered by at least `min_count` of the `shiftranges`,
+        e.g. when at least 2 agents of a team are on shift.
+        Found with one sweep line over the `Shift`s of every `ShiftRange`,
+        the result has every date of the `shiftranges`.
+        """
+        intervals = [shiftrange.intervals() for shiftrange in shiftranges]
+        starts, ends = interval_coverage(
+            [starts for starts, _ in intervals],
+            [ends for _, ends in intervals],
+            min_count,
+        )
+        return cls.from_intervals(
+            {
+                specified_date
+                for shiftrange in shiftranges
+                for specified_date in shiftrange._get_dates().tolist()
+            },
+            starts,
+            ends,
+        )
+
+    @classmethod
+    def union(cls, shiftranges: Sequence["ShiftRange"]) -> "ShiftRange":
+        return cls.coverage(shiftranges, 1)
+
+    @classmethod
+    def intersection(cls, shiftranges: Sequence["ShiftRange"]) -> "ShiftRange":
+        assert len(shiftranges) > 0, "Intersection of no `ShiftRange`s"
+        return cls.coverage(shiftranges, len(shiftranges))
+
+    def difference(self, others: Sequence["ShiftRange"]) -> "ShiftRange":
+        """Times of this `ShiftRange` outside of every `others`, at the dates of this `ShiftRange`"""
+        intervals = [self.intervals()] + [other.intervals() for other in others]
+        starts, ends = interval_coverage(
+            [starts for starts, _ in intervals],
+            [ends for _, ends in intervals],
+            1,
+            [1] + [-1] * len(others),
+        )
+        return ShiftRange.from_intervals(
+            self._get_dates().tolist(), starts, ends
+        )
 
     def update(self, to_update: "ShiftRange") -> None:
         self.root.update(to_update.root)
+        self._invalidate_index()
+
+    def slice(self, from_date: date, to_date: date) -> "ShiftRange":
+        """
+        Get a `ShiftRange` of the dates from `from_date` to `to_date` (included)
+        """
+        sorted_dates = self._get_dates()
+        lower, upper = self._index_bounds(from_date, to_date)
+        return ShiftRange.model_construct(
+            {
+                specified_date: self.root[specified_date]
+                for specified_date in sorted_dates[lower:upper].tolist()
+            }
+        )
 
     def shifts_milliseconds(
         self,
         from_date: date,
         to_date: date,
-        exclude: List[date] = [],
+        exclude: Iterable[date] = (),
     ) -> Milliseconds:
-        return sum(
-            [
-                daily_shifts.total_milliseconds
-                for specified_date, daily_shifts in self.root.items()
-                if specified_date not in exclude
-                and specified_date >= from_date
-                and specified_date <= to_date
-            ]
+        sorted_dates, cumulative_milliseconds = self._get_index()
+        lower, upper = self._index_bounds(from_date, to_date)
+        excluded_idx = np.searchsorted(
+            sorted_dates,
+            np.array(
+                [
+                    excluded_date
+                    for excluded_date in set(exclude)
+                    if from_date <= excluded_date <= to_date
+                    and excluded_date in self.root
+                ],
+                dtype="datetime64[D]",
+            ),
+        )
+        excluded_milliseconds = int(
+            (
+                cumulative_milliseconds[excluded_idx + 1]
+                - cumulative_milliseconds[excluded_idx]
+            ).sum()
+        )
+        return (
+            int(cumulative_milliseconds[upper] - cumulative_milliseconds[lower])
+            - excluded_milliseconds
         )
 
     @property
     def total_milliseconds(self) -> Milliseconds:
-        return self.shifts_milliseconds(self._start_date, self._end_date)
+        _, cumulative_milliseconds = self._get_index()
+        return int(cumulative_milliseconds[-1])
 
     def shiftrange_from_duration(
-        self, start_work: datetime, milliseconds_duration: int
+        self, start_work: datetime, milliseconds_duration: Milliseconds
     ) -> "ShiftRange":
-        if start_work.date() not in self.root:
-            raise ValueError(
-                f"{start_work} is outside of daterange, from {self._start_date} to {self._end_date}"
-            )
-        if (self.total_milliseconds) > milliseconds_duration:
+        """
+        Get the `Shift`s worked from `start_work` until `milliseconds_duration` is used up.
+        The due time is found with a binary search over the timeline's cumulative working milliseconds,
+        then the worked parts of the timeline are split back into days.
+        :param start_work: Starts Work Event
+        :param milliseconds_duration: working `Milliseconds` to be used up
+        :rtype: `ShiftRange` of the days with worked `Shift`s, the last one ends at the due time
+        """
+        starts, ends, cumulative = self.timeline
+        start_millis = int(np.datetime64(start_work, "ms").view(np.int64))
+        target_milliseconds = (
+            int(work_before(starts, ends, cumulative, start_millis))
+            + milliseconds_duration
+        )
+        if target_milliseconds > cumulative[-1]:
             raise ValueError(
-                f"{milliseconds_duration} is longer than shift range: {self.total_milliseconds}"
+                f"{milliseconds_duration} is longer than the remaining shifts in shift range, after {start_work}"
             )
-
-    def work_amount_in_start_end(
-        self,
-        start_work: datetime,
-        end_work: datetime,
-        default_if_no_shifts_are_between: Literal["diff"] | int = "diff",
-    ) -> Milliseconds:
-        start_work_date, end_work_date = start_work.date(), end_work.date()
-        start_day_shifts, end_day_shifts = (
-            self.get(start_work_date),
-            self.get(end_work_date),
-        )
-        if start_day_shifts is None and end_day_shifts is None:
-            if default_if_no_shifts_are_between == "diff":
-                return diff_datetime(start_work, end_work)
-        else:
-            if start_day_shifts is not None and end_day_shifts is None:
-                return start_day_shifts.work_amount_in_shifts(
-                    start_work.time(),
-                    time(23, 59, 59),
-                    default_if_no_shifts_are_between,
-                )
-            if end_day_shifts is not None and start_day_shifts is None:
-                return end_day_shifts.work_amount_in_shifts(
-                    time(0, 0),
-                    end_work.time(),
-                    default_if_no_shifts_are_between,
-                )
-            if end_day_shifts is not None and start_day_shifts is not None:
-                if start_work_date == end_work_date:
-                    return start_day_shifts.work_amount_in_shifts(
-                        start_work, end_work, default_if_no_shifts_are_between
-                    )
-                else:
-                    start_day_workamount = (
-                        start_day_shifts.work_amount_in_shifts(
-                            start_work.time(),
-                            time(23, 59, 59),
-                            default_if_no_shifts_are_between,
-                        )
-                    )
-                    end_day_workamount = end_day_shifts.work_amount_in_shifts(
-                        time(0, 0),
-                        end_work.time(),
-                        default_if_no_shifts_are_between,
-                    )
-                    return start_day_workamount + end_day_workamount
+        due_idx = int(
+            np.searchsorted(cumulative[1:], target_milliseconds, "left")
+        )
+        due_millis = starts[due_idx] + target_milliseconds - cumulative[due_idx]
+        worked_starts = np.maximum(starts[: due_idx + 1], start_millis)
+        worked_ends = np.minimum(ends[: due_idx + 1], due_millis)
+        worked = worked_starts < worked_ends
+        return ShiftRange.from_intervals(
+            (), worked_starts[worked], worked_ends[worked]
+        )
 
     def work_amount_in_shiftrange(
         self,
@@ -122,12 +373,26 @@ class ShiftRange(RootModel):
         end_work: datetime,
         default_if_no_shifts_are_between: Literal["diff"] | int = "diff",
     ) -> Milliseconds:
-        start_work_date, end_work_date = start_work.date(), end_work.date()
-        startend_work_amount = self.work_amount_in_start_end(
-            start_work, end_work, default_if_no_shifts_are_between
-        )
-        remaining_work_amount = self.shifts_milliseconds(
-            start_work_date, end_work_date, [start_work_date, end_work_date]
-        )
-        total_work_amount = startend_work_amount + remaining_work_amount
-        return total_work_amount
+        """
+        Working milliseconds from `start_work` to `end_work`, 2 binary searches on the timeline.
+        :param `default_if_no_shifts_are_between`: is used when no `Shift`s are found between them. If `"diff"`, the `Milliseconds` between them are used
+        """
+        check_start_end_event(start_work, end_work)
+        with instrumentation.stage("shiftrange.work_amount"):
+            start_millis, end_millis = (
+                np.array([start_work, end_work], dtype="datetime64[ms]")
+                .view(np.int64)
+                .tolist()
+            )
+            starts, ends, cumulative = self.timeline
+            work_amount = int(
+                work_before(starts, ends, cumulative, end_millis)
+                - work_before(starts, ends, cumulative, start_millis)
+            )
+        if work_amount == 0:
+            return (
+                end_millis - start_millis
+                if default_if_no_shifts_are_between == "diff"
+                else default_if_no_shifts_are_between
+            )
+        return work_amount
@@ -1,14 +1,37 @@
-from typing import List, Optional, Set, Literal
-from pydantic import BaseModel
-from datetime import date, datetime
+from typing import (
+    Annotated,
+    Any,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Literal,
+    Tuple,
+)
+from pydantic import AfterValidator, BaseModel, TypeAdapter
+from datetime import date, datetime, timedelta
 import numpy as np
 import numpy.typing as npt
-import polars as pl
 
+from pyshiftsla import instrumentation
 from pyshiftsla.shiftrange import ShiftRange
-from pyshiftsla.daterange import DateRange
+from pyshiftsla.lazy_shiftrange import LazyShiftRange
+from pyshiftsla.extending_shiftrange import ExtendingShiftRange
+from pyshiftsla.daterange import DateRange, RecurringDateRange
 from pyshiftsla.daily_shifts import DailyShift
-from pyshiftsla.datetime_utilities import Milliseconds
+from pyshiftsla.datetime_utilities import (
+    Milliseconds,
+    to_datetime64_ms,
+    to_naive_utc,
+)
+from pyshiftsla.compiled_calendar import (
+    CompiledCalendar,
+    EPOCH_MILLISECONDS,
+    daily_shift_bounds,
+    date_to_epoch_milliseconds,
+)
+from pyshiftsla.timezones import check_timezone, offset_table, utc_millis_years
 from pyshiftsla.common_daysoff import (
     COMMON_WORKDAYS_IN_WEEK,
     COMMON_DAILY_SHIFTS,
@@ -16,6 +39,49 @@ from pyshiftsla.common_daysoff import (
 )
 
 YEAR = MONTH = DAY = int
+DAYS_OFF_RANGES = List[DateRange | RecurringDateRange | date]
+DAYS_OFF_RANGES_ADAPTER = TypeAdapter(DAYS_OFF_RANGES)
+COMPILED_DAYS_OFF = Tuple[
+    npt.NDArray[np.datetime64], np.busdaycalendar | None
+]  # sorted days off, `None` calendar if there are no workdays in a week, or for an overlay (its base's calendar is used)
+COMPILED_DAYS_OFF_PREFIX = Tuple[
+    int, npt.NDArray[np.datetime64]
+]  # sorted days off of the `DateRange`s and `date`s in the first `int` `days_off_ranges`
+TIMEZONE = Annotated[str, AfterValidator(check_timezone)]
+COMPILED_DAYS_OFF_STATE = Tuple[
+    List[RecurringDateRange], FrozenSet[YEAR], COMPILED_DAYS_OFF
+]  # the `RecurringDateRange`s of `days_off_ranges`, the years they are expanded for, compiled days off
+
+
+def expand_days_off_ranges(
+    days_off_ranges: Iterable[DateRange | RecurringDateRange | date],
+) -> npt.NDArray[np.datetime64]:
+    """
+    Sorted, unique `datetime64[D]` days off of the `DateRange`s and `date`s in `days_off_ranges`,
+    `RecurringDateRange`s are expanded per year by `ShiftsBuilder`
+    """
+    return np.unique(
+        np.concatenate(
+            [
+                np.array([dates_indicator], dtype="datetime64[D]")
+                if isinstance(dates_indicator, date)
+                else dates_indicator.to_numpy()
+                for dates_indicator in days_off_ranges
+                if not isinstance(dates_indicator, RecurringDateRange)
+            ]
+            + [np.array([], dtype="datetime64[D]")]
+        )
+    )
+
+
+def _is_in_sorted(
+    sorted_days: npt.NDArray[np.datetime64], days: npt.NDArray[np.datetime64]
+) -> npt.NDArray[np.bool_]:
+    """Whether each of `days` is in `sorted_days`, with a binary search"""
+    if sorted_days.size == 0:
+        return np.zeros(days.shape, dtype=np.bool_)
+    positions = np.searchsorted(sorted_days, days)
+    return sorted_days.take(positions, mode="clip") == days
 
 
 class ShiftsBuilder(BaseModel):
@@ -26,28 +92,162 @@ class ShiftsBuilder(BaseModel):
 
     :param workdays_weekly: indexes of work days in a week, default is from Monday to Friday [0,1,2,3,4]
     :param daily_shifts: default `Shifts` in a typical workday.
-    :param days_off: List of days off, can be *lunar* or *solar* days off
+    :param days_off: List of days off, can be *lunar* or *solar* days off,
+        or `RecurringDateRange` days off of every year, expanded only for the queried years
     :param special_shifts: special `Shifts` of a *specific date*
+    :param timezone: IANA time zone of the `Shift`s wall clock times, e.g. "America/New_York".
+        If set, deals are UTC timestamps (naive, or aware and converted to UTC), and due times are naive UTC `datetime`s.
+        Compiled calendars are converted to UTC, so the `Shift`s of daylight saving time days last as long as they are worked.
+
+    Copies (`partial_config_copy`, `overlay`, `add_days_off_range`...) share the unchanged config
+    and what's compiled from it. Config is never changed in place, but replaced (copy-on-write).
     """
 
     workdays_weekly: WEEKDAYS = COMMON_WORKDAYS_IN_WEEK
     daily_shifts: DailyShift = COMMON_DAILY_SHIFTS
-    days_off_ranges: List[DateRange | date] = []
+    days_off_ranges: DAYS_OFF_RANGES = []
     special_shifts: ShiftRange = ShiftRange({})
+    timezone: TIMEZONE | None = None
 
     _generated_shifts: ShiftRange | None = None
+    _extending_shifts: ExtendingShiftRange | None = None
+    _compiled_days_off: COMPILED_DAYS_OFF_STATE | None = None
+    _days_off_prefix: COMPILED_DAYS_OFF_PREFIX | None = None
+    _config_version: int = 0
+    # unchanged copy of the base of an overlay: the overlay only compiles the days off appended to the base's
+    _overlay_base: Optional["ShiftsBuilder"] = None
+    _overlay_snapshot: Optional["ShiftsBuilder"] = None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name == "days_off_ranges" or (
+            name == "workdays_weekly" and self._overlay_base is not None
+        ):
+            self._days_off_prefix = None
+            self._overlay_base = None
+        if name in self.model_fields:
+            self._invalidate_compiled()
+
+    def _replace_field(self, name: str, value: Any) -> None:
+        """
+        Replace a config field (copy-on-write) without dropping the days off compiled from the unchanged `days_off_ranges` prefix
+        """
+        self.__dict__[name] = value
+        self._invalidate_compiled()
+
+    def __eq__(self, other: object) -> bool:
+        """Equal configs, whatever is compiled from them"""
+        if not isinstance(other, ShiftsBuilder):
+            return NotImplemented
+        return self.__dict__ == other.__dict__
+
+    def _invalidate_compiled(self) -> None:
+        """Drop every artifact compiled from the config, after the config is changed"""
+        self._compiled_days_off = None
+        self._overlay_snapshot = None
+        self._config_version += 1
+
+    @property
+    def _own_days_off_ranges(self) -> DAYS_OFF_RANGES:
+        """`days_off_ranges` compiled by this `ShiftsBuilder`, those appended to its overlay base's"""
+        if self._overlay_base is None:
+            return self.days_off_ranges
+        return self.days_off_ranges[len(self._overlay_base.days_off_ranges) :]
+
+    def _compile_days_off(
+        self, from_date: date | None = None, to_date: date | None = None
+    ) -> COMPILED_DAYS_OFF:
+        """
+        Expand `days_off_ranges` once into sorted `datetime64[D]` days off,
+        and a `np.busdaycalendar` reused by every workday calculation.
+        Only the `days_off_ranges` appended after the compiled prefix are expanded.
+        An overlay only expands the `days_off_ranges` appended to its base's, without a calendar,
+        and compiles its base for the same dates.
+        `RecurringDateRange`s are expanded for the years queried so far (each year is memoized),
+        the calendar is recompiled when a year from `from_date` to `to_date` is not expanded yet.
+
+        The compiled state is immutable and replaced at once,
+        so concurrent threads never see it half-built (at worst, they compile it twice).
+        """
+        if self._overlay_base is not None:
+            self._overlay_base._compile_days_off(from_date, to_date)
+        state = self._compiled_days_off
+        years = frozenset() if state is None else state[1]
+        recurring_days_off_ranges = (
+            [
+                dates_indicator
+                for dates_indicator in self._own_days_off_ranges
+                if isinstance(dates_indicator, RecurringDateRange)
+            ]
+            if state is None
+            else state[0]
+        )
+        if recurring_days_off_ranges and from_date is not None:
+            to_date = to_date or from_date
+            # a range starting in the previous (lunar) year can end in `from_date`'s year
+            queried_years = range(
+                min(from_date, to_date).year - 1,
+                max(from_date, to_date).year + 1,
+            )
+            if not years.issuperset(queried_years):
+                years, state = years.union(queried_years), None
+        instrumentation.cache_lookup("days_off", state is not None)
+        if state is None:
+            with instrumentation.stage("days_off.compile"):
+                state = (
+                    recurring_days_off_ranges,
+                    years,
+                    self._expand_days_off(recurring_days_off_ranges, years),
+                )
+            self._compiled_days_off = state
+        return state[2]
+
+    def _expand_days_off(
+        self,
+        recurring_days_off_ranges: List[RecurringDateRange],
+        years: FrozenSet[YEAR],
+    ) -> COMPILED_DAYS_OFF:
+        """Expand `days_off_ranges` after the compiled prefix, and the `RecurringDateRange`s of `years`"""
+        days_off_ranges = self._own_days_off_ranges
+        compiled_ranges, days_off = self._days_off_prefix or (
+            0,
+            np.array([], dtype="datetime64[D]"),
+        )
+        if compiled_ranges > len(days_off_ranges):
+            compiled_ranges, days_off = 0, days_off[:0]
+        days_off = np.union1d(
+            days_off,
+            expand_days_off_ranges(days_off_ranges[compiled_ranges:]),
+        )
+        days_off.flags.writeable = False
+        self._days_off_prefix = (len(days_off_ranges), days_off)
+        if recurring_days_off_ranges and years:
+            days_off = np.union1d(
+                days_off,
+                np.concatenate(
+                    [
+                        recurring.to_numpy(year, year)
+                        for recurring in recurring_days_off_ranges
+                        for year in sorted(years)
+                    ]
+                ),
+            )
+            days_off.flags.writeable = False
+        busdaycalendar = (
+            np.busdaycalendar(
+                weekmask=self._numpy_busday_weekmask, holidays=days_off
+            )
+            if len(self.workdays_weekly) > 0 and self._overlay_base is None
+            else None
+        )
+        return days_off, busdaycalendar
 
     @property
     def _days_off(self) -> Set[date]:
-        if len(self.days_off_ranges) == 0:
-            return set()
-        days_off = set()
-        for dates_indicator in self.days_off_ranges:
-            if isinstance(dates_indicator, date):
-                days_off.add(dates_indicator)
-            else:
-                days_off.update(dates_indicator.dates)
-        return days_off
+        days_off, _ = self._compile_days_off()
+        if self._overlay_base is not None:
+            return self._overlay_base._days_off | set(days_off.tolist())
+        return set(days_off.tolist())
 
     @property
     def _numpy_busday_weekmask(self) -> List[Literal[1, 0]]:
@@ -61,22 +261,59 @@ class ShiftsBuilder(BaseModel):
         dates_to_check: List[date],
         returned_as: Literal["filtered_dates", "checks_array"] = "checks_array",
     ) -> npt.NDArray[np.bool_]:
-        checks = np.is_busday(
-            dates_to_check,
-            weekmask=self._numpy_busday_weekmask,
-            holidays=list(self._days_off),
+        checked_dates = np.asarray(dates_to_check, dtype="datetime64[D]")
+        days_off, busdaycalendar = (
+            self._compile_days_off(
+                checked_dates.min().item(), checked_dates.max().item()
+            )
+            if checked_dates.size > 0
+            else self._compile_days_off()
         )
+        if self._overlay_base is not None:
+            # workdays of the base, but the overlay's own days off
+            checks = self._overlay_base.is_workday(
+                checked_dates
+            ) & ~_is_in_sorted(days_off, checked_dates)
+        else:
+            with instrumentation.stage("workdays.is_busday"):
+                checks = (
+                    np.is_busday(checked_dates, busdaycal=busdaycalendar)
+                    if busdaycalendar is not None
+                    else np.zeros(len(checked_dates), dtype=np.bool_)
+                )
         if returned_as == "filtered_dates":
             return np.array(dates_to_check)[checks]
         return checks
 
     def get_workdays(self, from_date: date, to_date: date) -> List[date]:
-        raw_dates = pl.date_range(
-            start=from_date, end=to_date, eager=True
-        ).to_list()
+        with instrumentation.stage("workdays.date_range"):
+            raw_dates = np.arange(
+                np.datetime64(from_date, "D"), np.datetime64(to_date, "D") + 1
+            )
         return self.is_workday(raw_dates, returned_as="filtered_dates").tolist()
 
-    def get_days_off(self) -> Set[date]:
+    def daily_shifts_at(self, specified_date: date) -> DailyShift | None:
+        """
+        Resolve the `DailyShift` of a single date, with the priorities
+        `special_shifts` > `days_off` > `daily_shifts` + `workdays_weekly`.
+        `None` if the date is a day off.
+        """
+        special_shifts = self.special_shifts.get(specified_date)
+        if special_shifts is not None:
+            return special_shifts
+        if self.is_workday([specified_date])[0]:
+            return self.daily_shifts
+        return None
+
+    def get_days_off(
+        self, from_date: date | None = None, to_date: date | None = None
+    ) -> Set[date]:
+        """
+        Days off, with the `RecurringDateRange`s expanded for the years from `from_date` to `to_date`,
+        along with the years queried so far
+        """
+        if from_date is not None:
+            self._compile_days_off(from_date, to_date)
         return self._days_off
 
     def partial_config_copy(
@@ -86,28 +323,81 @@ class ShiftsBuilder(BaseModel):
         days_off_ranges: List[DateRange | date] | None = None,
         special_shifts: ShiftRange | None = None,
     ) -> "ShiftsBuilder":
-        return ShiftsBuilder(
-            daily_shifts=daily_shifts if daily_shifts else self.daily_shifts,
-            days_off_ranges=(
-                days_off_ranges if days_off_ranges else self.days_off_ranges
-            ),
-            workdays_weekly=(
-                workdays_weekly if workdays_weekly else self.workdays_weekly
-            ),
-            special_shifts=special_shifts
-            if special_shifts
-            else self.special_shifts,
+        """
+        Copy this `ShiftsBuilder`, replacing the parsed config.
+        Only the parsed config is validated, the rest (and what's compiled from it) is shared.
+        """
+        overrides = {
+            name: value
+            for name, value in (
+                ("workdays_weekly", workdays_weekly),
+                ("daily_shifts", daily_shifts),
+                ("days_off_ranges", days_off_ranges),
+                ("special_shifts", special_shifts),
+            )
+            if value is not None
+        }
+        validated_overrides = ShiftsBuilder(**overrides)
+        copied = ShiftsBuilder.model_construct(
+            **{
+                name: getattr(
+                    validated_overrides if name in overrides else self, name
+                )
+                for name in self.model_fields
+            }
+        )
+        if "days_off_ranges" not in overrides and (
+            self._overlay_base is None or "workdays_weekly" not in overrides
+        ):
+            copied._days_off_prefix = self._days_off_prefix
+            copied._overlay_base = self._overlay_base
+            if "workdays_weekly" not in overrides:
+                copied._compiled_days_off = self._compiled_days_off
+        return copied
+
+    def overlay(
+        self,
+        days_off_ranges: List[DateRange | date] | None = None,
+        special_shifts: ShiftRange | None = None,
+        workdays_weekly: WEEKDAYS | None = None,
+        daily_shifts: DailyShift | None = None,
+    ) -> "ShiftsBuilder":
+        """
+        Copy this `ShiftsBuilder` as a base, with extra `days_off_ranges` and `special_shifts` on top of it,
+        and optionally different `workdays_weekly` or `daily_shifts`.
+        The base's days off and calendar are compiled once and shared by all of its overlays:
+        an overlay (e.g. an employee of a company) only compiles its own days off,
+        checked on top of the base's calendar, unless its `workdays_weekly` differ.
+        """
+        if self._overlay_snapshot is None:
+            # unchanged copy, the base itself can still be changed in place
+            self._overlay_snapshot = self.partial_config_copy()
+        base = self._overlay_snapshot
+        base._compile_days_off()
+        overlaid = base.partial_config_copy(
+            workdays_weekly=workdays_weekly, daily_shifts=daily_shifts
         )
+        if workdays_weekly is None:
+            overlaid._days_off_prefix = None
+            overlaid._compiled_days_off = None
+            overlaid._overlay_base = base
+        if days_off_ranges:
+            overlaid.add_days_off_range(days_off_ranges, inplace=True)
+        if special_shifts is not None:
+            overlaid.update_special_shifts(special_shifts, inplace=True)
+        return overlaid
 
     def add_days_off_range(
         self, days_off_range: List[DateRange | date], inplace: bool = False
     ) -> Optional["ShiftsBuilder"]:
         if inplace:
-            self.days_off_ranges.extend(days_off_range)
+            self._replace_field(
+                "days_off_ranges",
+                self.days_off_ranges
+                + DAYS_OFF_RANGES_ADAPTER.validate_python(days_off_range),
+            )
             return
-        return self.partial_config_copy(
-            days_off_ranges=self.days_off_ranges + days_off_range
-        )
+        return self.overlay(days_off_ranges=days_off_range)
 
     def update_workday_weekly(
         self, workdays: WEEKDAYS, inplace: bool = False
@@ -123,7 +413,13 @@ class ShiftsBuilder(BaseModel):
         inplace: bool = False,
     ) -> Optional["ShiftsBuilder"]:
         if inplace:
-            self.special_shifts.update(special_shifts)
+            self._replace_field(
+                "special_shifts",
+                ShiftRange.model_construct(
+                    {**self.special_shifts.root, **special_shifts.root}
+                ),
+            )
+            return
         return self.partial_config_copy(special_shifts=special_shifts)
 
     def calculate_work_days_between(
@@ -131,11 +427,68 @@ class ShiftsBuilder(BaseModel):
         start_deal: date,
         end_deal: date,
     ) -> int:
-        return np.busday_count(
-            start_deal,
-            end_deal,
-            self._numpy_busday_weekmask,
-            self._days_off,
+        days_off, busdaycalendar = self._compile_days_off(start_deal, end_deal)
+        if self._overlay_base is not None:
+            # workdays of the base, but the overlay's own days off
+            work_days = self._overlay_base.calculate_work_days_between(
+                start_deal, end_deal
+            )
+            from_day, to_day = sorted(
+                (np.datetime64(start_deal, "D"), np.datetime64(end_deal, "D"))
+            )
+            own_days_off = days_off[
+                np.searchsorted(days_off, from_day) : np.searchsorted(
+                    days_off, to_day
+                )
+            ]
+            taken_days = int(self._overlay_base.is_workday(own_days_off).sum())
+            return (
+                work_days - taken_days
+                if start_deal <= end_deal
+                else work_days + taken_days
+            )
+        if busdaycalendar is None:
+            return 0
+        return np.busday_count(start_deal, end_deal, busdaycal=busdaycalendar)
+
+    def shifts_milliseconds(
+        self, from_date: date, to_date: date
+    ) -> Milliseconds:
+        """
+        Total milliseconds of the `DailyShift`s of the dates from `from_date` to `to_date` (included),
+        counted by their starting date, without generating them.
+        Like in a `ShiftRange`, the times also worked by the night shifts of the day before are counted for it,
+        so overlapping night shifts are compiled into a calendar instead.
+        """
+        special_shifts = self.special_shifts.slice(
+            from_date - timedelta(days=1), to_date
+        )
+        if self.daily_shifts.milliseconds_after_midnight > 0 or any(
+            daily_shifts is not None
+            and daily_shifts.milliseconds_after_midnight > 0
+            for daily_shifts in special_shifts.root.values()
+        ):
+            previous_daily_shifts = self.daily_shifts_at(
+                from_date - timedelta(days=1)
+            )
+            return self._compile_wall_clock(
+                from_date, to_date
+            ).total_milliseconds - (
+                0
+                if previous_daily_shifts is None
+                else previous_daily_shifts.milliseconds_after_midnight
+            )
+        days = np.arange(
+            np.datetime64(from_date, "D"), np.datetime64(to_date, "D") + 1
+        )
+        special_shifts = self.special_shifts.slice(from_date, to_date)
+        workdays = np.setdiff1d(
+            days[self.is_workday(days)],
+            np.array(list(special_shifts.root), dtype="datetime64[D]"),
+        )
+        return (
+            workdays.size * self.daily_shifts.total_milliseconds
+            + special_shifts.total_milliseconds
         )
 
     def build_shifts_from_daterange(
@@ -147,42 +500,386 @@ class ShiftsBuilder(BaseModel):
         :param `to_date`: end date of the range
         :return: `ShiftRange` with `Shift`s
         """
-        workdays = self.get_workdays(from_date, to_date)
-        self._generated_shifts = ShiftRange(
-            {workday: self.daily_shifts for workday in workdays}
+        self._generated_shifts = self._build_shiftrange(from_date, to_date)
+        return self._generated_shifts
+
+    def _build_shiftrange(self, from_date: date, to_date: date) -> ShiftRange:
+        with instrumentation.stage("shiftrange.build"):
+            workdays = self.get_workdays(from_date, to_date)
+            with instrumentation.stage("shiftrange.validate"):
+                shiftrange = ShiftRange(
+                    {workday: self.daily_shifts for workday in workdays}
+                )
+            shiftrange.update(self.special_shifts.slice(from_date, to_date))
+        instrumentation.count("days.materialized", len(shiftrange.root))
+        return shiftrange
+
+    def build_lazy_shifts(
+        self,
+        from_date: date | None = None,
+        to_date: date | None = None,
+        memoize: bool = True,
+    ) -> LazyShiftRange:
+        """
+        Same as `build_shifts_from_daterange`, but the `Shift`s of a date are only generated when it is queried.
+        The range can be unbounded, so `calculate_sla(use_generated_shifts=True)` works for any deal.
+        :param `from_date`: start date of the range, `None` for unbounded
+        :param `to_date`: end date of the range, `None` for unbounded
+        :param `memoize`: keep the queried `DailyShift`s and window totals
+        :return: `LazyShiftRange`
+        """
+        self._generated_shifts = LazyShiftRange.from_builder(
+            self, from_date, to_date, memoize
         )
-        self._generated_shifts.update(self.special_shifts)
         return self._generated_shifts
 
+    def to_wall_clock(
+        self, timestamps: npt.ArrayLike
+    ) -> npt.NDArray[np.datetime64]:
+        """
+        Wall clock times (of the `Shift`s) of UTC `timestamps`, unchanged without `timezone`.
+        The UTC offsets come from a precomputed `OffsetTable`, so this is a vectorized lookup.
+        :param `timestamps`: numpy `datetime64` array, polars `Series` or list of `datetime`
+        :return: `datetime64[ms]` array
+        """
+        timestamps = to_datetime64_ms(timestamps)
+        if self.timezone is None or timestamps.size == 0:
+            return timestamps
+        utc_millis = timestamps.view(np.int64)
+        return (
+            offset_table(self.timezone, *utc_millis_years(utc_millis))
+            .to_local(utc_millis)
+            .view("datetime64[ms]")
+        )
+
+    def local_dates(
+        self, timestamps: npt.ArrayLike
+    ) -> npt.NDArray[np.datetime64]:
+        """Dates of `timestamps` in the `timezone`, as `datetime64[D]`"""
+        return self.to_wall_clock(timestamps).astype("datetime64[D]")
+
+    def compile(self, from_date: date, to_date: date) -> CompiledCalendar:
+        """
+        Compile `Shift`s from `from_date` to `to_date` into a `CompiledCalendar`,
+        following the same priorities as `build_shifts_from_daterange`.
+        The night shifts of the day before `from_date` are included from midnight.
+        With a `timezone`, the `Shift`s are converted to UTC (so daylight saving time days are counted as worked),
+        and the calendar's horizon is widened by a day on each side, to hold the UTC timestamps of the local dates.
+        :param `from_date`: start date of the range, in the `timezone`
+        :param `to_date`: end date of the range, in the `timezone`
+        :return: `CompiledCalendar` for vectorized calculations
+        """
+        with instrumentation.stage("calendar.compile"):
+            calendar = self._compile_wall_clock(from_date, to_date)
+            if self.timezone is None:
+                return calendar
+            return self._utc_calendar(
+                from_date, to_date, calendar.starts, calendar.ends
+            )
+
+    def _utc_calendar(
+        self,
+        from_date: date,
+        to_date: date,
+        starts: EPOCH_MILLISECONDS,
+        ends: EPOCH_MILLISECONDS,
+    ) -> CompiledCalendar:
+        """
+        `CompiledCalendar` of wall clock intervals of the local dates from `from_date` to `to_date`,
+        converted to UTC with the `timezone`
+        """
+        table = offset_table(
+            self.timezone, from_date.year - 1, to_date.year + 1
+        )
+        utc_starts = table.to_utc(starts)
+        utc_ends = np.maximum(table.to_utc(ends), utc_starts)
+        return CompiledCalendar(
+            from_date - timedelta(days=1),
+            to_date + timedelta(days=1),
+            utc_starts,
+            utc_ends,
+        )
+
+    def _compile_wall_clock(
+        self, from_date: date, to_date: date
+    ) -> CompiledCalendar:
+        """`compile`, in wall clock times whatever the `timezone` is"""
+        compiled_from_date = from_date - timedelta(days=1)
+        days = np.arange(
+            np.datetime64(compiled_from_date, "D"),
+            np.datetime64(to_date, "D") + 1,
+        )
+        special_shifts = {
+            special_date: daily_shifts
+            for special_date, daily_shifts in self.special_shifts.root.items()
+            if compiled_from_date <= special_date <= to_date
+        }
+        workdays = np.setdiff1d(
+            days[self.is_workday(days)],
+            np.array(list(special_shifts), dtype="datetime64[D]"),
+        )
+        pattern_starts, pattern_ends = daily_shift_bounds(self.daily_shifts)
+        workdays_millis = workdays.astype("datetime64[ms]").view(np.int64)
+        starts = [(workdays_millis[:, None] + pattern_starts).ravel()]
+        ends = [(workdays_millis[:, None] + pattern_ends).ravel()]
+        for special_date, daily_shifts in special_shifts.items():
+            special_starts, special_ends = daily_shift_bounds(daily_shifts)
+            date_millis = date_to_epoch_milliseconds(special_date)
+            starts.append(special_starts + date_millis)
+            ends.append(special_ends + date_millis)
+        starts = np.maximum(
+            np.concatenate(starts), date_to_epoch_milliseconds(from_date)
+        )
+        ends = np.concatenate(ends)
+        in_range = starts < ends
+        return CompiledCalendar(
+            from_date, to_date, starts[in_range], ends[in_range]
+        )
+
+    def build_extending_shifts(
+        self, max_days: int = 3_660
+    ) -> ExtendingShiftRange:
+        """
+        Start generating `Shift`s that grow to cover every window queried by
+        `calculate_sla(use_generated_shifts="extend")`, only the missing date spans are generated.
+        :param `max_days`: when more days are covered, the least recently used spans are evicted
+        :return: `ExtendingShiftRange`, empty until queried
+        """
+        self._extending_shifts = ExtendingShiftRange.from_builder(
+            self, max_days
+        )
+        return self._extending_shifts
+
     def get_generated_shifts(self) -> ShiftRange | None:
         return self._generated_shifts
 
+    def get_extending_shifts(self) -> ExtendingShiftRange | None:
+        return self._extending_shifts
+
     def calculate_sla(
         self,
         start_deal: datetime,
         end_deal: datetime,
-        use_generated_shifts: bool = False,
+        use_generated_shifts: bool | Literal["extend"] = False,
         default_if_no_shifts_are_between: Literal["diff"] | int = "diff",
     ) -> Milliseconds:
         """
         Calculate sla based on `start_deal` and `end_deal`
-        :param `use_generated_shifts`: If `False`, `ShiftRange`s will be generated from `start_deal` and `end_deal`. If `True`, `ShiftRange` will be reused, generated from other methods (`build_shifts_from_daterange`)
+        :param `use_generated_shifts`: If `False`, `ShiftRange`s will be generated from `start_deal` and `end_deal`, only for this call: the `ShiftsBuilder` is not changed, so it can be shared by threads. If `True`, `ShiftRange` will be reused, generated from other methods (`build_shifts_from_daterange`). If `"extend"`, reuse the `ShiftRange` from `build_extending_shifts` (created if missing), generating only the dates it doesn't cover yet, not thread-safe
         :param `default_if_no_shifts_are_between`: is used no `Shift`s are found between `start_deal` and `end_deal`. If `"diff"`, method will calculate `Milliseconds` between `start_deal` and `end_deal`
         """
-        start_deal_date, end_deal_date = start_deal.date(), end_deal.date()
-        if not use_generated_shifts:
-            self.build_shifts_from_daterange(start_deal_date, end_deal_date)
-        return self._generated_shifts.work_amount_in_shiftrange(
-            start_deal, end_deal, default_if_no_shifts_are_between
+        with instrumentation.stage("sla.calculate"):
+            return self._calculate_sla(
+                start_deal,
+                end_deal,
+                use_generated_shifts,
+                default_if_no_shifts_are_between,
+            )
+
+    def _calculate_sla(
+        self,
+        start_deal: datetime,
+        end_deal: datetime,
+        use_generated_shifts: bool | Literal["extend"],
+        default_if_no_shifts_are_between: Literal["diff"] | int,
+    ) -> Milliseconds:
+        if self.timezone is not None and not use_generated_shifts:
+            return int(
+                self.calculate_sla_batch(
+                    [start_deal], [end_deal], default_if_no_shifts_are_between
+                )[0]
+            )
+        start_date, end_date = (
+            (start_deal.date(), end_deal.date())
+            if self.timezone is None
+            else self.local_dates([start_deal, end_deal]).tolist()
+        )
+        from_date = start_date - timedelta(days=1)  # for its night shifts
+        if use_generated_shifts == "extend":
+            if self._extending_shifts is None:
+                self.build_extending_shifts()
+            shiftrange = self._extending_shifts.cover(from_date, end_date)
+        elif not use_generated_shifts:
+            shiftrange = self._build_shiftrange(from_date, end_date)
+        else:
+            shiftrange = self._generated_shifts
+        if self.timezone is None:
+            return shiftrange.work_amount_in_shiftrange(
+                start_deal, end_deal, default_if_no_shifts_are_between
+            )
+        # generated `ShiftRange`s are in wall clock times, counted in UTC for daylight saving time days
+        calendar = self._utc_calendar(
+            from_date,
+            end_date,
+            *shiftrange.window_intervals(from_date, end_date),
         )
+        return int(
+            calendar.work_amount_between(
+                to_datetime64_ms([start_deal]),
+                to_datetime64_ms([end_deal]),
+                default_if_no_shifts_are_between,
+            )[0]
+        )
+
+    def calculate_sla_batch(
+        self,
+        start_deals: npt.ArrayLike,
+        end_deals: npt.ArrayLike,
+        default_if_no_shifts_are_between: Literal["diff"] | int = "diff",
+    ) -> EPOCH_MILLISECONDS:
+        """
+        Calculate sla for every pair of `start_deals` and `end_deals` at once,
+        using a single `CompiledCalendar` covering all of the pairs.
+        :param `start_deals`: numpy `datetime64` array, polars `Series` or list of `datetime`
+        :param `end_deals`: same as `start_deals`, and with the same length
+        :param `default_if_no_shifts_are_between`: is used when no `Shift`s are found between a pair. If `"diff"`, the `Milliseconds` between the pair are used
+        :return: `int64` array of `Milliseconds`
+        """
+        start_deals = to_datetime64_ms(start_deals)
+        end_deals = to_datetime64_ms(end_deals)
+        if start_deals.size == 0 and end_deals.size == 0:
+            return np.zeros(start_deals.shape, dtype=np.int64)
+        deals_dates = self.local_dates(np.concatenate([start_deals, end_deals]))
+        calendar = self.compile(
+            deals_dates.min().item(), deals_dates.max().item()
+        )
+        return calendar.work_amount_between(
+            start_deals, end_deals, default_if_no_shifts_are_between
+        )
+
+    def calculate_due_batch(
+        self,
+        start_deals: npt.ArrayLike,
+        milliseconds_durations: npt.ArrayLike,
+        max_horizon_days: int = 36_525,
+    ) -> npt.NDArray[np.datetime64]:
+        """
+        Calculate the due time of every `start_deals`, after working its `milliseconds_durations`.
+        The `CompiledCalendar` is extended (doubling its horizon) only for the deals running out of working time.
+        :param `start_deals`: numpy `datetime64` array, polars `Series` or list of `datetime`
+        :param `milliseconds_durations`: working `Milliseconds` of each deal, or one for all deals
+        :param `max_horizon_days`: stop looking for due times after this many days from the start deals
+        :return: `datetime64[ms]` array of due times
+        """
+        start_deals = to_datetime64_ms(start_deals)
+        durations = np.broadcast_to(
+            np.asarray(milliseconds_durations, dtype=np.int64),
+            start_deals.shape,
+        )
+        dues = np.full(
+            start_deals.shape, np.datetime64("NaT"), "datetime64[ms]"
+        )
+        if start_deals.size == 0:
+            return dues
+        start_dates = self.local_dates(start_deals)
+        daily_milliseconds = (
+            self.daily_shifts.total_milliseconds * len(self.workdays_weekly) / 7
+        )
+        horizon_days = (
+            int(np.ceil(durations.max() / daily_milliseconds)) + 7
+            if daily_milliseconds > 0
+            else 31
+        )
+        missing = np.ones(start_deals.shape, dtype=np.bool_)
+        while True:
+            horizon_days = min(horizon_days, max_horizon_days)
+            calendar = self.compile(
+                start_dates[missing].min().item(),
+                (start_dates[missing].max() + horizon_days).item(),
+            )
+            dues[missing] = calendar.due_after(
+                start_deals[missing], durations[missing]
+            )
+            missing = np.isnat(dues)
+            if not missing.any():
+                return dues
+            if horizon_days >= max_horizon_days:
+                raise ValueError(
+                    f"Not enough working time in {max_horizon_days} days after: {start_deals[missing]}"
+                )
+            horizon_days *= 2
+
+    def calculate_due(
+        self, start_deal: datetime, milliseconds_duration: Milliseconds
+    ) -> datetime:
+        """
+        Calculate when a deal starting at `start_deal` is due, after working `milliseconds_duration`
+        """
+        return self.calculate_due_batch([start_deal], [milliseconds_duration])[
+            0
+        ].item()
 
     def build_shifts_from_duration(
         self,
-        hours_duration: int,
-        from_timestamp: datetime = datetime.now(),
+        hours_duration: float,
+        from_timestamp: datetime | None = None,
         use_generated_shifts: bool = False,
     ) -> ShiftRange:
         """
         Build `Shift`s from `hours` based on `from_timestamp`
+        :param `hours_duration`: working hours to be used up
+        :param `from_timestamp`: start of the work, default is now
+        :param `use_generated_shifts`: If `False`, `ShiftRange` will be generated from `from_timestamp` to the due time. If `True`, `ShiftRange` will be reused, generated from other methods (`build_shifts_from_daterange`)
+        :return: `ShiftRange` with the worked `Shift`s, the last one ends at the due time
         """
-        pass
+        if from_timestamp is None:
+            from_timestamp = (
+                datetime.now()
+                if self.timezone is None
+                else to_naive_utc(datetime.now().astimezone())
+            )
+        milliseconds_duration = round(hours_duration * 60 * 60 * 1000)
+        if self.timezone is not None:
+            return self._utc_shiftrange_from_duration(
+                from_timestamp, milliseconds_duration, use_generated_shifts
+            )
+        shiftrange = self._generated_shifts
+        if not use_generated_shifts:
+            due = self.calculate_due(from_timestamp, milliseconds_duration)
+            shiftrange = self._build_shiftrange(
+                from_timestamp.date() - timedelta(days=1), due.date()
+            )
+        return shiftrange.shiftrange_from_duration(
+            from_timestamp, milliseconds_duration
+        )
+
+    def _utc_shiftrange_from_duration(
+        self,
+        from_timestamp: datetime,
+        milliseconds_duration: Milliseconds,
+        use_generated_shifts: bool,
+    ) -> ShiftRange:
+        """
+        `build_shifts_from_duration` with a `timezone`: the `Shift`s are worked in UTC,
+        so daylight saving time days are counted as worked, then turned back into wall clock `Shift`s
+        """
+        due = self.calculate_due(from_timestamp, milliseconds_duration)
+        start_date, due_date = self.local_dates([from_timestamp, due]).tolist()
+        from_date = start_date - timedelta(days=1)
+        shiftrange = (
+            self._generated_shifts
+            if use_generated_shifts
+            else self._build_shiftrange(from_date, due_date)
+        )
+        calendar = self._utc_calendar(
+            from_date,
+            due_date,
+            *shiftrange.window_intervals(from_date, due_date),
+        )
+        start_millis = to_datetime64_ms([from_timestamp]).view(np.int64)
+        due_millis = calendar.due_after(start_millis, milliseconds_duration)
+        if np.isnat(due_millis[0]):
+            raise ValueError(
+                f"{milliseconds_duration} is longer than the remaining shifts in shift range, after {from_timestamp}"
+            )
+        worked_starts = np.maximum(calendar.starts, start_millis[0])
+        worked_ends = np.minimum(calendar.ends, due_millis.view(np.int64)[0])
+        worked = worked_starts < worked_ends
+        table = offset_table(
+            self.timezone, from_date.year - 1, due_date.year + 1
+        )
+        return ShiftRange.from_intervals(
+            (),
+            table.to_local(worked_starts[worked]),
+            table.to_local(worked_ends[worked]),
+        )
@@ -0,0 +1,147 @@
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, List, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import numpy as np
+import numpy.typing as npt
+
+from pyshiftsla.datetime_utilities import MILLISECONDS_IN_A_DAY, Milliseconds
+
+EPOCH_MILLISECONDS = npt.NDArray[np.int64]
+YEAR_OFFSETS = Tuple[
+    Tuple[Milliseconds, ...], Tuple[Milliseconds, ...]
+]  # UTC epoch milliseconds where each offset starts, UTC offsets in milliseconds
+
+
+def check_timezone(key: str) -> str:
+    """Check `key` is an IANA time zone known by `zoneinfo`, e.g. "Asia/Ho_Chi_Minh" """
+    try:
+        ZoneInfo(key)
+    except (ZoneInfoNotFoundError, ValueError) as err:
+        raise ValueError(f"Unknown IANA time zone: {key}") from err
+    return key
+
+
+def _utc_offset(zone: ZoneInfo, utc_millis: Milliseconds) -> Milliseconds:
+    offset = datetime.fromtimestamp(utc_millis / 1000, zone).utcoffset()
+    return int(offset.total_seconds() * 1000)
+
+
+@lru_cache(maxsize=4_096)
+def _year_offsets(key: str, year: int) -> YEAR_OFFSETS:
+    """
+    Offsets of a year, sampled every day, then each change is searched
+    down to the millisecond (time zone transitions are rare, a few per year)
+    """
+    zone = ZoneInfo(key)
+    year_start = int(
+        datetime(year, 1, 1, tzinfo=timezone.utc).timestamp() * 1000
+    )
+    next_year_start = int(
+        datetime(year + 1, 1, 1, tzinfo=timezone.utc).timestamp() * 1000
+    )
+    transitions: List[Milliseconds] = [year_start]
+    offsets: List[Milliseconds] = [_utc_offset(zone, year_start)]
+    previous = year_start
+    for sample in range(
+        year_start + MILLISECONDS_IN_A_DAY,
+        next_year_start + 1,
+        MILLISECONDS_IN_A_DAY,
+    ):
+        sample = min(sample, next_year_start - 1)
+        offset = _utc_offset(zone, sample)
+        if offset != offsets[-1]:
+            lower, upper = (
+                previous,
+                sample,
+            )  # offsets[-1] at `lower`, `offset` at `upper`
+            while upper - lower > 1:
+                middle = (lower + upper) // 2
+                if _utc_offset(zone, middle) == offsets[-1]:
+                    lower = middle
+                else:
+                    upper = middle
+            transitions.append(upper)
+            offsets.append(offset)
+        previous = sample
+    return tuple(transitions), tuple(offsets)
+
+
+class OffsetTable:
+    """
+    UTC offsets of an IANA time zone from `from_year` to `to_year` (included, in UTC),
+    precomputed so that converting timestamps is a vectorized binary search.
+    Timestamps outside of the years use the offset of the first or last year.
+
+    :param transitions: UTC epoch milliseconds where each offset starts, sorted
+    :param offsets: UTC offsets in milliseconds
+    """
+
+    __slots__ = ("key", "from_year", "to_year", "transitions", "offsets")
+
+    def __init__(self, key: str, from_year: int, to_year: int):
+        self.key = key
+        self.from_year = from_year
+        self.to_year = to_year
+        transitions: List[Milliseconds] = []
+        offsets: List[Milliseconds] = []
+        for year in range(from_year, to_year + 1):
+            for transition, offset in zip(*_year_offsets(key, year)):
+                if not offsets or offset != offsets[-1]:
+                    transitions.append(transition)
+                    offsets.append(offset)
+        self.transitions = np.array(transitions, dtype=np.int64)
+        self.offsets = np.array(offsets, dtype=np.int64)
+        for array in (self.transitions, self.offsets):
+            array.flags.writeable = False
+
+    def covers(self, from_year: int, to_year: int) -> bool:
+        return self.from_year <= from_year and to_year <= self.to_year
+
+    def to_local(self, utc_millis: npt.ArrayLike) -> EPOCH_MILLISECONDS:
+        """Wall clock epoch milliseconds of UTC epoch milliseconds"""
+        utc_millis = np.asarray(utc_millis, dtype=np.int64)
+        period_idx = np.maximum(
+            np.searchsorted(self.transitions, utc_millis, "right") - 1, 0
+        )
+        return utc_millis + self.offsets[period_idx]
+
+    def to_utc(self, local_millis: npt.ArrayLike) -> EPOCH_MILLISECONDS:
+        """
+        UTC epoch milliseconds of wall clock epoch milliseconds.
+        Repeated wall clock times (when clocks are turned back) are the earlier instants,
+        skipped ones (when clocks are turned forward) are moved back by the skipped time.
+        """
+        local_millis = np.asarray(local_millis, dtype=np.int64)
+        # a period ends, in wall clock time, where the next one starts with its own offset
+        local_period_ends = self.transitions[1:] + self.offsets[:-1]
+        period_idx = np.searchsorted(local_period_ends, local_millis, "right")
+        return local_millis - self.offsets[period_idx]
+
+
+_offset_tables: Dict[str, OffsetTable] = {}
+
+
+def offset_table(key: str, from_year: int, to_year: int) -> OffsetTable:
+    """
+    The process-wide `OffsetTable` of the time zone `key`, rebuilt to cover from `from_year` to `to_year` when it does not yet,
+    along with the years it covered. Tables are built for whole decades, so nearby horizons share one table.
+    """
+    table = _offset_tables.get(key)
+    if table is None or not table.covers(from_year, to_year):
+        if table is not None:
+            from_year = min(from_year, table.from_year)
+            to_year = max(to_year, table.to_year)
+        table = OffsetTable(key, from_year // 10 * 10, to_year // 10 * 10 + 9)
+        _offset_tables[key] = table
+    return table
+
+
+def utc_millis_years(utc_millis: EPOCH_MILLISECONDS) -> Tuple[int, int]:
+    """First and last years of UTC epoch milliseconds"""
+    years = (
+        utc_millis.view("datetime64[ms]")
+        .astype("datetime64[Y]")
+        .astype(np.int64)
+    )
+    return int(years.min()) + 1970, int(years.max()) + 1970
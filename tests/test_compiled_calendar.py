@@ -0,0 +1,77 @@
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+
+from pyshiftsla.compiled_calendar import CompiledCalendar
+from pyshiftsla.daily_shifts import DailyShift
+from pyshiftsla.shift import Shift
+from pyshiftsla.shifts_builder import ShiftsBuilder
+
+from tests.test_objects.shifts_builder import (
+    US_WOMAN_lIVING_IN_VIETNAM_MATERNITY_LEAVE_4MONTHS_2024,
+)
+
+HOUR = 60 * 60 * 1000
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_snapshot_roundtrip(tmp_path, mmap):
+    calendar = US_WOMAN_lIVING_IN_VIETNAM_MATERNITY_LEAVE_4MONTHS_2024.compile(
+        date(2024, 1, 1), date(2024, 12, 31)
+    )
+    calendar.save(tmp_path / "calendar.bin")
+    loaded = CompiledCalendar.load(tmp_path / "calendar.bin", mmap=mmap)
+    assert (loaded.from_date, loaded.to_date) == (
+        date(2024, 1, 1),
+        date(2024, 12, 31),
+    )
+    for loaded_array, array in zip(
+        (loaded.starts, loaded.ends, loaded.cumulative),
+        (calendar.starts, calendar.ends, calendar.cumulative),
+    ):
+        assert np.array_equal(loaded_array, array)
+    start_deals = np.array(
+        [datetime(2024, 1, 1, 14), datetime(2024, 3, 4, 9)], "datetime64[ms]"
+    )
+    end_deals = np.array(
+        [datetime(2024, 1, 2, 9, 30), datetime(2024, 5, 6, 17)],
+        "datetime64[ms]",
+    )
+    assert np.array_equal(
+        loaded.work_amount_between(start_deals, end_deals),
+        calendar.work_amount_between(start_deals, end_deals),
+    )
+
+
+def test_invalid_snapshot(tmp_path):
+    (tmp_path / "invalid.bin").write_bytes(b"not a snapshot" * 4)
+    with pytest.raises(ValueError):
+        CompiledCalendar.load(tmp_path / "invalid.bin")
+    CompiledCalendar(date(2024, 1, 1), date(2024, 1, 1), [0], [1]).save(
+        tmp_path / "truncated.bin"
+    )
+    (tmp_path / "truncated.bin").write_bytes(
+        (tmp_path / "truncated.bin").read_bytes()[:-8]
+    )
+    for mmap in (True, False):
+        with pytest.raises(ValueError):
+            CompiledCalendar.load(tmp_path / "truncated.bin", mmap=mmap)
+
+
+def test_coverage():
+    team = [
+        ShiftsBuilder(
+            daily_shifts=DailyShift([Shift.fromstr(shiftstr)])
+        ).compile(date(2024, 1, 1), date(2024, 12, 31))
+        for shiftstr in ("08001200", "11001700", "16002000")
+    ]
+    union, at_least_two = (
+        CompiledCalendar.coverage(team, min_count) for min_count in (1, 2)
+    )
+    workdays = len(
+        ShiftsBuilder().get_workdays(date(2024, 1, 1), date(2024, 12, 31))
+    )
+    assert union.total_milliseconds == workdays * 12 * HOUR
+    assert at_least_two.total_milliseconds == workdays * 2 * HOUR
+    assert CompiledCalendar.coverage(team, 3).total_milliseconds == 0
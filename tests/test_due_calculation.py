@@ -0,0 +1,98 @@
+from datetime import date, datetime, time
+import numpy as np
+import pytest
+
+from pyshiftsla.shifts_builder import ShiftsBuilder, DailyShift, ShiftRange
+from pyshiftsla.shift import Shift
+from pyshiftsla.common_daysoff import COMMON_DAILY_SHIFTS
+from tests.test_objects.shifts_builder import (
+    US_WOMAN_lIVING_IN_VIETNAM_MATERNITY_LEAVE_4MONTHS_2024,
+)
+
+HOUR = 60 * 60 * 1000
+
+
+def test_calculate_due():
+    builder = ShiftsBuilder()
+    # Monday has 7.75 working hours, from 8:30
+    assert builder.calculate_due(datetime(2024, 1, 8, 8, 30), 8 * HOUR) == (
+        datetime(2024, 1, 9, 8, 45)
+    )
+    # ends exactly at the end of the morning shift
+    assert builder.calculate_due(datetime(2024, 1, 8, 7), 3.25 * HOUR) == (
+        datetime(2024, 1, 8, 11, 45)
+    )
+    # Friday evening, over the weekend
+    assert builder.calculate_due(datetime(2024, 1, 12, 19), HOUR) == (
+        datetime(2024, 1, 15, 9, 30)
+    )
+    assert builder.calculate_due(datetime(2024, 1, 13, 10), 0) == (
+        datetime(2024, 1, 13, 10)
+    )
+
+
+def test_calculate_due_batch_is_inverse_of_sla():
+    builder = US_WOMAN_lIVING_IN_VIETNAM_MATERNITY_LEAVE_4MONTHS_2024
+    start_deals = np.array(
+        [
+            datetime(2024, 1, 1, 13),
+            datetime(2024, 2, 8, 17),
+            datetime(2024, 7, 31, 10),  # right before the maternity leave
+        ],
+        dtype="datetime64[ms]",
+    )
+    durations = np.array([2, 8, 40], dtype=np.int64) * HOUR
+    dues = builder.calculate_due_batch(start_deals, durations)
+    assert dues[1] == np.datetime64("2024-02-15T17:15")
+    assert dues[2] > np.datetime64("2024-12-01")
+    assert builder.calculate_sla_batch(start_deals, dues).tolist() == (
+        durations.tolist()
+    )
+
+
+def test_calculate_due_without_enough_working_time():
+    builder = ShiftsBuilder(workdays_weekly=set())
+    with pytest.raises(ValueError):
+        builder.calculate_due_batch(
+            [datetime(2024, 1, 1)], HOUR, max_horizon_days=62
+        )
+
+
+def test_shiftrange_from_duration():
+    shiftrange = ShiftRange(
+        {
+            date(2024, 1, 1): COMMON_DAILY_SHIFTS,
+            date(2024, 1, 3): COMMON_DAILY_SHIFTS,
+        }
+    )
+    worked = shiftrange.shiftrange_from_duration(
+        datetime(2024, 1, 1, 14), 5 * HOUR
+    )
+    assert list(worked.root) == [date(2024, 1, 1), date(2024, 1, 3)]
+    assert worked[date(2024, 1, 1)][0] == Shift(start=time(14), end=time(18))
+    assert worked[date(2024, 1, 3)][0] == Shift(
+        start=time(8, 30), end=time(9, 30)
+    )
+    assert worked.total_milliseconds == 5 * HOUR
+    with pytest.raises(ValueError):
+        shiftrange.shiftrange_from_duration(datetime(2024, 1, 3, 9), 9 * HOUR)
+
+
+def test_build_shifts_from_duration():
+    builder = ShiftsBuilder(
+        daily_shifts=DailyShift([Shift.fromstr("08301145")]),
+    )
+    worked = builder.build_shifts_from_duration(
+        hours_duration=4, from_timestamp=datetime(2024, 1, 5, 10)
+    )
+    assert worked.root == {
+        date(2024, 1, 5): DailyShift([Shift.fromstr("10001145")]),
+        date(2024, 1, 8): DailyShift([Shift.fromstr("08301045")]),
+    }
+    # 2.05 hours is 7_379_999.999... milliseconds in floats
+    worked = builder.build_shifts_from_duration(
+        hours_duration=2.05, from_timestamp=datetime(2024, 1, 8, 8, 30)
+    )
+    assert worked.root == {
+        date(2024, 1, 8): DailyShift([Shift.fromstr("08301033")]),
+    }
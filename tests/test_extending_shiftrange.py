@@ -0,0 +1,73 @@
+from datetime import date, datetime
+
+from pyshiftsla.shifts_builder import ShiftsBuilder, DateRange
+from pyshiftsla.extending_shiftrange import ExtendingShiftRange
+from tests.test_objects.shifts_builder import (
+    US_WOMAN_lIVING_IN_VIETNAM_MATERNITY_LEAVE_4MONTHS_2024,
+)
+
+DEALS = [
+    (datetime(2024, 1, 1, 14), datetime(2024, 1, 2, 9, 30)),
+    (datetime(2024, 2, 8, 17), datetime(2024, 2, 15, 17, 15)),
+    (datetime(2024, 1, 2, 8), datetime(2024, 2, 9, 8)),
+    (datetime(2024, 7, 31, 10), datetime(2024, 12, 3, 10)),
+]
+
+
+def test_extend_mode_matches_regenerating():
+    builder = US_WOMAN_lIVING_IN_VIETNAM_MATERNITY_LEAVE_4MONTHS_2024.partial_config_copy()
+    for start_deal, end_deal in DEALS:
+        assert builder.calculate_sla(
+            start_deal, end_deal, use_generated_shifts="extend"
+        ) == builder.calculate_sla(start_deal, end_deal)
+        builder.calculate_sla(
+            start_deal, end_deal, use_generated_shifts="extend"
+        )
+    assert isinstance(builder.get_extending_shifts(), ExtendingShiftRange)
+    # from the day before each start deal, for its night shifts, adjacent spans merged
+    assert builder.get_extending_shifts().covered_spans == [
+        (date(2023, 12, 31), date(2024, 2, 15)),
+        (date(2024, 7, 30), date(2024, 12, 3)),
+    ]
+
+
+def test_cover_generates_missing_spans_only():
+    extending = ShiftsBuilder().build_extending_shifts()
+    extending.cover(date(2024, 1, 10), date(2024, 1, 20))
+    extending.cover(date(2024, 3, 1), date(2024, 3, 10))
+    extending.cover(date(2024, 1, 1), date(2024, 1, 31))
+    assert extending.covered_spans == [
+        (date(2024, 1, 1), date(2024, 1, 31)),
+        (date(2024, 3, 1), date(2024, 3, 10)),
+    ]
+    assert len(extending.root) == 23 + 6  # workdays of January and March 2024
+    # adjacent spans are merged too
+    extending.cover(date(2024, 2, 1), date(2024, 2, 29))
+    assert extending.covered_spans == [(date(2024, 1, 1), date(2024, 3, 10))]
+
+
+def test_cover_evicts_least_recently_used_spans():
+    extending = ShiftsBuilder().build_extending_shifts(max_days=45)
+    extending.cover(date(2024, 1, 1), date(2024, 1, 31))
+    extending.cover(date(2024, 3, 1), date(2024, 3, 10))
+    extending.cover(date(2024, 1, 5), date(2024, 1, 6))  # January is used again
+    extending.cover(date(2024, 5, 1), date(2024, 5, 5))  # March is evicted
+    assert extending.covered_spans == [
+        (date(2024, 1, 1), date(2024, 1, 31)),
+        (date(2024, 5, 1), date(2024, 5, 5)),
+    ]
+    assert extending.get(date(2024, 3, 1)) is None
+    assert extending.shifts_milliseconds(
+        date(2024, 1, 1), date(2024, 12, 31)
+    ) == (26 * ShiftsBuilder().daily_shifts.total_milliseconds)
+
+
+def test_extending_shifts_follow_builder_changes():
+    builder = ShiftsBuilder()
+    builder.calculate_sla(
+        datetime(2024, 1, 1, 9), datetime(2024, 1, 3, 9), "extend"
+    )
+    builder.add_days_off_range([DateRange.fromstr("20240102")], inplace=True)
+    assert builder.calculate_sla(
+        datetime(2024, 1, 1, 9), datetime(2024, 1, 3, 9), "extend"
+    ) == builder.calculate_sla(datetime(2024, 1, 1, 9), datetime(2024, 1, 3, 9))
@@ -0,0 +1,17 @@
+import subprocess
+import sys
+
+
+def test_core_does_not_import_polars_nor_lunardate():
+    loaded = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, pyshiftsla.shifts_builder, pyshiftsla.compiled_calendar;"
+            "print('polars' in sys.modules, 'lunardate' in sys.modules)",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+    assert loaded == ["False", "False"]
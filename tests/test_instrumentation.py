@@ -0,0 +1,45 @@
+from datetime import date, datetime
+
+from pyshiftsla import instrumentation
+from pyshiftsla.daterange import DateRange
+from pyshiftsla.shifts_builder import ShiftsBuilder
+
+
+def test_disabled_instrumentation_collects_nothing():
+    instrumentation.reset()
+    ShiftsBuilder().calculate_sla(
+        datetime(2024, 1, 2, 9), datetime(2024, 1, 5, 17)
+    )
+    assert instrumentation.snapshot() == instrumentation.StatsSnapshot()
+
+
+def test_instrumentation_stats_and_callback():
+    builder = ShiftsBuilder(
+        days_off_ranges=[DateRange.fromstr("20240101-20240105", "lunar")]
+    )
+    ended_stages = []
+    callback = lambda name, seconds: ended_stages.append(name)  # noqa: E731
+    instrumentation.register_callback(callback)
+    instrumentation.enable()
+    instrumentation.reset()
+    try:
+        for _ in range(2):
+            builder.calculate_sla(
+                datetime(2024, 2, 5, 9), datetime(2024, 2, 16, 17)
+            )
+        builder.compile(date(2024, 2, 1), date(2024, 2, 29))
+    finally:
+        instrumentation.disable()
+        instrumentation.unregister_callback(callback)
+    stats = instrumentation.snapshot()
+    assert stats.stages["sla.calculate"].calls == 2
+    assert stats.stages["days_off.compile"].calls == 1
+    assert stats.stages["lunar.to_solar"].calls == 1
+    assert stats.stages["calendar.compile"].calls == 1
+    assert stats.stages["shiftrange.work_amount"].seconds > 0
+    assert stats.counters["days_off.misses"] == 1
+    assert stats.counters["days_off.hits"] >= 2
+    assert (
+        stats.counters["days.materialized"] == 2 * 7
+    )  # Tet off until Feb 14th
+    assert ended_stages.count("sla.calculate") == 2
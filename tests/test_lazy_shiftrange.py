@@ -0,0 +1,85 @@
+from datetime import date, datetime
+import pytest
+
+from pyshiftsla.shifts_builder import ShiftsBuilder, DateRange
+from pyshiftsla.lazy_shiftrange import LazyShiftRange
+from pyshiftsla.shiftrange import ShiftRange
+from tests.test_objects.shifts_builder import (
+    US_WOMAN_lIVING_IN_VIETNAM_MATERNITY_LEAVE_4MONTHS_2024,
+)
+
+
+def test_lazy_shifts_match_built_shifts():
+    builder = US_WOMAN_lIVING_IN_VIETNAM_MATERNITY_LEAVE_4MONTHS_2024
+    built = builder.build_shifts_from_daterange(
+        date(2024, 1, 1), date(2024, 12, 31)
+    )
+    lazy = builder.build_lazy_shifts(date(2024, 1, 1), date(2024, 12, 31))
+    assert isinstance(lazy, LazyShiftRange)
+    assert len(lazy.root) == 0
+    for specified_date in [
+        date(2024, 1, 1),
+        date(2024, 2, 8),
+        date(2024, 2, 12),
+    ]:
+        assert lazy.get(specified_date) == built.get(specified_date)
+    assert len(lazy.root) == 2  # the day off is not kept in `root`
+    assert lazy.total_milliseconds == built.total_milliseconds
+    assert lazy.shifts_milliseconds(
+        date(2024, 3, 1), date(2024, 9, 1), exclude=[date(2024, 3, 4)]
+    ) == built.shifts_milliseconds(
+        date(2024, 3, 1), date(2024, 9, 1), exclude=[date(2024, 3, 4)]
+    )
+    with pytest.raises(KeyError):
+        lazy[date(2024, 7, 4)]
+    with pytest.raises(NotImplementedError):
+        lazy[date(2024, 7, 4)] = None
+
+
+def test_unbounded_lazy_shifts_calculate_sla():
+    builder = ShiftsBuilder()
+    builder.build_lazy_shifts()
+    sla_millis = builder.calculate_sla(
+        start_deal=datetime(2031, 5, 2, 11),  # Friday
+        end_deal=datetime(2031, 5, 6, 9, 30),  # Tuesday
+        use_generated_shifts=True,
+    )
+    assert sla_millis / (1000 * 60 * 60) == 14
+
+
+def test_lazy_shifts_follow_builder_changes():
+    builder = ShiftsBuilder()
+    lazy = builder.build_lazy_shifts(memoize=True)
+    assert lazy.get(date(2024, 1, 2)) is not None
+    builder.add_days_off_range([DateRange.fromstr("20240102")], inplace=True)
+    assert lazy.get(date(2024, 1, 2)) is None
+    assert lazy.slice(
+        date(2024, 1, 1), date(2024, 1, 7)
+    ).total_milliseconds == (4 * builder.daily_shifts.total_milliseconds)
+
+
+def test_lazy_shifts_in_set_operations():
+    builder = US_WOMAN_lIVING_IN_VIETNAM_MATERNITY_LEAVE_4MONTHS_2024
+    other = ShiftsBuilder().build_shifts_from_daterange(
+        date(2024, 1, 1), date(2024, 3, 31)
+    )
+    built = builder.build_shifts_from_daterange(
+        date(2024, 1, 1), date(2024, 3, 31)
+    )
+    for memoize in (True, False):
+        lazy = builder.build_lazy_shifts(
+            date(2024, 1, 1), date(2024, 3, 31), memoize=memoize
+        )
+        assert LazyShiftRange.union([lazy, other]) == ShiftRange.union(
+            [built, other]
+        )
+        assert ShiftRange.coverage([other, lazy], 2) == ShiftRange.coverage(
+            [other, built], 2
+        )
+        assert lazy.difference([other]) == built.difference([other])
+        assert all(
+            (lazy_bounds == built_bounds).all()
+            for lazy_bounds, built_bounds in zip(lazy.timeline, built.timeline)
+        )
+    with pytest.raises(ValueError, match="Unbounded"):
+        ShiftRange.union([builder.build_lazy_shifts(), other])
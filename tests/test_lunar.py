@@ -0,0 +1,55 @@
+from datetime import date
+
+import numpy as np
+import pytest
+from lunardate import LunarDate
+
+from pyshiftsla.daterange import DateRange
+from pyshiftsla.lunar import (
+    LunarTable,
+    lunar_to_solar,
+    lunar_to_solar_array,
+    solar_to_lunar,
+)
+
+
+def test_lunar_to_solar_memo():
+    lunar_new_year = DateRange.fromstr("20240101-20240105", "lunar")
+    assert lunar_new_year.solar_daterange == DateRange(
+        start=date(2024, 2, 10), end=date(2024, 2, 14)
+    )
+    hits = lunar_to_solar.cache_info().hits
+    lunar_new_year.solar_daterange
+    assert lunar_to_solar.cache_info().hits == hits + 2
+    assert solar_to_lunar(date(2024, 2, 10)) == (2024, 1, 1, False)
+
+
+def test_lunar_table():
+    table = LunarTable(2020, 2025)
+    for year, month, day, is_leap_month in [
+        (2020, 1, 1, False),
+        (2020, 4, 29, True),  # leap month of 2020
+        (2023, 2, 29, True),  # leap month of 2023
+        (2025, 12, 29, False),
+    ]:
+        assert table.to_solar(year, month, day, is_leap_month) == np.datetime64(
+            LunarDate(year, month, day, is_leap_month).to_solar_date(), "D"
+        )
+    with pytest.raises(ValueError):
+        table.to_solar(2023, 2, 30, True)
+    with pytest.raises(ValueError):
+        table.to_solar(2024, 4, 1, True)  # 2024 has no leap month
+    with pytest.raises(ValueError):
+        table.to_solar(2019, 1, 1)
+
+
+def test_lunar_to_solar_array():
+    solar_dates = lunar_to_solar_array(
+        [2024, 2024, 2030], [1, 3, 1], [1, 10, 1]
+    )
+    assert solar_dates.tolist() == [
+        lunar_to_solar(2024, 1, 1),
+        lunar_to_solar(2024, 3, 10),
+        lunar_to_solar(2030, 1, 1),
+    ]
+    assert lunar_to_solar_array([], [], []).size == 0
@@ -0,0 +1,155 @@
+from datetime import date, datetime, time
+
+import pytest
+
+from pyshiftsla.daily_shifts import DailyShift
+from pyshiftsla.shift import Shift
+from pyshiftsla.shiftrange import ShiftRange
+from pyshiftsla.shifts_builder import ShiftsBuilder
+
+HOUR = 60 * 60 * 1000
+NIGHT_SHIFT = Shift.fromstr("22000600")
+NIGHT_SHIFTS_BUILDER = ShiftsBuilder(daily_shifts=DailyShift([NIGHT_SHIFT]))
+
+
+def test_night_shift():
+    assert NIGHT_SHIFT.overnight
+    assert NIGHT_SHIFT.bounds == (22 * HOUR, 30 * HOUR)
+    assert NIGHT_SHIFT.diff == 8 * HOUR
+    assert NIGHT_SHIFT.is_in_shift(time(2))
+    assert not NIGHT_SHIFT.is_in_shift(time(12))
+    assert Shift.fromstr("18000000").bounds == (18 * HOUR, 24 * HOUR)
+    assert Shift.from_bounds(22 * HOUR, 30 * HOUR) == NIGHT_SHIFT
+    with pytest.raises(ValueError):
+        Shift.fromstr("08000800")
+
+
+@pytest.mark.parametrize(
+    "start_deal, end_deal, expected_hours",
+    [
+        (datetime(2024, 1, 1, 23), datetime(2024, 1, 2, 5), 6),  # Monday night
+        (datetime(2024, 1, 2, 2), datetime(2024, 1, 2, 3), 1),  # after midnight
+        (datetime(2024, 1, 1, 21), datetime(2024, 1, 3, 7), 16),
+        (
+            datetime(2024, 1, 6, 2),
+            datetime(2024, 1, 8, 23),
+            4 + 1,
+        ),  # Friday to Monday nights
+    ],
+)
+def test_sla_over_midnight(start_deal, end_deal, expected_hours):
+    assert (
+        NIGHT_SHIFTS_BUILDER.calculate_sla(start_deal, end_deal)
+        == expected_hours * HOUR
+    )
+    assert NIGHT_SHIFTS_BUILDER.calculate_sla_batch(
+        [start_deal], [end_deal]
+    ).tolist() == [expected_hours * HOUR]
+    lazy_builder = NIGHT_SHIFTS_BUILDER.partial_config_copy()
+    lazy_builder.build_lazy_shifts()
+    assert (
+        lazy_builder.calculate_sla(
+            start_deal, end_deal, use_generated_shifts=True
+        )
+        == expected_hours * HOUR
+    )
+    extending_builder = NIGHT_SHIFTS_BUILDER.partial_config_copy()
+    assert (
+        extending_builder.calculate_sla(
+            start_deal,
+            end_deal,
+            use_generated_shifts="extend",
+            default_if_no_shifts_are_between=0,
+        )
+        == expected_hours * HOUR
+    )
+
+
+def test_shift_ending_at_midnight():
+    builder = ShiftsBuilder(
+        daily_shifts=DailyShift([Shift.fromstr("18000000")])
+    )
+    assert (
+        builder.calculate_sla(datetime(2024, 1, 1, 23), datetime(2024, 1, 2, 1))
+        == HOUR
+    )
+    assert (
+        builder.calculate_sla(datetime(2024, 1, 1, 17), datetime(2024, 1, 2, 0))
+        == 6 * HOUR
+    )
+
+
+def test_due_over_midnight():
+    assert NIGHT_SHIFTS_BUILDER.calculate_due(
+        datetime(2024, 1, 1, 21), 3 * HOUR
+    ) == datetime(2024, 1, 2, 1)
+    worked = NIGHT_SHIFTS_BUILDER.build_shifts_from_duration(
+        hours_duration=10, from_timestamp=datetime(2024, 1, 2, 2)
+    )
+    assert worked == ShiftRange(
+        {
+            date(2024, 1, 2): DailyShift(
+                [Shift.fromstr("02000600"), Shift.fromstr("22000000")]
+            ),
+            date(2024, 1, 3): DailyShift([Shift.fromstr("00000400")]),
+        }
+    )
+
+
+def test_night_shift_overlapping_next_day():
+    # 22:00-06:00 and 05:00-08:00 the next day: 05:00-06:00 is worked once
+    shiftrange = ShiftRange(
+        {
+            date(2024, 1, 1): DailyShift([NIGHT_SHIFT]),
+            date(2024, 1, 2): DailyShift(
+                [Shift.fromstr("05000800"), NIGHT_SHIFT]
+            ),
+        }
+    )
+    assert shiftrange.total_milliseconds == 18 * HOUR
+    assert shiftrange.total_milliseconds == int(shiftrange.timeline[2][-1])
+    assert (
+        shiftrange.shifts_milliseconds(date(2024, 1, 1), date(2024, 1, 1))
+        == 8 * HOUR
+    )
+    assert (
+        shiftrange.shifts_milliseconds(date(2024, 1, 2), date(2024, 1, 2))
+        == 10 * HOUR
+    )
+    assert (
+        shiftrange.shifts_milliseconds(
+            date(2024, 1, 1), date(2024, 1, 2), exclude=[date(2024, 1, 1)]
+        )
+        == 10 * HOUR
+    )
+    assert (
+        shiftrange.work_amount_in_shiftrange(
+            datetime(2024, 1, 1, 22), datetime(2024, 1, 2, 8)
+        )
+        == 10 * HOUR
+    )
+
+    # the same totals without generating the shifts
+    builder = ShiftsBuilder(
+        daily_shifts=DailyShift([Shift.fromstr("05000800"), NIGHT_SHIFT]),
+        workdays_weekly=[0, 1, 2, 3, 4, 5, 6],
+    )
+    generated = builder.build_shifts_from_daterange(
+        datetime(2024, 1, 1), datetime(2024, 1, 31)
+    )
+    lazy = builder.build_lazy_shifts(date(2024, 1, 1), date(2024, 1, 31))
+    for from_date, to_date in (
+        (date(2024, 1, 1), date(2024, 1, 31)),
+        (date(2024, 1, 2), date(2024, 1, 9)),
+    ):
+        # the builder's night shift of the day before covers 05:00-06:00 of `from_date` too
+        assert builder.shifts_milliseconds(from_date, to_date) == (
+            ((to_date - from_date).days + 1) * 10 * HOUR
+        )
+        assert (
+            generated.shifts_milliseconds(from_date, to_date)
+            == lazy.shifts_milliseconds(from_date, to_date)
+            == builder.shifts_milliseconds(from_date, to_date)
+            + (HOUR if from_date == date(2024, 1, 1) else 0)
+        )
+    assert lazy.total_milliseconds == generated.total_milliseconds == 311 * HOUR
@@ -0,0 +1,105 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import logging
+
+import numpy as np
+import pytest
+
+from pyshiftsla.parallel import (
+    ParallelSLAEngine,
+    SharedCalendar,
+    attach_calendar,
+    detach_calendar,
+    calculate_sla_parallel,
+    calculate_sla_threaded,
+)
+from pyshiftsla.shifts_builder import ShiftsBuilder
+
+from tests.test_objects.shifts_builder import (
+    US_WOMAN_lIVING_IN_VIETNAM_MATERNITY_LEAVE_4MONTHS_2024,
+)
+
+
+def _random_deals(size: int):
+    rng = np.random.default_rng(0)
+    start_deals = np.datetime64(datetime(2024, 1, 1), "ms") + rng.integers(
+        0, 300 * 86_400_000, size
+    ).astype("timedelta64[ms]")
+    end_deals = start_deals + rng.integers(0, 20 * 86_400_000, size).astype(
+        "timedelta64[ms]"
+    )
+    return start_deals, end_deals
+
+
+def test_shared_calendar(caplog):
+    calendar = ShiftsBuilder().compile(
+        datetime(2024, 1, 1).date(), datetime(2024, 3, 1).date()
+    )
+    with SharedCalendar(calendar) as shared_calendar:
+        attached = attach_calendar(shared_calendar.handle)
+        assert np.array_equal(attached.starts, calendar.starts)
+        assert np.array_equal(attached.cumulative, calendar.cumulative)
+        assert attached.total_milliseconds == calendar.total_milliseconds
+        with pytest.raises(BufferError):
+            detach_calendar(shared_calendar.handle)  # `attached` is still used
+        assert attached.total_milliseconds == calendar.total_milliseconds
+        del attached
+        detach_calendar(shared_calendar.handle)  # released once deleted
+
+    # attaching the calendar of another batch detaches the previous ones
+    with SharedCalendar(calendar) as first, SharedCalendar(calendar) as second:
+        attached = attach_calendar(first.handle)
+        with caplog.at_level(logging.WARNING, logger="pyshiftsla.parallel"):
+            attach_calendar(second.handle)
+        assert first.handle[0] in caplog.text
+        del attached
+        detach_calendar(second.handle)
+
+
+def test_parallel_sla_in_input_order():
+    builder = US_WOMAN_lIVING_IN_VIETNAM_MATERNITY_LEAVE_4MONTHS_2024
+    start_deals, end_deals = _random_deals(1_000)
+    expected = builder.calculate_sla_batch(start_deals, end_deals)
+    with ParallelSLAEngine(builder, max_workers=2) as engine:
+        assert np.array_equal(
+            engine.calculate_sla_batch(start_deals, end_deals), expected
+        )
+        # a second batch, on another shared calendar
+        assert np.array_equal(
+            engine.calculate_sla_batch(start_deals[:7], end_deals[:7]),
+            expected[:7],
+        )
+    start_deal = datetime(2024, 1, 2, 8)
+    assert calculate_sla_parallel(
+        builder, [start_deal], [start_deal + timedelta(hours=3)], max_workers=1
+    ).tolist() == [5 * 1_800_000]
+
+
+def test_threads_share_a_builder():
+    builder = ShiftsBuilder()
+    start_deals, end_deals = _random_deals(200)
+    expected = builder.calculate_sla_batch(start_deals, end_deals)
+    assert np.array_equal(
+        calculate_sla_threaded(builder, start_deals, end_deals, max_workers=4),
+        expected,
+    )
+    pairs = list(zip(start_deals.tolist(), end_deals.tolist()))
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        slas = list(
+            executor.map(lambda pair: builder.calculate_sla(*pair), pairs)
+        )
+    assert slas == [builder.calculate_sla(*pair) for pair in pairs]
+    assert builder.get_generated_shifts() is None
+
+
+def test_batch_checks_are_shared():
+    builder = ShiftsBuilder()
+    start_deals, end_deals = _random_deals(3)
+    with ParallelSLAEngine(builder, max_workers=1) as engine:
+        for calculate_sla_batch in (
+            engine.calculate_sla_batch,
+            lambda starts, ends: calculate_sla_threaded(builder, starts, ends),
+        ):
+            assert calculate_sla_batch([], []).tolist() == []
+            with pytest.raises(ValueError, match="Mismatched"):
+                calculate_sla_batch(start_deals, end_deals[:2])
@@ -0,0 +1,75 @@
+from datetime import date
+import numpy as np
+import pytest
+
+from pyshiftsla.daily_shifts import DailyShift
+from pyshiftsla.daterange import DateRange
+from pyshiftsla.parsing import (
+    parse_daily_shift_strs,
+    parse_daterange_strs,
+    parse_shift_strs,
+)
+from pyshiftsla.shift import Shift
+
+
+def test_parse_shift_strs():
+    shiftstrs = ["08301145", "13301800", "08301145", "00002359", "22000600"]
+    shifts = parse_shift_strs(np.array(shiftstrs))
+    assert shifts == [Shift.fromstr(shiftstr) for shiftstr in shiftstrs]
+    assert shifts[0] is shifts[2], "Identical shifts must be interned"
+    assert (
+        parse_shift_strs(["08301145"])[0] is not shifts[0]
+    ), "Shifts are interned only within a parse"
+
+    for invalid in ("0830114", "08a01145", "08302500", "08301260", "11451145"):
+        with pytest.raises(ValueError, match=invalid):
+            parse_shift_strs(["08301145", invalid])
+
+
+def test_parse_daily_shift_strs():
+    daily_shifts = parse_daily_shift_strs(
+        ["08301145,13301800", "", "08301145,13301800", "09001700"]
+    )
+    assert daily_shifts[0] == DailyShift(
+        [Shift.fromstr("08301145"), Shift.fromstr("13301800")]
+    )
+    assert daily_shifts[0] is daily_shifts[2]
+    assert daily_shifts[1].get_shifts_num() == 0
+    assert daily_shifts[3][0] == parse_shift_strs(["09001700"])[0]
+    assert daily_shifts[0].bounds.tolist() == [
+        [30_600_000, 42_300_000],
+        [48_600_000, 64_800_000],
+    ]
+
+    # Mutating a parsed `DailyShift` does not leak into the next parses
+    daily_shifts[3].root.append(Shift.fromstr("18001900"))
+    assert parse_daily_shift_strs(["09001700"]) == [
+        DailyShift([Shift.fromstr("09001700")])
+    ]
+
+
+def test_parse_daterange_strs():
+    daterange_strs = [
+        "20240101-20240105",
+        "20240229",
+        "20240301-",
+        "20240101-20240105",
+    ]
+    dateranges = parse_daterange_strs(daterange_strs, calendar_type="lunar")
+    assert dateranges == [
+        DateRange.fromstr(daterange_str, calendar_type="lunar")
+        for daterange_str in daterange_strs
+    ]
+    assert dateranges[2].end is None
+    assert dateranges[0] is dateranges[3]
+    assert isinstance(dateranges[0].start, date)
+
+    for invalid in (
+        "20230229",
+        "20241301",
+        "2024010",
+        "20240101_20240105",
+        "20240101-2024",
+    ):
+        with pytest.raises(ValueError, match=invalid):
+            parse_daterange_strs(["20240101", invalid])
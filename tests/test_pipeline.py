@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+import polars as pl
+import pytest
+
+from pyshiftsla.cli import main
+from pyshiftsla.pipeline import run_sla_pipeline
+from tests.test_objects.shifts_builder import (
+    US_WOMAN_lIVING_IN_VIETNAM_MATERNITY_LEAVE_4MONTHS_2024,
+)
+
+HOUR = 60 * 60 * 1000
+BUILDER = US_WOMAN_lIVING_IN_VIETNAM_MATERNITY_LEAVE_4MONTHS_2024
+CREATED_AT = [
+    datetime(2024, 1, 1, 14) + timedelta(hours=7 * i) for i in range(25)
+]
+TICKETS = pl.DataFrame(
+    {
+        "ticket": list(range(25)),
+        "created_at": CREATED_AT,
+        "resolved_at": [
+            created_at + timedelta(hours=31) for created_at in CREATED_AT
+        ],
+        "duration": [HOUR * (i % 5 + 1) for i in range(25)],
+    }
+).with_columns(pl.col("created_at", "resolved_at").dt.cast_time_unit("ms"))
+
+
+def test_csv_pipeline(tmp_path):
+    source, destination = tmp_path / "tickets.csv", tmp_path / "results.csv"
+    TICKETS.write_csv(source)
+    progresses = []
+    stats = run_sla_pipeline(
+        BUILDER,
+        source,
+        destination,
+        duration_column="duration",
+        progress=progresses.append,
+    )
+    assert stats.rows == progresses[-1].rows == 25
+
+    results = pl.read_csv(destination, try_parse_dates=True)
+    assert results["ticket"].to_list() == TICKETS["ticket"].to_list()
+    assert (
+        results["sla"].to_list()
+        == BUILDER.calculate_sla_batch(
+            TICKETS["created_at"], TICKETS["resolved_at"]
+        ).tolist()
+    )
+    assert results["due"].dt.cast_time_unit("ms").to_list() == [
+        BUILDER.calculate_due(created_at, duration)
+        for created_at, duration in zip(CREATED_AT, TICKETS["duration"])
+    ]
+
+
+def test_parquet_pipeline(tmp_path):
+    source, destination = (
+        tmp_path / "tickets.parquet",
+        tmp_path / "results.parquet",
+    )
+    TICKETS.write_parquet(source)
+    run_sla_pipeline(BUILDER, source, destination)
+    results = pl.read_parquet(destination)
+    assert results["ticket"].to_list() == TICKETS["ticket"].to_list()
+    assert "due" not in results.columns
+    with pytest.raises(ValueError, match="xlsx"):
+        run_sla_pipeline(BUILDER, tmp_path / "tickets.xlsx", destination)
+
+
+@pytest.mark.parametrize("source_format", ["csv", "parquet"])
+def test_rows_read_per_chunk(tmp_path, source_format):
+    tickets = pl.concat([TICKETS] * 800)  # 20_000 rows, in a single row group
+    source = tmp_path / f"tickets.{source_format}"
+    destination = tmp_path / "results.parquet"
+    if source_format == "csv":
+        tickets.write_csv(source)
+    else:
+        tickets.write_parquet(source, row_group_size=len(tickets))
+    progresses = []
+    stats = run_sla_pipeline(
+        BUILDER,
+        source,
+        destination,
+        chunk_rows=5_000,
+        progress=progresses.append,
+    )
+    assert stats.rows == 20_000
+    assert stats.chunks >= 4
+    # CSV chunks are cut at line boundaries
+    assert max(progress.last_chunk_rows for progress in progresses) <= (
+        5_000 if source_format == "parquet" else 5_500
+    )
+    assert pl.read_parquet(destination)["sla"].to_list() == (
+        BUILDER.calculate_sla_batch(
+            tickets["created_at"], tickets["resolved_at"]
+        ).tolist()
+    )
+
+
+def test_cli(tmp_path, capsys):
+    source, destination = tmp_path / "tickets.csv", tmp_path / "results.csv"
+    config = tmp_path / "builder.json"
+    TICKETS.write_csv(source)
+    config.write_text(BUILDER.model_dump_json())
+
+    exit_code = main(
+        [
+            str(source),
+            str(destination),
+            "--builder",
+            str(config),
+            "--end-column",
+            "resolved_at",
+            "--chunk-rows",
+            "10",
+        ]
+    )
+    assert exit_code == 0
+    assert "25 rows written" in capsys.readouterr().err
+    assert pl.read_csv(destination)["sla"].len() == 25
+    assert main([str(source), str(destination), "--builder", str(config)]) == 2
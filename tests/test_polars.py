@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+import polars as pl
+
+from pyshiftsla.polars import sla_expr, due_expr
+from tests.test_objects.shifts_builder import (
+    US_WOMAN_lIVING_IN_VIETNAM_MATERNITY_LEAVE_4MONTHS_2024,
+)
+
+HOUR = 60 * 60 * 1000
+TICKETS = pl.LazyFrame(
+    {
+        "created_at": [
+            datetime(2024, 1, 1, 14),
+            datetime(2024, 2, 8, 17),
+            None,
+        ],
+        "resolved_at": [
+            datetime(2024, 1, 2, 9, 30),
+            datetime(2024, 2, 15, 17, 15),
+            datetime(2024, 3, 1),
+        ],
+        "duration": [3 * HOUR // 2, 8 * HOUR, HOUR],
+    },
+    schema_overrides={"duration": pl.Int64},
+)
+
+
+def test_sla_expr_streaming():
+    builder = US_WOMAN_lIVING_IN_VIETNAM_MATERNITY_LEAVE_4MONTHS_2024
+    tickets = TICKETS.with_columns(
+        sla_expr(builder, "created_at", "resolved_at").alias("sla")
+    ).collect(streaming=True)
+    assert tickets["sla"].to_list() == [1.5 * HOUR, 8 * HOUR, None]
+
+
+def test_due_expr():
+    builder = US_WOMAN_lIVING_IN_VIETNAM_MATERNITY_LEAVE_4MONTHS_2024
+    tickets = TICKETS.with_columns(
+        due_expr(builder, pl.col("created_at"), "duration").alias("due")
+    ).collect()
+    assert tickets["due"].to_list() == [
+        datetime(2024, 1, 2, 9, 30),
+        datetime(2024, 2, 15, 17, 15),
+        None,
+    ]
+
+
+def test_exprs_of_one_column():
+    builder = US_WOMAN_lIVING_IN_VIETNAM_MATERNITY_LEAVE_4MONTHS_2024
+    tickets = TICKETS.with_columns(
+        sla_expr(
+            builder, "created_at", pl.col("created_at") + timedelta(hours=30)
+        ).alias("sla"),
+        due_expr(
+            builder,
+            "created_at",
+            pl.col("created_at").dt.hour().cast(pl.Int64) * HOUR,
+        ).alias("due"),
+    ).collect()
+    created_at = TICKETS.collect()["created_at"]
+    assert tickets["sla"].to_list() == [
+        builder.calculate_sla(start_deal, start_deal + timedelta(hours=30))
+        for start_deal in created_at[:2]
+    ] + [None]
+    assert tickets["due"].to_list() == [
+        builder.calculate_due(start_deal, start_deal.hour * HOUR)
+        for start_deal in created_at[:2]
+    ] + [None]
@@ -0,0 +1,163 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from pyshiftsla.server import MicroBatcher, SLAServer
+from pyshiftsla.shifts_builder import ShiftsBuilder
+
+
+def test_micro_batcher_coalesces_requests():
+    builder = ShiftsBuilder()
+    start_deals = [
+        datetime(2024, 1, 1, 8, 7) + timedelta(hours=hour)
+        for hour in range(100)
+    ]
+    end_deals = [start_deal + timedelta(hours=30) for start_deal in start_deals]
+
+    async def run():
+        batcher = MicroBatcher(builder, window_seconds=0.01)
+        slas = await asyncio.gather(
+            *[
+                batcher.calculate_sla(start_deal, end_deal)
+                for start_deal, end_deal in zip(start_deals, end_deals)
+            ]
+        )
+        due = await batcher.calculate_due(datetime(2024, 1, 1, 8), 3_600_000)
+        with pytest.raises(ValueError):
+            await asyncio.gather(
+                batcher.calculate_sla(end_deals[0], start_deals[0]),
+                batcher.calculate_sla(start_deals[0], end_deals[0]),
+            )
+        return slas, due, batcher.flushed_batches
+
+    slas, due, flushed_batches = asyncio.run(run())
+    assert slas == builder.calculate_sla_batch(start_deals, end_deals).tolist()
+    assert due == builder.calculate_due(datetime(2024, 1, 1, 8), 3_600_000)
+    assert flushed_batches == 3
+
+
+def test_sla_server():
+    async def request(port: int, method: str, path: str, payload=None):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        body = json.dumps(payload).encode() if payload is not None else b""
+        writer.write(
+            f"{method} {path} HTTP/1.1\r\n".encode()
+            + f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+            + body
+        )
+        response = await reader.read()
+        writer.close()
+        head, _, content = response.partition(b"\r\n\r\n")
+        return int(head.split()[1]), json.loads(content)
+
+    async def run():
+        server = SLAServer({"default": ShiftsBuilder()})
+        port = await server.start(port=0)
+        try:
+            return await asyncio.gather(
+                request(port, "GET", "/health"),
+                request(
+                    port,
+                    "POST",
+                    "/sla",
+                    {
+                        "builder": "default",
+                        "start_deal": "2024-01-02T08:00:00",
+                        "end_deal": "2024-01-02T12:00:00",
+                    },
+                ),
+                request(
+                    port,
+                    "POST",
+                    "/due",
+                    {
+                        "builder": "default",
+                        "start_deal": "2024-01-02T08:00:00",
+                        "milliseconds_duration": 3_600_000,
+                    },
+                ),
+                request(port, "POST", "/sla", {"builder": "unknown"}),
+                request(port, "POST", "/sla", {"builder": "default"}),
+                request(
+                    port,
+                    "POST",
+                    "/due",
+                    {
+                        "builder": "default",
+                        "start_deal": "2024-01-02T08:00:00",
+                        "milliseconds_duration": 1e30,
+                    },
+                ),
+            )
+        finally:
+            await server.close()
+
+    health, sla, due, unknown, invalid, overflow = asyncio.run(run())
+    builder = ShiftsBuilder()
+    assert health == (200, {"status": "ok"})
+    assert sla == (
+        200,
+        {
+            "sla": builder.calculate_sla(
+                datetime(2024, 1, 2, 8), datetime(2024, 1, 2, 12)
+            )
+        },
+    )
+    assert due == (
+        200,
+        {
+            "due": builder.calculate_due(
+                datetime(2024, 1, 2, 8), 3_600_000
+            ).isoformat()
+        },
+    )
+    assert unknown[0] == 404
+    assert invalid[0] == 400
+    assert overflow[0] == 400 and "error" in overflow[1]
+
+
+def test_micro_batcher_keeps_compiled_calendar():
+    builder = ShiftsBuilder()
+    start_deal = datetime(2024, 1, 2, 8)
+
+    async def run():
+        batcher = MicroBatcher(builder, window_seconds=0)
+        slas = [
+            await batcher.calculate_sla(
+                start_deal, start_deal + timedelta(hours=hours)
+            )
+            for hours in (1, 4, 8)
+        ]
+        dues = [
+            await batcher.calculate_due(start_deal, hours * 3_600_000)
+            for hours in (1, 40, 20)
+        ]
+        compiled_calendars = batcher.compiled_calendars
+        builder.update_workday_weekly([0, 1, 2, 3, 4, 5, 6], inplace=True)
+        slas.append(
+            await batcher.calculate_sla(
+                start_deal, start_deal + timedelta(hours=8)
+            )
+        )
+        return slas, dues, compiled_calendars, batcher.compiled_calendars
+
+    slas, dues, compiled_calendars, recompiled_calendars = asyncio.run(run())
+    assert slas[:3] == [
+        ShiftsBuilder().calculate_sla(
+            start_deal, start_deal + timedelta(hours=hours)
+        )
+        for hours in (1, 4, 8)
+    ]
+    assert dues == [
+        ShiftsBuilder().calculate_due(start_deal, hours * 3_600_000)
+        for hours in (1, 40, 20)
+    ]
+    # compiled for the first deal, then widened once to the due time after 40 hours
+    assert compiled_calendars == 2
+    # recompiled after the builder is changed
+    assert recompiled_calendars == 3
+    assert slas[3] == builder.calculate_sla(
+        start_deal, start_deal + timedelta(hours=8)
+    )
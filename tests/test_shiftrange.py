@@ -0,0 +1,103 @@
+from datetime import date, time
+
+from pyshiftsla.daily_shifts import DailyShift
+from pyshiftsla.shift import Shift
+from pyshiftsla.shiftrange import ShiftRange
+from pyshiftsla.common_daysoff import COMMON_DAILY_SHIFTS
+
+HOUR = 60 * 60 * 1000
+ONE_HOUR_SHIFTS = DailyShift([Shift(start=time(9), end=time(10))])
+
+
+def generate_shiftrange() -> ShiftRange:
+    return ShiftRange(
+        {
+            date(2024, 1, 3): COMMON_DAILY_SHIFTS,  # 7.75 hours
+            date(2024, 1, 1): ONE_HOUR_SHIFTS,
+            date(2024, 1, 2): ONE_HOUR_SHIFTS,
+            date(2024, 1, 5): ONE_HOUR_SHIFTS,
+        }
+    )
+
+
+def test_start_end_dates():
+    shiftrange = generate_shiftrange()
+    assert shiftrange._start_date == date(2024, 1, 1)
+    assert shiftrange._end_date == date(2024, 1, 5)
+
+
+def test_shifts_milliseconds():
+    shiftrange = generate_shiftrange()
+    assert shiftrange.total_milliseconds == 10.75 * HOUR
+    assert (
+        shiftrange.shifts_milliseconds(date(2024, 1, 2), date(2024, 1, 4))
+        == 8.75 * HOUR
+    )
+    assert (
+        shiftrange.shifts_milliseconds(
+            date(2024, 1, 1), date(2024, 1, 5), exclude=[date(2024, 1, 3)]
+        )
+        == 3 * HOUR
+    )
+    assert (
+        shiftrange.shifts_milliseconds(date(2024, 1, 6), date(2024, 1, 10)) == 0
+    )
+
+
+def test_index_invalidated_on_changes():
+    shiftrange = generate_shiftrange()
+    assert shiftrange.total_milliseconds == 10.75 * HOUR
+    shiftrange[date(2024, 1, 8)] = ONE_HOUR_SHIFTS
+    assert shiftrange.total_milliseconds == 11.75 * HOUR
+    shiftrange.update(ShiftRange({date(2023, 12, 29): ONE_HOUR_SHIFTS}))
+    assert shiftrange._start_date == date(2023, 12, 29)
+    assert shiftrange.total_milliseconds == 12.75 * HOUR
+
+
+def test_slice():
+    sliced = generate_shiftrange().slice(date(2024, 1, 2), date(2024, 1, 4))
+    assert list(sliced.root) == [date(2024, 1, 2), date(2024, 1, 3)]
+    assert sliced.total_milliseconds == 8.75 * HOUR
+    assert sliced.get(date(2024, 1, 5)) is None
+
+
+def test_set_algebra():
+    morning = DailyShift([Shift.fromstr("08001200")])
+    afternoon = DailyShift([Shift.fromstr("11001700")])
+    late = DailyShift([Shift.fromstr("16002000")])
+    team = [
+        ShiftRange({date(2024, 1, 1): morning, date(2024, 1, 2): morning}),
+        ShiftRange({date(2024, 1, 1): afternoon, date(2024, 1, 3): late}),
+        ShiftRange({date(2024, 1, 1): late}),
+    ]
+
+    union = ShiftRange.union(team)
+    assert union[date(2024, 1, 1)] == DailyShift([Shift.fromstr("08002000")])
+    assert union[date(2024, 1, 2)] == morning
+    assert union[date(2024, 1, 3)] == late
+
+    at_least_two = ShiftRange.coverage(team, 2)
+    assert at_least_two[date(2024, 1, 1)] == DailyShift(
+        [Shift.fromstr("11001200"), Shift.fromstr("16001700")]
+    )
+    assert at_least_two[date(2024, 1, 2)].get_shifts_num() == 0
+
+    assert ShiftRange.intersection(team).total_milliseconds == 0
+    assert ShiftRange.intersection(team[:2])[date(2024, 1, 1)] == DailyShift(
+        [Shift.fromstr("11001200")]
+    )
+
+    difference = team[0].difference(team[1:])
+    assert set(difference.root) == {date(2024, 1, 1), date(2024, 1, 2)}
+    assert difference[date(2024, 1, 1)] == DailyShift(
+        [Shift.fromstr("08001100")]
+    )
+    assert difference[date(2024, 1, 2)] == morning
+
+    assert (
+        DailyShift.coverage([morning, afternoon, late], 2)
+        == at_least_two[date(2024, 1, 1)]
+    )
+    assert morning.difference([afternoon]) == DailyShift(
+        [Shift.fromstr("08001100")]
+    )
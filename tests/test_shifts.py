@@ -1,8 +1,14 @@
 from pyshiftsla.shift import Shift
+from pyshiftsla.daily_shifts import DailyShift
 from pyshiftsla.common_daysoff import COMMON_DAILY_SHIFTS
 from datetime import time
+import pytest
 
-from .test_objects.shifts import LEFT_SHIFT, RIGHT_SHIFTS_TO_COMPARE
+from .test_objects.shifts import (
+    LEFT_SHIFT,
+    RIGHT_SHIFTS_TO_COMPARE,
+    left_shift_str,
+)
 
 
 def test_COMMON_DAILY_SHIFTS():
@@ -45,4 +51,152 @@ def test_compare_two_shifts():
 
 
 def test_resolve():
-    pass
+    outers = {
+        "start-connects-end": [Shift.fromstr("09101110")],
+        "end-connects-start": [Shift.fromstr("10101200")],
+        "equal": None,
+        "following": [Shift.fromstr("10101100"), Shift.fromstr("11101200")],
+        "contain": [Shift.fromstr("10101020"), Shift.fromstr("11001110")],
+    }
+    for compare_result, right_shifts in RIGHT_SHIFTS_TO_COMPARE:
+        if compare_result not in outers:
+            continue
+        resolved = LEFT_SHIFT.resolve(right_shifts[0])
+        assert resolved["compare_result"] == compare_result
+        assert resolved["outer"] == outers[compare_result], compare_result
+
+
+def test_resolve_overlap_shifts():
+    shifts = [
+        Shift.fromstr(shiftstr)
+        for shiftstr in (
+            "10001400",
+            "15001600",
+            "08001200",
+            "16001700",
+            "09001000",
+            "22000200",
+            "23000200",
+        )
+    ]
+    resolved = {
+        "delete-both": ["15001600", "16001700"],
+        "outer": ["08000900", "12001400", "15001700", "22002300"],
+        "overlapped": ["09001200", "15001600", "16001700", "23000200"],
+    }
+    with pytest.raises(ValueError, match="overlap"):
+        DailyShift.resolve_overlap_shifts(shifts)
+    for method, shiftstrs in resolved.items():
+        assert DailyShift.resolve_overlap_shifts(shifts, method) == DailyShift(
+            [Shift.fromstr(shiftstr) for shiftstr in shiftstrs]
+        ), method
+    with pytest.raises(ValueError, match="before midnight"):
+        DailyShift.resolve_overlap_shifts(
+            [Shift.fromstr("22000600"), Shift.fromstr("23000100")], "outer"
+        )
+
+
+def test_resolve_overlap_shifts_batch():
+    days = [
+        [Shift.fromstr("08001200"), Shift.fromstr("11001300")],
+        [],
+        [Shift.fromstr("13301800"), Shift.fromstr("08301145")],
+    ] * 1_000
+    resolved = DailyShift.resolve_overlap_shifts_batch(days, "overlapped")
+    assert len(resolved) == 3_000
+    assert resolved[-3] == DailyShift([Shift.fromstr("11001200")])
+    assert resolved[-2].get_shifts_num() == 0
+    assert resolved[-1] == COMMON_DAILY_SHIFTS
+    assert resolved == [
+        DailyShift.resolve_overlap_shifts(shifts, "overlapped")
+        for shifts in days
+    ]
+
+
+def test_shift_bounds():
+    shift = Shift(start=time(8, 30, 15), end=time(11, 45, 0, 500_000))
+    assert shift.bounds == (30_615_000, 42_300_500)
+    assert shift.diff == 42_300_500 - 30_615_000
+    assert Shift.from_bounds(*shift.bounds) == shift
+    shift.end = time(12)
+    assert shift.bounds == (30_615_000, 43_200_000)
+
+
+def test_work_amount_in_shift():
+    minute = 60 * 1000
+    assert LEFT_SHIFT.work_amount_in_shift(time(9), time(10, 30)) == 20 * minute
+    assert LEFT_SHIFT.work_amount_in_shift(time(10, 20), time(10, 30)) == (
+        10 * minute
+    )
+    assert LEFT_SHIFT.work_amount_in_shift(time(9), time(12)) == 60 * minute
+    assert LEFT_SHIFT.work_amount_in_shift(time(12), time(13)) == 0
+
+
+def test_get_overlap_keeps_shifts_unchanged():
+    right_shift = Shift.fromstr("11001200")
+    resolved = LEFT_SHIFT.get_overlap(right_shift)
+    assert resolved["overlapped"] == Shift.fromstr("11001110")
+    assert LEFT_SHIFT == Shift.fromstr(left_shift_str)
+    assert (
+        LEFT_SHIFT.get_overlap(Shift.fromstr("12001300"))["overlapped"] is None
+    )
+
+
+def test_daily_shift_bounds():
+    daily_shift = DailyShift(
+        [Shift.fromstr("13301800"), Shift.fromstr("08301145")]
+    )
+    assert daily_shift.bounds.tolist() == [
+        [30_600_000, 42_300_000],
+        [48_600_000, 64_800_000],
+    ]
+    assert (
+        daily_shift.total_milliseconds == COMMON_DAILY_SHIFTS.total_milliseconds
+    )
+    assert daily_shift.work_amount_in_shifts(time(11), time(14)) == (
+        75 * 60 * 1000
+    )
+    assert DailyShift.from_bounds(*daily_shift.bounds.T) == COMMON_DAILY_SHIFTS
+
+
+def test_daily_shift_work_amount_with_micro_shifts():
+    # 15 minutes of work, then 15 minutes of break, from 08:00 to 18:00
+    micro_shifts = DailyShift(
+        [
+            Shift(start=time(hour, minute), end=time(hour, minute + 15))
+            for hour in range(8, 18)
+            for minute in (0, 30)
+        ]
+    )
+    minute = 60 * 1000
+    windows = [
+        (time(0), time(23, 59)),
+        (time(8, 10), time(8, 40)),
+        (time(12, 20), time(12, 25)),
+        (time(17, 50), time(19)),
+    ]
+    expected = [
+        sum(
+            shift.work_amount_in_shift(start, end)
+            for shift in micro_shifts.root
+        )
+        for start, end in windows
+    ]
+    assert expected == [300 * minute, 15 * minute, 0, 0]
+    assert [
+        micro_shifts.work_amount_in_shifts(start, end, 0)
+        for start, end in windows
+    ] == expected
+    assert (
+        micro_shifts.work_amount_in_bounds_batch(
+            [
+                start.hour * 60 * minute + start.minute * minute
+                for start, _ in windows
+            ],
+            [
+                end.hour * 60 * minute + end.minute * minute
+                for _, end in windows
+            ],
+        ).tolist()
+        == expected
+    )
@@ -1,4 +1,10 @@
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
+
+from pyshiftsla.daily_shifts import DailyShift
+from pyshiftsla.daterange import DateRange, RecurringDateRange
+from pyshiftsla.shift import Shift
+from pyshiftsla.shiftrange import ShiftRange
+from pyshiftsla.shifts_builder import ShiftsBuilder
 
 from tests.test_objects.manual import TEST_YEAR
 from tests.test_objects.shifts_builder import (
@@ -21,3 +27,161 @@ def test_shifts_builder():
     assert (
         hours_sla_new_year_day == 1.5
     ), f"hours_sla_new_year_day should be 1.5, not {hours_sla_new_year_day}"
+
+
+def test_compiled_days_off_invalidation():
+    builder = ShiftsBuilder(days_off_ranges=[date(2024, 1, 2)])
+    assert builder.get_days_off() == {date(2024, 1, 2)}
+    assert (
+        builder.calculate_work_days_between(date(2024, 1, 1), date(2024, 1, 8))
+        == 4
+    )
+
+    builder.add_days_off_range([DateRange.fromstr("20240103-20240104")], True)
+    assert builder.get_days_off() == {
+        date(2024, 1, 2),
+        date(2024, 1, 3),
+        date(2024, 1, 4),
+    }
+    assert builder.get_workdays(date(2024, 1, 1), date(2024, 1, 7)) == [
+        date(2024, 1, 1),
+        date(2024, 1, 5),
+    ]
+
+    builder.update_workday_weekly({0, 1, 2, 3, 4, 5}, inplace=True)
+    assert builder.get_workdays(date(2024, 1, 1), date(2024, 1, 7)) == [
+        date(2024, 1, 1),
+        date(2024, 1, 5),
+        date(2024, 1, 6),
+    ]
+
+    builder.update_workday_weekly(set(), inplace=True)
+    assert builder.get_workdays(date(2024, 1, 1), date(2024, 1, 7)) == []
+    assert (
+        builder.calculate_work_days_between(date(2024, 1, 1), date(2024, 1, 8))
+        == 0
+    )
+
+
+def test_lunar_days_off():
+    days_off = (
+        US_WOMAN_lIVING_IN_VIETNAM_MATERNITY_LEAVE_4MONTHS_2024.get_days_off()
+    )
+    # Lunar New Year: 2024-02-10 to 2024-02-14, Hung Kings: 2024-04-18
+    assert {date(2024, 2, 10), date(2024, 2, 14), date(2024, 4, 18)} <= days_off
+
+
+def test_overlay_copy_on_write():
+    company = ShiftsBuilder(
+        days_off_ranges=[DateRange.fromstr("20240101-20240103")]
+    )
+    employee = company.overlay(days_off_ranges=[date(2024, 1, 5)])
+    assert employee.days_off_ranges[0] is company.days_off_ranges[0]
+    assert employee.get_days_off() == company.get_days_off() | {
+        date(2024, 1, 5)
+    }
+    assert (
+        employee.get_days_off()
+        == company.partial_config_copy(
+            days_off_ranges=company.days_off_ranges + [date(2024, 1, 5)]
+        ).get_days_off()
+    )
+
+    company.add_days_off_range([date(2024, 1, 8)], inplace=True)
+    assert date(2024, 1, 8) not in employee.get_days_off()
+    employee.add_days_off_range([date(2024, 1, 9)], inplace=True)
+    assert date(2024, 1, 9) not in company.get_days_off()
+
+    # the overlay only compiles its own days off, checked on top of the company's calendar
+    employee = company.overlay(
+        days_off_ranges=[date(2024, 1, 5), RecurringDateRange.fromstr("0601")]
+    )
+    full_config = ShiftsBuilder(days_off_ranges=employee.days_off_ranges)
+    days = [date(2024, 1, 1) + timedelta(days=day) for day in range(900)]
+    assert (
+        employee.is_workday(days).tolist()
+        == full_config.is_workday(days).tolist()
+    )
+    assert employee.get_days_off() == full_config.get_days_off()
+    for from_date, to_date in ((days[0], days[-1]), (days[-1], days[3])):
+        assert employee.calculate_work_days_between(
+            from_date, to_date
+        ) == full_config.calculate_work_days_between(from_date, to_date)
+
+    # changing either builder in place leaves the other's results untouched
+    def results(builder):
+        return (
+            builder.calculate_sla(datetime(2024, 1, 1), datetime(2024, 2, 1)),
+            builder.build_shifts_from_daterange(
+                date(2024, 1, 1), date(2024, 1, 31)
+            ),
+        )
+
+    company_results, employee_results = results(company), results(employee)
+    employee.add_days_off_range([date(2024, 1, 10)], inplace=True)
+    employee.update_special_shifts(
+        ShiftRange({date(2024, 1, 6): DailyShift([Shift.fromstr("08000900")])}),
+        inplace=True,
+    )
+    assert results(company) == company_results
+    assert results(employee) != employee_results
+    employee_results = results(employee)
+    company.add_days_off_range([date(2024, 1, 11)], inplace=True)
+    company.update_special_shifts(
+        ShiftRange(
+            {date(2024, 1, 13): DailyShift([Shift.fromstr("08000900")])}
+        ),
+        inplace=True,
+    )
+    assert results(employee) == employee_results
+    assert results(company) != company_results
+
+    special = ShiftRange(
+        {date(2024, 1, 4): DailyShift([Shift.fromstr("08000900")])}
+    )
+    overlaid = company.overlay(special_shifts=special)
+    assert date(2024, 1, 4) not in company.special_shifts.root
+    assert (
+        overlaid.calculate_sla(
+            datetime(2024, 1, 4, 7), datetime(2024, 1, 4, 12)
+        )
+        == 3_600_000
+    )
+
+
+def test_recurring_days_off():
+    builder = ShiftsBuilder(
+        days_off_ranges=[
+            RecurringDateRange.fromstr("0101-0105", "lunar"),  # Tet holiday
+            RecurringDateRange.fromstr("0902"),  # National Day
+            RecurringDateRange.fromstr("1231-0101", to_year=2024),
+        ]
+    )
+    assert not builder.is_workday([date(2024, 2, 12), date(2025, 1, 31)]).any()
+    assert (
+        builder.calculate_work_days_between(date(2030, 9, 2), date(2030, 9, 4))
+        == 1
+    )
+    assert builder.get_days_off(date(2024, 1, 1), date(2025, 12, 31)) >= {
+        date(2024, 9, 2),
+        date(2024, 12, 31),
+        date(2025, 1, 1),
+        date(2025, 1, 29),  # lunar new year 2025
+    }
+    assert date(2025, 12, 31) not in builder.get_days_off()
+    assert builder.is_workday([date(2026, 1, 1)])[0]
+
+    # only the queried years are expanded, within the years supported by `lunardate`
+    builder = ShiftsBuilder(days_off_ranges=builder.days_off_ranges)
+    assert builder.is_workday([date(1900, 1, 2)])[0]
+    builder.calculate_work_days_between(date(2030, 1, 2), date(2030, 1, 3))
+    assert builder._compiled_days_off[1] == {1899, 1900, 2029, 2030}
+
+    assert RecurringDateRange.fromstr("1230", "lunar").daterange_at(
+        2024
+    ) == DateRange(
+        start=date(2025, 1, 28)
+    )  # lunar month 12 of 2024 has 29 days
+    assert RecurringDateRange.fromstr("0229").daterange_at(2023) == DateRange(
+        start=date(2023, 2, 28)
+    )
@@ -0,0 +1,72 @@
+from datetime import date, datetime
+import numpy as np
+import polars as pl
+import pytest
+
+from pyshiftsla.shifts_builder import ShiftsBuilder
+from tests.test_objects.shifts_builder import (
+    US_WOMAN_lIVING_IN_VIETNAM_MATERNITY_LEAVE_4MONTHS_2024,
+)
+
+START_DEALS = [
+    datetime(2024, 1, 1, 14),  # special shift in the Solar New Year
+    datetime(2024, 1, 2, 7),
+    datetime(2024, 2, 8, 10),  # right before the Lunar New Year
+    datetime(2024, 3, 1, 19),
+    datetime(2024, 7, 31, 17),  # right before the maternity leave
+]
+END_DEALS = [
+    datetime(2024, 1, 2, 9, 30),
+    datetime(2024, 1, 2, 12),
+    datetime(2024, 2, 19, 9),
+    datetime(2024, 3, 4, 9),
+    datetime(2024, 12, 2, 9),
+]
+EXPECTED_HOURS = [1.5, 3.25, 22.25, 0.5, 1.5]
+
+
+def test_calculate_sla_batch_from_lists():
+    builder = US_WOMAN_lIVING_IN_VIETNAM_MATERNITY_LEAVE_4MONTHS_2024
+    sla_millis = builder.calculate_sla_batch(START_DEALS, END_DEALS)
+    assert sla_millis.dtype == np.int64
+    assert (sla_millis / (1000 * 60 * 60)).tolist() == EXPECTED_HOURS
+
+
+def test_calculate_sla_batch_input_types():
+    builder = US_WOMAN_lIVING_IN_VIETNAM_MATERNITY_LEAVE_4MONTHS_2024
+    from_lists = builder.calculate_sla_batch(START_DEALS, END_DEALS)
+    from_numpy = builder.calculate_sla_batch(
+        np.array(START_DEALS, dtype="datetime64[us]"),
+        np.array(END_DEALS, dtype="datetime64[s]"),
+    )
+    from_polars = builder.calculate_sla_batch(
+        pl.Series(START_DEALS), pl.Series(END_DEALS)
+    )
+    assert from_lists.tolist() == from_numpy.tolist() == from_polars.tolist()
+
+
+def test_calculate_sla_batch_matches_calculate_sla():
+    builder = US_WOMAN_lIVING_IN_VIETNAM_MATERNITY_LEAVE_4MONTHS_2024
+    sla_millis = builder.calculate_sla_batch(START_DEALS[:1], END_DEALS[:1])
+    assert sla_millis[0] == builder.calculate_sla(START_DEALS[0], END_DEALS[0])
+
+
+def test_calculate_sla_batch_no_shifts_between():
+    builder = ShiftsBuilder(days_off_ranges=[date(2024, 12, 13)])
+    start_deals = [datetime(2024, 12, 13, 9)]  # day off
+    end_deals = [datetime(2024, 12, 13, 10)]
+    assert builder.calculate_sla_batch(start_deals, end_deals).tolist() == [
+        60 * 60 * 1000
+    ]
+    assert builder.calculate_sla_batch(start_deals, end_deals, 0).tolist() == [
+        0
+    ]
+
+
+def test_calculate_sla_batch_invalid_deals():
+    builder = ShiftsBuilder()
+    with pytest.raises(ValueError):
+        builder.calculate_sla_batch(
+            [datetime(2024, 1, 2)], [datetime(2024, 1, 1)]
+        )
+    assert builder.calculate_sla_batch([], []).tolist() == []
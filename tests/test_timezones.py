@@ -0,0 +1,116 @@
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from pyshiftsla.daily_shifts import DailyShift
+from pyshiftsla.shift import Shift
+from pyshiftsla.shiftrange import ShiftRange
+from pyshiftsla.shifts_builder import ShiftsBuilder
+from pyshiftsla.timezones import offset_table
+
+HOUR = 60 * 60 * 1000
+
+
+def utc_millis(*args) -> int:
+    return int(np.datetime64(datetime(*args), "ms").view(np.int64))
+
+
+def test_offset_table():
+    table = offset_table("America/New_York", 2024, 2024)
+    assert utc_millis(2024, 3, 10, 7) in table.transitions  # 2:00 EST
+    assert utc_millis(2024, 11, 3, 6) in table.transitions  # 2:00 EDT
+    utcs = np.array([utc_millis(2024, 1, 1, 12), utc_millis(2024, 7, 1, 12)])
+    assert (table.to_local(utcs) - utcs).tolist() == [-5 * HOUR, -4 * HOUR]
+    assert table.to_utc(table.to_local(utcs)).tolist() == utcs.tolist()
+    # 1:30 happens twice on Nov 3rd, the earlier one is used
+    assert table.to_utc(utc_millis(2024, 11, 3, 1, 30)) == utc_millis(
+        2024, 11, 3, 5, 30
+    )
+
+
+def test_offset_table_widening():
+    table = offset_table("Europe/Paris", 2024, 2024)
+    assert offset_table("Europe/Paris", 2025, 2029) is table
+    widened = offset_table("Europe/Paris", 2031, 2031)
+    assert widened is not table
+    assert widened.covers(2020, 2039)
+    assert offset_table("Europe/Paris", 2024, 2024) is widened
+
+
+def test_daylight_saving_time_days():
+    builder = ShiftsBuilder(
+        workdays_weekly=[0, 1, 2, 3, 4, 5, 6],
+        daily_shifts=DailyShift([Shift.fromstr("00000400")]),
+        timezone="America/New_York",
+    )
+    days = [datetime(2024, 3, 9), datetime(2024, 3, 10), datetime(2024, 11, 3)]
+    assert builder.to_wall_clock(days)[0] == np.datetime64("2024-03-08T19:00")
+    slas = builder.calculate_sla_batch(
+        [
+            day + timedelta(hours=4) for day in days
+        ],  # before midnight, in New York
+        [day + timedelta(hours=14) for day in days],  # after 4:00, in New York
+    )
+    assert slas.tolist() == [4 * HOUR, 3 * HOUR, 5 * HOUR]
+
+
+def test_daylight_saving_time_generated_shifts():
+    builder = ShiftsBuilder(
+        workdays_weekly=[0, 1, 2, 3, 4, 5, 6],
+        daily_shifts=DailyShift([Shift.fromstr("00000400")]),
+        timezone="America/New_York",
+    )
+    start_deal, end_deal = datetime(2024, 3, 10, 4), datetime(2024, 3, 10, 14)
+    assert builder.calculate_sla(start_deal, end_deal) == 3 * HOUR
+    assert builder.calculate_sla(start_deal, end_deal, "extend") == 3 * HOUR
+    builder.build_lazy_shifts()
+    assert builder.calculate_sla(start_deal, end_deal, True) == 3 * HOUR
+    builder.build_shifts_from_daterange(
+        datetime(2024, 3, 1), datetime(2024, 3, 31)
+    )
+    assert builder.calculate_sla(start_deal, end_deal, True) == 3 * HOUR
+
+    # the last `Shift` ends at the due time, 4:00 in New York
+    midnight = datetime(2024, 3, 10, 5)
+    assert builder.calculate_due(midnight, 3 * HOUR) == datetime(2024, 3, 10, 8)
+    for use_generated_shifts in (False, True):
+        assert builder.build_shifts_from_duration(
+            3, midnight, use_generated_shifts
+        ) == ShiftRange(
+            {date(2024, 3, 10): DailyShift([Shift.fromstr("00000400")])}
+        )
+
+
+def test_utc_deals():
+    builder = ShiftsBuilder(timezone="Asia/Ho_Chi_Minh")  # UTC+7
+    start_deal, end_deal = (
+        datetime(2024, 1, 2, 1, 30),
+        datetime(2024, 1, 2, 4, 45),
+    )
+    assert builder.calculate_sla(start_deal, end_deal) == 3.25 * HOUR
+    assert (
+        builder.calculate_sla(
+            start_deal.replace(tzinfo=timezone.utc),
+            datetime(2024, 1, 2, 11, 45, tzinfo=timezone(timedelta(hours=7))),
+        )
+        == 3.25 * HOUR
+    )
+    assert builder.calculate_sla_batch([start_deal], [end_deal]).tolist() == [
+        3.25 * HOUR
+    ]
+    assert builder.calculate_due(start_deal, 4 * HOUR) == datetime(
+        2024, 1, 2, 7, 15
+    )
+    builder.build_shifts_from_daterange(
+        datetime(2024, 1, 1), datetime(2024, 1, 31)
+    )
+    assert (
+        builder.calculate_sla(start_deal, end_deal, use_generated_shifts=True)
+        == 3.25 * HOUR
+    )
+
+
+def test_unknown_timezone():
+    with pytest.raises(ValueError):
+        ShiftsBuilder(timezone="Mars/Olympus_Mons")